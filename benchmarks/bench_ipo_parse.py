@@ -0,0 +1,65 @@
+"""
+Benchmark of the IPO calendar parsing over saved HTML fixtures.
+
+Compares the full page parse with html.parser (one extraction per table) against the single pass
+extraction of the IPO tab container, with each available parser backend.
+
+Usage: python benchmarks/bench_ipo_parse.py [fixture.html ...]
+"""
+
+import sys
+import timeit
+from pathlib import Path as _Path
+
+import bs4
+
+from stock_market.data._ipo import IPO, IPO_INDEX_DELETION, parse_ipo_tables
+
+FIXTURES = [_Path(__file__).parents[1] / "tests" / "_files" / "ipo_calendar.html"]
+REPEAT = 5
+NUMBER = 10
+
+
+def full_page_parse(content: bytes):
+    tables = (
+        bs4.BeautifulSoup(content, "html.parser")
+        .find("div", class_="element__body j-tabPanes")
+        .find_all("table")
+    )
+    return [
+        IPO.extract_data(table, index_deletion=IPO_INDEX_DELETION.get(i))
+        for i, table in enumerate(tables)
+    ]
+
+
+def main(fixtures):
+    parsers = ["html.parser"]
+    try:
+        import lxml  # noqa: F401
+
+        parsers.append("lxml")
+    except ImportError:
+        pass
+
+    cases = {"full page (html.parser)": full_page_parse}
+    for parser in parsers:
+        cases[f"ipo container ({parser})"] = (
+            lambda content, parser=parser: parse_ipo_tables(content, parser=parser)
+        )
+
+    for fixture in fixtures:
+        content = _Path(fixture).read_bytes()
+        print(f"{fixture} ({len(content) / 1024:.0f} KiB)")
+
+        baseline = None
+        for name, parse in cases.items():
+            seconds = (
+                min(timeit.repeat(lambda: parse(content), repeat=REPEAT, number=NUMBER))
+                / NUMBER
+            )
+            baseline = baseline or seconds
+            print(f"  {name:<28} {seconds * 1000:8.1f} ms  x{baseline / seconds:.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or FIXTURES)
@@ -21,6 +21,11 @@ setup(
         "nltk>=3.6.5,<4.0.0",
         "finviz>=1.4.3,<2.0.0",
     ],
+    extras_require={
+        "store": ["pyarrow>=6.0.0"],
+        "fast": ["lxml>=4.6.0"],
+        "dumps": ["zstandard>=0.15.0"],
+    },
     include_package_data=True,
     python_requires=">=3.6",
 )
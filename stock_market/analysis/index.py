@@ -6,15 +6,21 @@ import bs4
 import pandas as pd
 import requests
 
+from stock_market.data._cache import TTLCache
+from stock_market.data._ipo import HTML_PARSER
 from stock_market.data.constants import (
     PERFORMANCE_PERIODIC,
     PERFORMANCE_TOP_STOCKS,
     PERFORMERS_BOTTOM_STOCKS,
+    SP500_TTL,
     SP500_URL,
 )
 
 AVAILABLE_INDEX = ["SP500"]
 
+# Parsed web pages, shared across instances
+_INDEX_PAGE = TTLCache(ttl=SP500_TTL)
+
 
 class IndexView(object):
     """
@@ -93,11 +99,7 @@ class IndexView(object):
 
         """
         if "performance" not in self._summary:
-            # Run scrape function to extract all metrics in one go
-            index_scrape = _sp500()
-            self._summary["performance"] = index_scrape[PERFORMANCE_PERIODIC]
-            self._summary["top_stocks"] = index_scrape[PERFORMANCE_TOP_STOCKS]
-            self._summary["bottom_stocks"] = index_scrape[PERFORMERS_BOTTOM_STOCKS]
+            self._scrape_summary()
 
         periodic_performance = pd.DataFrame.from_dict(
             {"periodic_performance": self._summary["performance"]}
@@ -116,14 +118,20 @@ class IndexView(object):
         if ("top_stocks" not in self._summary) or (
             "bottom_stocks" not in self._summary
         ):
-            # Run scrape function to extract all metrics in one go
-            index_scrape = _sp500()
-            self._summary["performance"] = index_scrape[PERFORMANCE_PERIODIC]
-            self._summary["top_stocks"] = index_scrape[PERFORMANCE_TOP_STOCKS]
-            self._summary["bottom_stocks"] = index_scrape[PERFORMERS_BOTTOM_STOCKS]
+            self._scrape_summary()
 
         return self._summary["top_stocks"], self._summary["bottom_stocks"]
 
+    def _scrape_summary(self):
+        """
+        Run scrape function to extract all metrics in one go, from the shared parsed page.
+
+        """
+        index_scrape = _sp500()
+        self._summary["performance"] = index_scrape[PERFORMANCE_PERIODIC]
+        self._summary["top_stocks"] = index_scrape[PERFORMANCE_TOP_STOCKS]
+        self._summary["bottom_stocks"] = index_scrape[PERFORMERS_BOTTOM_STOCKS]
+
 
 # Scraper for sp500
 def _sp500():
@@ -131,6 +139,9 @@ def _sp500():
     Scraping SP500 information from MarketWatch. (link in constants folder in data directory)
 
     """
+    # Web Scraped data, fetched and parsed once for all metrics
+    ws_page = _INDEX_PAGE.get(SP500_URL, _scrape_sp500_page)
+
     # Search and store the following information
     ws_dict = dict()
     for metric in [
@@ -140,14 +151,10 @@ def _sp500():
     ]:
         # Regex search for the above metrics
         regex = re.compile(f"element element--table ({metric})")
-
-        # Web Scraped data
-        ws_metric = bs4.BeautifulSoup(
-            requests.get(SP500_URL).content, "html.parser"
-        ).find("div", {"class": regex})
+        ws_metric = ws_page.find("div", {"class": regex})
 
         # Check if data return requires a webscrape fix
-        if len(ws_metric) == 0:
+        if ws_metric is None or len(ws_metric) == 0:
             print(f"The web-scrape metric name seems to be changed for {metric}.")
             return None
 
@@ -177,7 +184,16 @@ def _sp500():
     return metric_data
 
 
-# Helper function for _sp500()
+# Helper functions for _sp500()
+def _scrape_sp500_page() -> bs4.BeautifulSoup:
+    """
+    Web scrapes and parses the SP500 page from MarketWatch. Shared across instances until
+    SP500_TTL expires.
+
+    """
+    return bs4.BeautifulSoup(requests.get(SP500_URL).content, HTML_PARSER)
+
+
 def _stock_performers_ws(
     data: bs4.element.Tag,
 ) -> Optional[pd.DataFrame]:
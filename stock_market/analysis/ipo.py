@@ -1,32 +1,88 @@
+import time
+import warnings
 from math import floor
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-from pandas_datareader._utils import RemoteDataError
 from plotly.graph_objs._figure import Figure as go_Figure
 from plotly.subplots import make_subplots
 
-from stock_market.data import IPO, get_ticker
+from stock_market.data import IPO, get_tickers, market_days
+from stock_market.data._calendar import CALENDAR_END, CALENDAR_START
 
 OSD_THRESH = 3
+LOOKBACK_DAYS = 30  # Calendar days of price history of recent IPOs
 
 
 class RecentIPO(object):
     """
-    Analysis on Recent IPO stocks (within 3 weeks).
+    Analysis on Recent IPO stocks (within the lookback days).
+
+    Parameters
+    ----------
+    lookback_days: int, default LOOKBACK_DAYS
+        Number of calendar days of price history, up to today.
+
+    ttl: Optional[float], default None
+        Seconds until the recent IPO data, price history and summaries of this instance expire,
+        loaded again on next access (the web scraped page itself is shared across instances for
+        IPO_TTL seconds). If None, they are kept until invalidated (see refresh and invalidate).
+
+    render: bool, default True
+        Option to print the summaries and show their figures. If False, summaries are computed only
+        (e.g. for scheduled jobs on headless servers), figures are built on request (see
+        overall_figures and individual_figure).
+
     """
 
-    # Get recent ipo data
-    recent_ipo = IPO().recent_ipo
+    def __init__(
+        self,
+        lookback_days: int = LOOKBACK_DAYS,
+        ttl: Optional[float] = None,
+        render: bool = True,
+    ):
+        self.lookback_days = lookback_days
+        self.ttl = ttl
+        self.render = render
+        self._ipo = IPO(ttl=ttl)
+        self.invalidate()
+
+    def invalidate(self):
+        """
+        Removes the cached recent IPO data, price history and summaries, loaded again on next
+        access.
+
+        """
+        # Helper variables
+        self._recent_ipo = None  # Storing recent ipo data
+        self._price_history = None  # Storing stock price history
+        self._loaded_at = None  # Monotonic time of the data load
+
+        # Stats on different views
+        self._overall_summary = None
 
-    # Helper variables
-    _price_history = None  # Storing stock price history
+    def refresh(self):
+        """
+        Web scrapes the IPO page again on next access, and removes the cached data.
 
-    # Stats on different views
-    _overall_summary = None
-    _individual_summary = None
+        """
+        self._ipo.refresh()
+        self.invalidate()
+
+    def _expire(self):
+        """
+        Invalidates the cached data, if the time to live has passed since it was loaded.
+
+        """
+        if (
+            self.ttl is not None
+            and self._loaded_at is not None
+            and time.monotonic() - self._loaded_at > self.ttl
+        ):
+            self._ipo.invalidate()
+            self.invalidate()
 
     @property
     def overall_summary(self) -> pd.DataFrame:
@@ -36,50 +92,104 @@ class RecentIPO(object):
         2) Total price shift per stocks since IPO
         3) Optimal sell day (Number of market days since IPO where stock price was at highest)
 
+        The summary is printed and its figures shown (see overall_figures), unless render is False.
+
+        """
+        _overall_summary = self._summarize()
+        if not self.render:
+            return _overall_summary["stats"]
+
+        # Output summary results
+        overall_result = f"""
+        Recent IPO Summary
+        ------------------
+        Overall percent change : {_overall_summary["overall_change"]["overall_pct"]}%
+        Overall optimal sell day : {_overall_summary["overall_change"]["overall_osd"]}
+
+        Notes: 
+        - OSD refers to Optimal Sell Day after IPO
+        - Any 'day' refers to stock exchange business day, 
+          excluding weekends and holidays
+        
+        """
+
+        individual_result = f"""
+        Per Stock Summary
+        -----------------
+        """
+
+        print(overall_result)
+        print(individual_result)
+        plots = self._overall_figures(_overall_summary)
+        plots["individual_pct_change"].show()
+        if plots["individual_osd_map"] is not None:
+            plots["individual_osd_map"].show()
+
+        return _overall_summary["stats"]
+        # TODO: Best OSD (using probability) by number of stocks and percent increase!!
+
+    def overall_figures(self) -> Dict[str, Optional[go_Figure]]:
+        """
+        Figures of the overall summary, built on first call.
+
+        Returns
+        -------
+        plots: Dict[str, Optional[go_Figure]]
+            Percent change since IPO per stock (individual_pct_change), and performance of the
+            stocks N days after IPO (individual_osd_map, None if there is no performance data).
+
+        """
+        return self._overall_figures(self._summarize())
+
+    @staticmethod
+    def _overall_figures(_overall_summary: dict) -> Dict[str, Optional[go_Figure]]:
+        """
+        Figures of an overall summary (see _summarize), built once and kept with it.
+
+        """
+        if "plots" not in _overall_summary:
+            osd_matrix = _overall_summary["osd_matrix"]
+            try:
+                individual_osd_map = plotly_matrix_heatmap(
+                    data=osd_matrix.values,
+                    x_categorical=list(osd_matrix.columns),
+                    y_categorical=list(osd_matrix.index),
+                    plot_title="Performance of Stocks: N days after IPO",
+                )
+            except ValueError:
+                individual_osd_map = None
+
+            _overall_summary["plots"] = {
+                "individual_pct_change": plotly_h_bar(
+                    data=_overall_summary["stats"],
+                    x_numerical="Pct_Overall_Change",
+                    y_categorical="Ticker",
+                    plot_title="Percent (%) Change since IPO",
+                ),
+                "individual_osd_map": individual_osd_map,
+            }
+
+        return _overall_summary["plots"]
+
+    def _summarize(self) -> dict:
+        """
+        Computes the overall summary (stats, overall_change and osd_matrix), without figures.
+
         """
         # Check if summary function has been run
+        self._expire()
         if self._overall_summary is None:
             # Setup for metric population
-            data = self.price_history
+            bars = _stack_price_history(self.price_history)
             _overall_summary = {}
-            ticker_agg_stats = pd.DataFrame()
-
-            # Loop through each tickers
-            for ticker in data.keys():
-                ticker_data = data[ticker]
-                ticker_market_days = len(ticker_data)
-                ticker_open = ticker_data.iloc[0, :].Open
-
-                # Calculate Optimal Sell Day (OSD)
-                ticker_high = list(ticker_data["High"])
-                osd = ticker_high.index(max(ticker_high))
-
-                # Add ticker stats to aggregated stats
-                ticker_stats = {
-                    "Ticker": ticker,
-                    "Days_On_Exchange": ticker_market_days,
-                    "Pct_Overall_Change": _percent_change(
-                        start_value=ticker_open,
-                        end_value=ticker_data.iloc[ticker_market_days - 1, :].Close,
-                    ),
-                    "OSD": osd,
-                    "OSD_Max_Pct_Gain": _percent_change(
-                        start_value=ticker_open, end_value=max(ticker_high)
-                    ),
-                    "OSD_Valid": True
-                    if ticker_market_days - OSD_THRESH > osd
-                    else False,
-                }
-                ticker_agg_stats = ticker_agg_stats.append(
-                    pd.DataFrame(ticker_stats, index=[0])
-                )
+            ticker_agg_stats = _ipo_stats(bars)
 
             # Sort by recency of entering into stock market
             ticker_agg_stats = ticker_agg_stats.sort_values(
                 by=["Days_On_Exchange"], ascending=True
             ).reset_index(drop=True)
 
-            # Store metrics, data and plots to _overall_summary
+            # Store metrics and data to _overall_summary
             _overall_summary["stats"] = ticker_agg_stats
             _overall_summary["overall_change"] = {
                 "overall_pct": _avg(values=ticker_agg_stats["Pct_Overall_Change"]),
@@ -96,103 +206,88 @@ class RecentIPO(object):
                     by=["Pct_Overall_Change"], ascending=False
                 )["Ticker"]
             )
-            max_days = max(ticker_agg_stats["Days_On_Exchange"])
-            sorted_lag_values = list()
-
-            for ticker_i in range(len(sorted_ticker)):
-                ticker_data = self.price_history[sorted_ticker[ticker_i]]
-                start_price = ticker_data["Open"][0]
-                close_price = list(ticker_data["Close"])
-
-                # Performance per day
-                ppd = [
-                    _percent_change(start_value=start_price, end_value=x)
-                    for x in close_price
-                ]
-                ppd += [None] * (max_days - len(ppd))
-
-                # Add to lag values
-                sorted_lag_values.append(ppd)
-
-            heatmap_x_lab = list(range(0, max_days))
-
-            try:
-                individual_osd_map = plotly_matrix_heatmap(
-                    data=sorted_lag_values,
-                    x_categorical=heatmap_x_lab,
-                    y_categorical=sorted_ticker,
-                    plot_title="Performance of Stocks: N days after IPO",
-                )
-            except ValueError:
-                individual_osd_map = None
-
-            _overall_summary["plots"] = {
-                "individual_pct_change": plotly_h_bar(
-                    data=ticker_agg_stats,
-                    x_numerical="Pct_Overall_Change",
-                    y_categorical="Ticker",
-                    plot_title="Percent (%) Change since IPO",
+            max_days = (
+                ticker_agg_stats["Days_On_Exchange"].max() if len(bars) > 0 else 0
+            )
+            _overall_summary["osd_matrix"] = pd.DataFrame(
+                _performance_matrix(
+                    bars=bars, tickers=sorted_ticker, num_days=max_days
                 ),
-                "individual_osd_map": individual_osd_map,
-            }
+                index=sorted_ticker,
+                columns=range(0, max_days),
+            )
 
             self._overall_summary = _overall_summary
 
-        # Output summary results
-        overall_result = f"""
-        Recent IPO Summary
-        ------------------
-        Overall percent change : {self._overall_summary["overall_change"]["overall_pct"]}%
-        Overall optimal sell day : {self._overall_summary["overall_change"]["overall_osd"]}
+        return self._overall_summary
 
-        Notes: 
-        - OSD refers to Optimal Sell Day after IPO
-        - Any 'day' refers to stock exchange business day, 
-          excluding weekends and holidays
-        
+    def individual_summary(self, ticker: str) -> pd.DataFrame:
         """
+        Individual summary of recent IPOs. The performance chart is shown (see individual_figure),
+        unless render is False.
+
+        Parameters
+        ----------
+        ticker: str
+            Ticker to perform individual summary on.
+
+        Returns
+        -------
+        ticker_data: pd.DataFrame
+            Ticker performance relate information.
 
-        individual_result = f"""
-        Per Stock Summary
-        -----------------
         """
+        ticker, ticker_data = self._ticker_history(ticker)
 
-        print(overall_result)
-        print(individual_result)
-        self._overall_summary["plots"]["individual_pct_change"].show()
-        if self._overall_summary["plots"]["individual_osd_map"] is not None:
-            self._overall_summary["plots"]["individual_osd_map"].show()
+        # Plot chart
+        if self.render:
+            self._individual_figure(ticker, ticker_data).show()
 
-        return self._overall_summary["stats"]
-        # TODO: Best OSD (using probability) by number of stocks and percent increase!!
+        return ticker_data
 
-    def individual_summary(self, ticker: str) -> pd.DataFrame:
+    def individual_figure(self, ticker: str) -> go_Figure:
         """
-        Individual summary of recent IPOs.
+        Performance chart of a recent IPO since IPO (market close price and volume).
 
         Parameters
         ----------
         ticker: str
-            Ticker to perform individual summary on.
+            Ticker to plot.
 
         Returns
         -------
-        ticker_data: pd.DataFrame
-            Ticker performance relate information.
+        fig_ticker_performance: go_Figure
+            The plotly graph object containing the performance chart.
+
+        """
+        return self._individual_figure(*self._ticker_history(ticker))
+
+    def _ticker_history(self, ticker: str) -> Tuple[str, pd.DataFrame]:
+        """
+        Standardized ticker and price history (with a Date column) of a recent IPO.
 
         """
         # Standardize ticker
         ticker = ticker.upper()
 
         # Check if ticker exists from recent ipo
-        if ticker.upper() not in self.price_history.keys():
+        price_history = self.price_history
+        if ticker not in price_history.keys():
             raise Warning("Specified ticker is not part of the recent IPO.")
 
         # Call ticker data from price_history
-        ticker_data = self.price_history[ticker].copy()
+        ticker_data = price_history[ticker].copy()
+        ticker_data["Date"] = ticker_data.index
+
+        return ticker, ticker_data
 
+    @staticmethod
+    def _individual_figure(ticker: str, ticker_data: pd.DataFrame) -> go_Figure:
+        """
+        Performance chart of a recent IPO from its price history (see _ticker_history).
+
+        """
         # Populate required data before plotting
-        ticker_data["Date"] = ticker_data.index
         ticker_ipo_open = ticker_data.iloc[0, :]["Open"]
 
         # Plot line/bar plot (showing market close price and volume)
@@ -209,56 +304,439 @@ class RecentIPO(object):
             add_horizontal_line=ticker_ipo_open,
             add_horizontal_label="IPO Open Price",
         )
-        # Plot chart
-        fig_ticker_performance.show()
 
-        return ticker_data
+        return fig_ticker_performance
+
+    @property
+    def recent_ipo(self) -> pd.DataFrame:
+        """
+        Recent ipo data, web scraped on first access.
+        """
+        self._expire()
+        if self._recent_ipo is None:
+            self._recent_ipo = self._ipo.recent_ipo
+            self._loaded_at = time.monotonic()
+
+        return self._recent_ipo
 
     @property
     def price_history(self) -> Dict[str, pd.DataFrame]:
         """
         Stores all recent ipo historical data.
         """
-
+        self._expire()
         if self._price_history is None:
             _price_history = {}
             recent_ipo = self.recent_ipo
             today = pd.to_datetime("today")
 
-            for stock_i in range(len(recent_ipo)):
-                # Loop through each stock to see validity in US/CDN stock exchange
-                try:
-                    ticker = recent_ipo.iloc[stock_i, :].Ticker
-                    _price_history[ticker.upper()] = get_ticker(
-                        ticker=ticker, start_date=today - pd.Timedelta(days=30)
-                    )
-                except RemoteDataError:
-                    pass
+            # Fetch all stocks at once, skipping stocks not valid in US/CDN stock exchange
+            tickers_data = get_tickers(
+                tickers=[ticker.upper() for ticker in recent_ipo.Ticker],
+                start_date=today - pd.Timedelta(days=self.lookback_days),
+                errors="ignore",
+            )
+            for ticker, ticker_data in tickers_data.items():
+                if ticker_data is not None:
+                    _price_history[ticker] = ticker_data
 
             self._price_history = _price_history
 
         return self._price_history
 
 
+class IPOCohort(object):
+    """
+    Performance of a cohort of IPOs over the first market days after IPO (e.g. IPOs over years,
+    from IPOArchive().history("recent_ipo")).
+
+    Parameters
+    ----------
+    ipos: pd.DataFrame
+        IPOs with Ticker and IPO_Date columns. Tickers listed more than once (e.g. in consecutive
+        snapshots) keep their first IPO date. IPOs outside of the market calendar are skipped.
+
+    horizon: int, default 30
+        Number of market days after IPO (IPO day included) to analyze.
+
+    max_workers: int, default 8
+        Maximum number of concurrent price history requests.
+
+    cache: bool, default True
+        Option to read stock prices from the local bar cache, downloading only the missing dates.
+
+    """
+
+    def __init__(
+        self,
+        ipos: pd.DataFrame,
+        horizon: int = 30,
+        max_workers: int = 8,
+        cache: bool = True,
+    ):
+        if horizon < 1:
+            raise ValueError("horizon should be positive.")
+
+        ipos = ipos[["Ticker", "IPO_Date"]].dropna()
+        ipos = ipos.assign(
+            Ticker=ipos["Ticker"].str.upper(),
+            IPO_Date=pd.to_datetime(ipos["IPO_Date"]).dt.normalize(),
+        )
+
+        # Market days since IPO are only counted on the market calendar
+        in_calendar = ipos["IPO_Date"].between(CALENDAR_START, CALENDAR_END)
+        if not in_calendar.all():
+            warnings.warn(
+                f"IPOs outside of the market calendar ({CALENDAR_START} to {CALENDAR_END}) "
+                f"have been skipped: {', '.join(ipos.loc[~in_calendar, 'Ticker'].unique())}."
+            )
+            ipos = ipos[in_calendar]
+
+        self.ipos = ipos.drop_duplicates(subset="Ticker").reset_index(drop=True)
+        self.horizon = horizon
+        self.max_workers = max_workers
+        self.cache = cache
+
+        self._price_history = None
+        self._bars = None
+        self._stats = None
+
+    @property
+    def price_history(self) -> Dict[str, pd.DataFrame]:
+        """
+        Price history of each IPO over the horizon, fetched concurrently. IPOs without price
+        history (e.g. delisted tickers) are skipped.
+
+        """
+        if self._price_history is None:
+            ipo_dates = dict(zip(self.ipos["Ticker"], self.ipos["IPO_Date"]))
+            today = pd.to_datetime("today").normalize()
+
+            # Fetch the horizon only, with dates per ticker
+            tickers_data = get_tickers(
+                tickers=list(ipo_dates),
+                start_date=ipo_dates,
+                end_date={
+                    ticker: min(_market_day_after(ipo_date, self.horizon - 1), today)
+                    for ticker, ipo_date in ipo_dates.items()
+                },
+                new_metrics=False,
+                cache=self.cache,
+                max_workers=self.max_workers,
+                errors="ignore",
+            )
+            self._price_history = {
+                ticker: ticker_data
+                for ticker, ticker_data in tickers_data.items()
+                if ticker_data is not None and len(ticker_data) > 0
+            }
+
+        return self._price_history
+
+    @property
+    def bars(self) -> pd.DataFrame:
+        """
+        Stacked price history of the IPOs, with Day as the number of market days since IPO.
+
+        """
+        if self._bars is None:
+            bars = _stack_price_history(
+                self.price_history,
+                ipo_dates=dict(zip(self.ipos["Ticker"], self.ipos["IPO_Date"])),
+            )
+            self._bars = bars[bars["Day"].between(0, self.horizon - 1)].reset_index(
+                drop=True
+            )
+
+        return self._bars
+
+    @property
+    def stats(self) -> pd.DataFrame:
+        """
+        Performance of each IPO over the horizon (see RecentIPO.overall_summary), with its IPO date.
+
+        """
+        if self._stats is None:
+            stats = _ipo_stats(self.bars)
+            stats.insert(
+                1,
+                "IPO_Date",
+                stats["Ticker"].map(self.ipos.set_index("Ticker")["IPO_Date"]),
+            )
+            self._stats = stats
+
+        return self._stats
+
+    def returns(self, horizons: Optional[List[int]] = None) -> pd.DataFrame:
+        """
+        Percent change of the close price from the IPO open price, N market days after IPO.
+
+        Parameters
+        ----------
+        horizons: Optional[List[int]], default None
+            Market days after IPO (0 is IPO day). If None, all days of the horizon.
+
+        Returns
+        -------
+        returns: pd.DataFrame
+            Returns matrix, by ticker (rows) and market day after IPO (columns). NaN for days
+            without price history.
+
+        """
+        if horizons is None:
+            horizons = list(range(self.horizon))
+
+        tickers = list(self.stats["Ticker"])
+        matrix = _performance_matrix(
+            bars=self.bars, tickers=tickers, num_days=self.horizon
+        )
+
+        return pd.DataFrame(matrix, index=tickers, columns=range(self.horizon))[
+            horizons
+        ]
+
+    def summary(self, freq: str = "Y") -> pd.DataFrame:
+        """
+        OSD statistics of the cohort, by IPO period.
+
+        Parameters
+        ----------
+        freq: str, default "Y"
+            Period of the IPO dates (e.g. "Y" for years, "Q" for quarters).
+
+        Returns
+        -------
+        summary: pd.DataFrame
+            Number of IPOs, mean and median overall percent change, mean valid OSD and mean OSD max
+            percent gain, by IPO period.
+
+        """
+        stats = self.stats.assign(
+            Period=self.stats["IPO_Date"].dt.to_period(freq),
+            Valid_OSD=self.stats["OSD"].where(self.stats["OSD_Valid"]),
+        )
+
+        return (
+            stats.groupby("Period")
+            .agg(
+                Num_IPO=("Ticker", "size"),
+                Mean_Pct_Overall_Change=("Pct_Overall_Change", "mean"),
+                Median_Pct_Overall_Change=("Pct_Overall_Change", "median"),
+                Mean_OSD=("Valid_OSD", "mean"),
+                Mean_OSD_Max_Pct_Gain=("OSD_Max_Pct_Gain", "mean"),
+            )
+            .round(3)
+        )
+
+
 # Helper function
 
 
+def _stack_price_history(
+    price_history: Dict[str, pd.DataFrame],
+    ipo_dates: Optional[Dict[str, pd.Timestamp]] = None,
+) -> pd.DataFrame:
+    """
+    Stacks the price history of each ticker into a single long frame.
+
+    Parameters
+    ----------
+    price_history: Dict[str, pd.DataFrame]
+        Price history of each ticker, from the IPO date.
+
+    ipo_dates: Optional[Dict[str, pd.Timestamp]], default None
+        IPO date of each ticker, to count market days since IPO on the market calendar (days
+        missing from a price history are skipped). Days a ticker traded while the US market was
+        closed (e.g. TSX listings) are added to its calendar. If None, each row of a price
+        history is a market day, from the first row.
+
+    Returns
+    -------
+    bars: pd.DataFrame
+        Ticker, Day (number of market days since IPO), Open, High, Low and Close of each market
+        day, in the order of the tickers.
+
+    """
+    columns = ["Ticker", "Day", "Open", "High", "Low", "Close"]
+    if len(price_history) == 0:
+        return pd.DataFrame(columns=columns)
+
+    bars = pd.concat(
+        [
+            ticker_data[columns[2:]].reset_index(drop=True)
+            for ticker_data in price_history.values()
+        ],
+        keys=list(price_history.keys()),
+        names=["Ticker", "Day"],
+    ).reset_index()
+
+    if ipo_dates is not None:
+        dates = pd.concat(
+            [ticker_data.index.to_series() for ticker_data in price_history.values()]
+        )
+        dates = dates.values.astype("datetime64[D]")
+        start_dates = pd.to_datetime(bars["Ticker"].map(ipo_dates)).values
+
+        # Days off the market calendar shift the later days of the ticker by one each
+        day_index = _market_day_index(dates)
+        days = market_days()
+        off_calendar = pd.Series(
+            days[np.minimum(day_index, len(days) - 1)] != dates, index=bars.index
+        )
+        off_calendar_before = (
+            off_calendar.groupby(bars["Ticker"]).cumsum() - off_calendar
+        )
+        off_calendar_before_start = (
+            (off_calendar & (dates < start_dates))
+            .groupby(bars["Ticker"])
+            .transform("sum")
+        )
+
+        bars["Day"] = (day_index + off_calendar_before.values) - (
+            _market_day_index(start_dates) + off_calendar_before_start.values
+        )
+
+    return bars[columns]
+
+
+def _ipo_stats(bars: pd.DataFrame) -> pd.DataFrame:
+    """
+    Performance of each ticker since IPO, from the stacked price history (see
+    _stack_price_history).
+
+    Parameters
+    ----------
+    bars: pd.DataFrame
+        Stacked price history.
+
+    Returns
+    -------
+    stats: pd.DataFrame
+        Ticker, Days_On_Exchange (market days up to the last day), Pct_Overall_Change, OSD
+        (market day of the highest price), OSD_Max_Pct_Gain and OSD_Valid (OSD at least
+        OSD_THRESH market days before the last day), in the order of the tickers. Percent changes
+        are from the IPO day open price, NaN without price history on IPO day.
+
+    """
+    grouped = bars.groupby("Ticker", sort=False)
+    stats = grouped.agg(
+        Days_On_Exchange=("Day", "max"),
+        First_Day=("Day", "first"),
+        Open=("Open", "first"),
+        Close=("Close", "last"),
+        High=("High", "max"),
+    )
+    stats["Days_On_Exchange"] += 1
+    stats["Open"] = stats["Open"].where(stats["First_Day"] == 0)
+
+    # Calculate Optimal Sell Day (OSD), first day of the highest price
+    stats["OSD"] = bars.loc[grouped["High"].idxmax(), "Day"].values
+
+    stats = pd.DataFrame(
+        {
+            "Ticker": stats.index,
+            "Days_On_Exchange": stats["Days_On_Exchange"].values,
+            "Pct_Overall_Change": _percent_change(
+                start_value=stats["Open"], end_value=stats["Close"]
+            ).values,
+            "OSD": stats["OSD"].values,
+            "OSD_Max_Pct_Gain": _percent_change(
+                start_value=stats["Open"], end_value=stats["High"]
+            ).values,
+            "OSD_Valid": (stats["Days_On_Exchange"] - OSD_THRESH > stats["OSD"]).values,
+        }
+    )
+
+    return stats
+
+
+def _performance_matrix(
+    bars: pd.DataFrame, tickers: List[str], num_days: int
+) -> np.ndarray:
+    """
+    Percent change of the close price from the IPO open price, per market day since IPO.
+
+    Parameters
+    ----------
+    bars: pd.DataFrame
+        Stacked price history (see _stack_price_history).
+
+    tickers: List[str]
+        Tickers of the matrix rows.
+
+    num_days: int
+        Number of market days of the matrix columns.
+
+    Returns
+    -------
+    matrix: np.ndarray
+        Performance matrix (tickers by days), NaN padded after the last market day of a ticker.
+        NaN for tickers without price history on IPO day.
+
+    """
+    grouped = bars.groupby("Ticker", sort=False)
+    ipo_open = (
+        grouped["Open"].transform("first").where(grouped["Day"].transform("first") == 0)
+    )
+    pct_change = _percent_change(start_value=ipo_open, end_value=bars["Close"])
+
+    matrix = np.full((len(tickers), num_days), np.nan)
+    row = bars["Ticker"].map({ticker: i for i, ticker in enumerate(tickers)})
+    keep = row.notna().values & (bars["Day"].values < num_days)
+    matrix[row.values[keep].astype(int), bars["Day"].values[keep].astype(int)] = (
+        pct_change.values[keep]
+    )
+
+    return matrix
+
+
+def _market_day_index(dates: np.ndarray) -> np.ndarray:
+    """
+    Position of dates on the market calendar, dates that are not market days rounding up to the
+    next market day.
+
+    """
+    dates = dates.astype("datetime64[D]")
+    if not np.all(
+        (dates >= np.datetime64(CALENDAR_START))
+        & (dates <= np.datetime64(CALENDAR_END))
+    ):
+        raise ValueError(
+            f"Dates should be within the market calendar ({CALENDAR_START} to {CALENDAR_END})."
+        )
+
+    return np.searchsorted(market_days(), dates)
+
+
+def _market_day_after(date: pd.Timestamp, n: int) -> pd.Timestamp:
+    """
+    N-th market day after a date, the date (or the next market day) being the 0-th.
+
+    """
+    days = market_days()
+    position = _market_day_index(np.array([date], dtype="datetime64[D]")).item() + n
+    if position >= len(days):
+        raise ValueError(f"Market day is after the market calendar ({CALENDAR_END}).")
+
+    return pd.Timestamp(days[position])
+
+
 def _percent_change(
-    start_value: float,
-    end_value: float,
+    start_value: Union[float, pd.Series],
+    end_value: Union[float, pd.Series],
     to_percent: bool = True,
     round_digits: Optional[int] = 3,
-) -> float:
+) -> Union[float, pd.Series]:
     """
     Calculates percent change of two values.
 
     Parameters
     ----------
-    start_value: float
-        Start value.
+    start_value: Union[float, pd.Series]
+        Start value(s).
 
-    end_value: str
-        End value.
+    end_value: Union[float, pd.Series]
+        End value(s).
 
     to_percent: bool;, default True
         Option to output value as percentage.
@@ -268,8 +746,8 @@ def _percent_change(
 
     Returns
     -------
-    percent_change: float
-        Percent change between start and end value.
+    percent_change: Union[float, pd.Series]
+        Percent change between start and end value(s).
 
     """
     # Percent or decimal value
@@ -414,7 +892,7 @@ def plotly_h_bar(
 
 
 def plotly_matrix_heatmap(
-    data: List[List[Optional[float]]],
+    data: Union[List[List[Optional[float]]], np.ndarray],
     x_categorical: List,
     y_categorical: List,
     plot_title: str = "",
@@ -424,8 +902,8 @@ def plotly_matrix_heatmap(
 
     Parameters
     ----------
-    data: List[List[Optional[float]]]
-        Matrix (List of Lists).
+    data: Union[List[List[Optional[float]]], np.ndarray]
+        Matrix (List of Lists or 2D array). Missing values (None or NaN) are left blank.
 
     x_categorical: List
         List of labels for each column.
@@ -457,10 +935,11 @@ def plotly_matrix_heatmap(
     TIER_MIDDLE_COLOR = "rgba(255, 99, 71, 0)"
     TIER_HIGH_COLOR = "rgba(0, 86, 0, 1)"
 
-    # Flatten out matrix data
-    flattened_data = [
-        x for x in [val for sublist in data for val in sublist] if x is not None
-    ]
+    # Flatten out matrix data, without missing values
+    data = np.array(data, dtype=float)
+    flattened_data = data[np.isfinite(data)]
+    if flattened_data.size == 0:
+        raise ValueError("There are no values in the matrix to plot.")
     min_value = min(flattened_data)
     max_value = max(flattened_data)
     color_scale = list()
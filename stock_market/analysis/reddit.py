@@ -1,5 +1,17 @@
+import functools
+import heapq
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
 import pandas as pd
+import praw
 
+from stock_market.data.reddit._connection import subreddit_handle
+from stock_market.data.reddit.sources import RedditSource
 from stock_market.data.reddit.trends import get_reddit_top_posts
 from stock_market.model._classification import detect_ticker
 from stock_market.model._nlp import nltk_sentiment
@@ -21,16 +33,46 @@ class RedditSentiment(object):
     time_period: str
         Time period of the top posts.
 
+    n_jobs: int, default 1
+        Number of worker processes for ticker detection and sentiment scoring. If -1, use all cpus.
+
+    chunk_size: int, default 500
+        Number of posts processed by a worker process at a time.
+
+    source: Optional[RedditSource], default None
+        Source of the posts (e.g. RedditDumpSource for backtests on local dumps). If None, the
+        live Reddit API.
+
     Notes
     -----
-    Reddit connection credentials must be specified in the .env file in the root level of stock_market.
+    Reddit connection credentials must be specified in the .env file in the root level of stock_market,
+    for the live Reddit API.
 
     """
 
-    def __init__(self, subreddit: str, num_post: int = 10, time_period: str = "day"):
-        top_posts = get_reddit_top_posts(
-            subreddit=subreddit, num_post=num_post, time_period=time_period
-        )
+    def __init__(
+        self,
+        subreddit: str,
+        num_post: int = 10,
+        time_period: str = "day",
+        n_jobs: int = 1,
+        chunk_size: int = 500,
+        source: Optional[RedditSource] = None,
+    ):
+        if n_jobs == -1:
+            n_jobs = os.cpu_count() or 1
+
+        if n_jobs < 1 or chunk_size < 1:
+            raise ValueError("n_jobs and chunk_size should be positive (or n_jobs=-1).")
+
+        if source is None:
+            top_posts = get_reddit_top_posts(
+                subreddit=subreddit, num_post=num_post, time_period=time_period
+            )
+        else:
+            top_posts = source.top_posts(
+                subreddit=subreddit, num_post=num_post, time_period=time_period
+            )
 
         # Top posts
         self.posts = top_posts
@@ -41,6 +83,10 @@ class RedditSentiment(object):
 
         # Supports
         self._ticker_classification = None
+        self._compound_scores = None
+        self._ticker_mentions = None
+        self._n_jobs = n_jobs
+        self._chunk_size = chunk_size
 
     @property
     def ticker_classification(self) -> list:
@@ -49,75 +95,467 @@ class RedditSentiment(object):
 
         """
         # Checking for first time run
-        if self._ticker_classification:
-            return self._ticker_classification
-        else:
-            posts = self.posts
-            classified_tickers = detect_ticker(text=posts["titles"], source="reddit")
+        if self._ticker_classification is None:
+            self._run_pipeline()
 
-            # Store classified tickers
-            self._ticker_classification = classified_tickers
+        return self._ticker_classification
+
+    @property
+    def ticker_mentions(self) -> pd.DataFrame:
+        """
+        Ticker mentions in long format: one row per post and detected ticker, with the post
+        index, ticker, compound sentiment score and number of comments.
+
+        """
+        # Checking for first time run
+        if self._ticker_mentions is None:
+            self._ticker_mentions = _mentions_frame(
+                range(len(self.ticker_classification)),
+                self.ticker_classification,
+                self._compound_scores,
+                self.posts["num_comments"],
+            )
 
-            return classified_tickers
+        return self._ticker_mentions
 
     @property
-    def sentiment(self):
+    def sentiment(self) -> pd.DataFrame:
+        """
+        Number of mentions and average sentiment of each ticker, from the non-neutral compound
+        scores. The weighted sentiment weighs each post by 1 + its number of comments.
+
+        """
         # Checking for first time run
-        if self._sentiment:
-            return self._sentiment
+        if self._sentiment is None:
+            self._run_pipeline()
+
+        return self._sentiment
+
+    def _run_pipeline(self):
+        """
+        Detects tickers and scores sentiments of the posts in chunks (over worker processes if
+        n_jobs > 1), then merges the chunk aggregates by ticker.
+
+        """
+        posts = self.posts["titles"]
+        num_comments = self.posts["num_comments"]
+        chunk_size = self._chunk_size
+        offsets = range(0, len(posts), chunk_size)
+        chunks = (
+            [posts[i : i + chunk_size] for i in offsets],
+            [num_comments[i : i + chunk_size] for i in offsets],
+        )
+
+        if self._n_jobs == 1 or len(offsets) <= 1:
+            chunk_results = list(map(_score_posts, *chunks))
         else:
-            # Get classified ticker data
-            ticker_classified = self.ticker_classification
-            valid_index = [
-                i for i, v in enumerate(ticker_classified) if v
-            ]  # Valid indexes
-            valid_tickers = [ticker_classified[i] for i in valid_index]
-
-            # Get posts
-            # TODO: Incorporate num_comments
-            posts = self.posts["titles"]
-            valid_posts = [posts[i] for i in valid_index]
-
-            # Perform sentiment
-            sentiment_res = nltk_sentiment(valid_posts)
-
-            # Compute avg compound scores
-            sentiment_agg = dict()
-            for i in range(len(valid_tickers)):
-                for ticker in valid_tickers[i]:
-                    # Check if ticker exists
-                    if sentiment_agg.get(ticker):
-                        sentiment_agg[ticker].append(sentiment_res[i]["compound"])
-                    else:
-                        sentiment_agg[ticker] = [sentiment_res[i]["compound"]]
-
-            # Prepare table with
-            sentiment_table = {
-                "ticker": list(),
-                "mentions": list(),
-                "sentiment": list(),
-            }
-            for ticker in sentiment_agg.keys():
-                # Append ticker
-                sentiment_table["ticker"].append(ticker)
-
-                # Append number of mentions
-                sentiment_table["mentions"].append(len(sentiment_agg[ticker]))
-
-                # Append sentiment scores
-                current_score = [sc for sc in sentiment_agg[ticker] if sc != 0.0]
-                if current_score:
-                    current_score = sum(current_score) / len(current_score)
-                else:
-                    current_score = 0.0
-                sentiment_table["sentiment"].append(current_score)
-
-            sentiment_table = (
-                pd.DataFrame(sentiment_table)
-                .sort_values(by="sentiment", ascending=False)
-                .reset_index(drop=True)
+            with ProcessPoolExecutor(
+                max_workers=min(self._n_jobs, len(offsets))
+            ) as executor:
+                chunk_results = list(executor.map(_score_posts, *chunks))
+
+        # Reduce: merge the chunk aggregates, in order of posts
+        classified_tickers = list()
+        compound_scores = list()
+        sentiment_agg = dict()
+        for chunk_classified, chunk_scores, chunk_agg in chunk_results:
+            classified_tickers += chunk_classified
+            compound_scores += chunk_scores
+            for ticker, chunk_ticker_agg in chunk_agg.items():
+                ticker_agg = sentiment_agg.get(ticker)
+                if ticker_agg is None:
+                    sentiment_agg[ticker] = chunk_ticker_agg
+                    continue
+
+                ticker_agg[0] += chunk_ticker_agg[0]
+                ticker_agg[1] += chunk_ticker_agg[1]
+                ticker_agg[2] += chunk_ticker_agg[2]
+                ticker_agg[3] += chunk_ticker_agg[3]
+                ticker_agg[4] += chunk_ticker_agg[4]
+
+        self._ticker_classification = classified_tickers
+        self._compound_scores = compound_scores
+        self._sentiment = _sentiment_table(sentiment_agg)
+
+
+class RedditSentimentStream(object):
+    """Streaming sentiment analysis on a subreddit's mentioned stocks
+
+    Follows a subreddit's new submissions (and comments) and incrementally updates the mentions and
+    sentiments of each ticker over rolling time windows. New items are scored once, and items
+    leaving a window are subtracted from its aggregates, so history is never recomputed. Windows
+    expire as items are added (up to the newest item) and updated (up to the current time).
+
+    Parameters
+    ----------
+    subreddit: str
+        Subreddit channel name.
+
+    windows: Tuple[str, ...], default ("1h", "24h")
+        Rolling time windows, as pandas timedelta strings.
+
+    comments: bool, default True
+        Option to follow comments as well as submissions (titles).
+
+    mode: str, default "rules"
+        Ticker detection mode of detect_ticker. "known" is suited to long comments.
+
+    skip_existing: bool, default False
+        Option to skip the items already posted when the stream starts.
+
+    Notes
+    -----
+    Reddit connection credentials must be specified in the .env file in the root level of stock_market.
+
+    """
+
+    def __init__(
+        self,
+        subreddit: str,
+        windows: Tuple[str, ...] = ("1h", "24h"),
+        comments: bool = True,
+        mode: str = "rules",
+        skip_existing: bool = False,
+    ):
+        self.subreddit = subreddit
+        self.windows = {
+            window: _RollingWindow(pd.Timedelta(window).total_seconds())
+            for window in windows
+        }
+        self._comments = comments
+        self._mode = mode
+        self._skip_existing = skip_existing
+
+        # Stream generators, created on first update
+        self._streams = None
+
+    def update(self, max_items: Optional[int] = None) -> int:
+        """
+        Pulls and scores the new items of the subreddit streams, without blocking.
+
+        Parameters
+        ----------
+        max_items: Optional[int], default None
+            Maximum number of new items to pull. If None, pull all new items.
+
+        Returns
+        -------
+        num_items: int
+            Number of new items.
+
+        """
+        if self._streams is None:
+            subreddit = subreddit_handle(self.subreddit)
+            stream_kwargs = {"pause_after": -1, "skip_existing": self._skip_existing}
+            self._streams = [subreddit.stream.submissions(**stream_kwargs)]
+            if self._comments:
+                self._streams.append(subreddit.stream.comments(**stream_kwargs))
+
+        # Streams yield None once the new items of a request are exhausted, the limit applies
+        # over all streams
+        new_items = itertools.chain.from_iterable(
+            iter(functools.partial(next, stream), None) for stream in self._streams
+        )
+        items = list(itertools.islice(new_items, max_items))
+
+        self.add(
+            posts=[
+                item.title if isinstance(item, praw.models.Submission) else item.body
+                for item in items
+            ],
+            created_utc=[item.created_utc for item in items],
+            num_comments=[getattr(item, "num_comments", 0) for item in items],
+        )
+        self._expire(time.time())
+
+        return len(items)
+
+    def replay(self, posts: Iterable[Dict], chunk_size: int = 1000) -> int:
+        """
+        Scores and adds past posts in chunks, e.g. RedditDumpSource(...).iter_posts(subreddit)
+        for backtests.
+
+        Parameters
+        ----------
+        posts: Iterable[Dict]
+            Posts with created_utc and title (submissions) or body (comments), and optionally
+            num_comments.
+
+        chunk_size: int, default 1000
+            Number of posts scored at a time.
+
+        Returns
+        -------
+        num_items: int
+            Number of replayed posts.
+
+        """
+        posts = iter(posts)
+
+        num_items = 0
+        for chunk in iter(lambda: list(itertools.islice(posts, chunk_size)), []):
+            self.add(
+                posts=[post.get("title") or post.get("body") or "" for post in chunk],
+                created_utc=[float(post["created_utc"]) for post in chunk],
+                num_comments=[int(post.get("num_comments") or 0) for post in chunk],
+            )
+            num_items += len(chunk)
+
+        return num_items
+
+    def add(
+        self,
+        posts: List[str],
+        created_utc: List[float],
+        num_comments: Optional[List[int]] = None,
+    ):
+        """
+        Scores posts and adds them to the rolling windows. Posts older than a window, from the
+        newest post added, are removed from it.
+
+        Parameters
+        ----------
+        posts: List[str]
+            Texts of the posts (titles, bodies or comments).
+
+        created_utc: List[float]
+            Creation time of each post, in unix seconds.
+
+        num_comments: Optional[List[int]], default None
+            Number of comments of each post, to weigh its sentiment. If None, no comments.
+
+        """
+        if num_comments is None:
+            num_comments = [0] * len(posts)
+
+        classified_tickers, compound_scores = _classify_and_score(
+            posts, mode=self._mode
+        )
+
+        for created, tickers, compound, post_comments in zip(
+            created_utc, classified_tickers, compound_scores, num_comments
+        ):
+            if tickers:
+                for rolling_window in self.windows.values():
+                    rolling_window.add(created, tickers, compound, post_comments)
+
+        if len(created_utc) > 0:
+            self._expire(max(created_utc))
+
+    def sentiment(
+        self, window: str = "1h", now: Optional[float] = None
+    ) -> pd.DataFrame:
+        """
+        Number of mentions and average sentiment (non-neutral compound score) of each ticker in a
+        rolling time window.
+
+        Parameters
+        ----------
+        window: str, default "1h"
+            Rolling time window, from the stream windows.
+
+        now: Optional[float], default None
+            End of the window, in unix seconds. If None, the current time.
+
+        """
+        if window not in self.windows:
+            raise Warning(
+                f"Choose from the available windows of the stream: {list(self.windows)}"
             )
 
-            self._sentiment = sentiment_table
+        rolling_window = self.windows[window]
+        rolling_window.expire(time.time() if now is None else now)
+
+        return _sentiment_table(rolling_window.sentiment_agg)
+
+    def _expire(self, now: float):
+        """
+        Removes the posts older than each window, ending at a point in time (unix seconds).
+
+        """
+        for rolling_window in self.windows.values():
+            rolling_window.expire(now)
+
+
+class _RollingWindow(object):
+    """
+    Running aggregates of each ticker (mentions, sum and count of non-neutral compound scores, sum
+    of weighted compound scores and of weights) over a rolling time window.
+
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.sentiment_agg = dict()
+
+        # Heap of posts by creation time, as streams can be slightly out of order
+        self._posts = list()
+        self._counter = itertools.count()
+
+    def add(
+        self,
+        created_utc: float,
+        tickers: List[str],
+        compound: float,
+        num_comments: int = 0,
+    ):
+        heapq.heappush(
+            self._posts,
+            (created_utc, next(self._counter), tickers, compound, num_comments),
+        )
+        _aggregate(self.sentiment_agg, tickers, compound, num_comments, sign=1)
+
+    def expire(self, now: float):
+        while self._posts and self._posts[0][0] <= now - self.seconds:
+            _, _, tickers, compound, num_comments = heapq.heappop(self._posts)
+            _aggregate(self.sentiment_agg, tickers, compound, num_comments, sign=-1)
+
+
+def _classify_and_score(
+    posts: List[str], mode: str = "rules"
+) -> Tuple[List[Optional[List[str]]], List[Optional[float]]]:
+    """
+    Detects tickers of posts, and scores the sentiments (compound) of posts with tickers.
+
+    """
+    classified_tickers = detect_ticker(text=posts, source="reddit", mode=mode)
+    valid_index = [i for i, v in enumerate(classified_tickers) if v]  # Valid indexes
+
+    # Perform sentiment
+    compound_scores = [None] * len(posts)
+    for i, score in zip(valid_index, nltk_sentiment([posts[i] for i in valid_index])):
+        compound_scores[i] = score["compound"]
+
+    return classified_tickers, compound_scores
+
+
+def _score_posts(
+    posts: List[str], num_comments: List[int]
+) -> Tuple[List[Optional[List[str]]], List[Optional[float]], Dict[str, List]]:
+    """
+    Detects tickers and scores sentiments of a chunk of posts.
+
+    Returns the classified tickers and compound score of each post, and the aggregate of each
+    ticker of the chunk (see _aggregate).
+
+    """
+    classified_tickers, compound_scores = _classify_and_score(posts)
+
+    sentiment_agg = dict()
+    for tickers, compound, post_comments in zip(
+        classified_tickers, compound_scores, num_comments
+    ):
+        if tickers:
+            _aggregate(sentiment_agg, tickers, compound, post_comments)
+
+    return classified_tickers, compound_scores, sentiment_agg
+
+
+def _mentions_frame(
+    post: List[int],
+    tickers: List[Optional[List[str]]],
+    compound: List[Optional[float]],
+    num_comments: List[int],
+) -> pd.DataFrame:
+    """
+    Long format ticker mentions (post, ticker, compound, num_comments), one row per post and
+    detected ticker. Posts without tickers are dropped.
+
+    """
+    # Number of detected tickers of each post, to repeat the post values
+    num_tickers = np.fromiter(
+        (len(post_tickers) if post_tickers else 0 for post_tickers in tickers),
+        dtype="int64",
+        count=len(tickers),
+    )
+
+    ticker_mentions = pd.DataFrame(
+        {
+            "post": np.repeat(np.asarray(post, dtype="int64"), num_tickers),
+            "ticker": pd.Series(
+                list(itertools.chain.from_iterable(filter(None, tickers))),
+                dtype=object,
+            ),
+            "compound": np.repeat(np.asarray(compound, dtype=float), num_tickers),
+            "num_comments": np.repeat(
+                np.asarray(num_comments, dtype="int64"), num_tickers
+            ),
+        }
+    )
+
+    return ticker_mentions
+
+
+def _aggregate(
+    sentiment_agg: Dict[str, List],
+    tickers: List[str],
+    compound: float,
+    num_comments: int = 0,
+    sign: int = 1,
+):
+    """
+    Adds (or removes, if sign is -1) a post to the aggregate of each of its tickers. Non-neutral
+    compound scores are weighted by 1 + number of comments.
+
+    """
+    scored = compound != 0.0
+    if scored:
+        score = sign * compound
+        weight = sign * (num_comments + 1)
+        weighted_score = score * (num_comments + 1)
+
+    for ticker in tickers:
+        ticker_agg = sentiment_agg.get(ticker)
+        if ticker_agg is None:
+            ticker_agg = sentiment_agg[ticker] = [0, 0.0, 0, 0.0, 0]
+
+        ticker_agg[0] += sign
+        if scored:
+            ticker_agg[1] += score
+            ticker_agg[2] += sign
+            ticker_agg[3] += weighted_score
+            ticker_agg[4] += weight
+
+        # Tickers without mentions left
+        if ticker_agg[0] == 0:
+            del sentiment_agg[ticker]
+
+
+def _sentiment_table(sentiment_agg: Dict[str, List]) -> pd.DataFrame:
+    """
+    Sentiment table (ticker, mentions, sentiment, weighted_sentiment) from the aggregate of each
+    ticker, by descending sentiment. Same columns as the RedditSentiment table.
+
+    """
+    # Prepare table with
+    sentiment_table = {
+        "ticker": list(),
+        "mentions": list(),
+        "sentiment": list(),
+        "weighted_sentiment": list(),
+    }
+    for ticker, (
+        mentions,
+        score_sum,
+        score_count,
+        weighted_sum,
+        weight_sum,
+    ) in sentiment_agg.items():
+        sentiment_table["ticker"].append(ticker)
+        sentiment_table["mentions"].append(mentions)
+
+        # Average of non-neutral sentiment scores, and weighted by number of comments
+        sentiment_table["sentiment"].append(
+            score_sum / score_count if score_count else 0.0
+        )
+        sentiment_table["weighted_sentiment"].append(
+            weighted_sum / weight_sum if weight_sum else 0.0
+        )
+
+    sentiment_table = (
+        pd.DataFrame(sentiment_table)
+        .sort_values(by="sentiment", ascending=False)
+        .reset_index(drop=True)
+    )
 
-            return sentiment_table
+    return sentiment_table
@@ -1,13 +1,18 @@
 import warnings
-from typing import List, Optional
+from typing import Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-from pandas_datareader._utils import RemoteDataError
 from plotly.graph_objs._figure import Figure as go_Figure
 from plotly.subplots import make_subplots
 
-from stock_market.data import get_ticker
+from stock_market.data import (
+    get_ticker,
+    get_tickers,
+    next_market_day,
+    previous_market_day,
+)
 
 MARKET_TIME = [
     "open",  # at market open
@@ -61,26 +66,39 @@ def stock_profit(
     if purchase_time not in MARKET_TIME or sell_time not in MARKET_TIME:
         raise Exception(f"Populate valid time metrics: {MARKET_TIME}")
 
-    # TODO: Think of a more efficient way to do this
+    # Market days of the requested dates, to call the ticker data over the exact date range
+    purchase_date = pd.to_datetime(purchase_date).normalize()
+    sell_date = pd.to_datetime(sell_date).normalize() if sell_date else None
+
+    # For buy date, shift to next nearest day if invalid
+    purchase_day = next_market_day(purchase_date)
+
+    # For sell date, shift to previous nearest day
+    sell_day = previous_market_day(sell_date if sell_date else "today")
+
+    # Dates outside of the market calendar are not shifted, the ticker history is checked instead
+    if purchase_day is None:
+        purchase_day = purchase_date
+    if sell_day is None:
+        sell_day = sell_date if sell_date else pd.to_datetime("today").normalize()
 
     # Call the ticker data
-    ticker_history = get_ticker(
-        ticker=ticker, start_date=purchase_date, end_date=sell_date, new_metrics=False
-    )
+    ticker_history = None
+    if purchase_day <= sell_day:
+        ticker_history = get_ticker(
+            ticker=ticker, start_date=purchase_day, end_date=sell_day, new_metrics=False
+        )
 
     # If no data is returned (from invalid date range)
     if ticker_history is None:
         print("No stock history for requested date range.")
         return None
 
-    # Checking validity of the requested days
-
-    # For buy date, shift to next nearest day if invalid
-    if pd.to_datetime(purchase_date) != ticker_history.index[0]:
+    # Checking validity of the requested days (also shifted if the stock was not in market)
+    if purchase_date != ticker_history.index[0]:
         warnings.warn("Purchase date has been shifted to the next stock in market day.")
 
-    # For sell date, shift to previous nearest day
-    if pd.to_datetime(sell_date) != ticker_history.index[-1]:
+    if sell_date is not None and sell_date != ticker_history.index[-1]:
         warnings.warn(
             "Sell date has been shifted back to the previous stock in market day."
         )
@@ -104,6 +122,135 @@ def stock_profit(
     return net_profit
 
 
+def portfolio_profit(
+    positions: pd.DataFrame,
+    max_workers: int = 8,
+) -> pd.DataFrame:
+    """
+    Stock calculator over many positions at once, to understand the net profit from buying and
+    selling each position. Each ticker's history is requested only once.
+
+    Parameters
+    ----------
+    positions: pd.DataFrame
+        Positions, with a row per buy and sell. Columns are the stock_profit parameters: ticker,
+        quantity, purchase_date, and optionally sell_date, purchase_time and sell_time (with the
+        same defaults as stock_profit).
+
+    max_workers: int, default 8
+        Maximum number of concurrent ticker requests.
+
+    Returns
+    -------
+    profits: pd.DataFrame
+        Positions with the market days and prices of the buy and sell, and the net profit. Values
+        are missing for positions with no stock history in the requested date range.
+
+    """
+    profits = positions.copy()
+    today = pd.to_datetime("today").normalize()
+
+    # Position values, with stock_profit defaults for missing values
+    tickers = profits["ticker"].str.upper()
+    purchase_dates = pd.to_datetime(profits["purchase_date"]).dt.normalize()
+    sell_dates = (
+        pd.to_datetime(profits["sell_date"]).dt.normalize().fillna(today)
+        if "sell_date" in profits
+        else pd.Series(today, index=profits.index)
+    )
+    market_times = [
+        (
+            profits[column].fillna(default).str.lower()
+            if column in profits
+            else pd.Series(default, index=profits.index)
+        )
+        for column, default in [("purchase_time", "open"), ("sell_time", "close")]
+    ]
+
+    # Check if purchase or sell times are valid
+    if not all(times.isin(MARKET_TIME).all() for times in market_times):
+        raise Exception(f"Populate valid time metrics: {MARKET_TIME}")
+
+    # Positions without a purchase date have no history
+    dated = purchase_dates.notna().to_numpy()
+
+    # Call each ticker's data once, over the dates of all its positions
+    ticker_dates = pd.DataFrame(
+        {"ticker": tickers, "start": purchase_dates, "end": sell_dates}
+    )[dated].groupby("ticker")
+    ticker_history = get_tickers(
+        tickers=list(ticker_dates.groups),
+        start_date=ticker_dates["start"].min().to_dict(),
+        end_date=ticker_dates["end"].max().to_dict(),
+        new_metrics=False,
+        max_workers=max_workers,
+        errors="ignore",
+    )
+    ticker_history = {
+        ticker: history
+        for ticker, history in ticker_history.items()
+        if history is not None
+    }
+
+    # Stack all histories, sorted by (ticker code, market day) search keys
+    history = pd.concat(
+        list(ticker_history.values()) or [pd.DataFrame(columns=["Open"])]
+    )
+    history_dates = history.index
+    history_codes = np.repeat(
+        np.arange(len(ticker_history)),
+        [len(ticker_data) for ticker_data in ticker_history.values()],
+    )
+    history_keys = _search_keys(history_codes, history_dates)
+    prices = history.reindex(columns=[time.capitalize() for time in MARKET_TIME])
+
+    # Resolve buy (next nearest market day) and sell (previous nearest market day) rows, in a
+    # single search over all positions
+    position_codes = pd.Index(list(ticker_history)).get_indexer(tickers)
+    purchase_index = np.searchsorted(
+        history_keys, _search_keys(position_codes, purchase_dates), side="left"
+    )
+    sell_index = (
+        np.searchsorted(
+            history_keys, _search_keys(position_codes, sell_dates), side="right"
+        )
+        - 1
+    )
+
+    # Rows must belong to the position's ticker, with the buy before the sell
+    valid = (
+        dated
+        & (position_codes >= 0)
+        & (purchase_index <= sell_index)
+        & (purchase_index < len(history))
+        & (sell_index >= 0)
+    )
+    valid[valid] &= (history_codes[purchase_index[valid]] == position_codes[valid]) & (
+        history_codes[sell_index[valid]] == position_codes[valid]
+    )
+
+    # Calculate
+    for prefix, index, times in [
+        ("purchase", purchase_index[valid], market_times[0][valid]),
+        ("sell", sell_index[valid], market_times[1][valid]),
+    ]:
+        market_dates = pd.Series(pd.NaT, index=profits.index)
+        market_dates[valid] = history_dates[index]
+        market_prices = np.full(len(profits), np.nan)
+        market_prices[valid] = prices.to_numpy(dtype=float)[
+            index, pd.Index(MARKET_TIME).get_indexer(times)
+        ]
+
+        profits[f"{prefix}_market_date"] = market_dates
+        profits[f"{prefix}_price"] = market_prices
+
+    profits["net_profit"] = (
+        profits["sell_price"] - profits["purchase_price"]
+    ) * profits["quantity"]
+
+    return profits
+
+
 def stock_chart(
     stocks: List[str],
     start_date: str,
@@ -129,11 +276,37 @@ def stock_chart(
         The plotly object with the stock price comparison. Use chart_grid.show() for output.
 
     """
-    # Constant parameters
-    OPACITY = 0.8
-    BAR_SHRINKAGE = 2
-    YAXIS_RANGE_EXTENSION = 0.4
+    return stock_chart_figure(
+        stock_chart_data(stocks=stocks, start_date=start_date, end_date=end_date)
+    )
+
+
+def stock_chart_data(
+    stocks: List[str],
+    start_date: str,
+    end_date: str = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Price and volume of the requested list of stock(s), as charted by stock_chart (without building
+    the chart).
+
+    Parameters
+    ----------
+    stocks: List[str]
+        List of stocks to get price and volume.
+
+    start_date: str
+        Start date of stock information. (e.g. 2020-01-01, 2020/01/01, January 1 2020)
+
+    end_date: str, default None
+        End date of stock information. If None, use current date.
 
+    Returns
+    -------
+    stocks_info: Dict[str, pd.DataFrame]
+        Close price and volume per valid stock (lower cased), in the requested order.
+
+    """
     # Unique list of stocks (lower cased)
     stocks = _unique_ordered_list([stock.lower() for stock in stocks])
     stock_price_col = "Close"
@@ -144,31 +317,27 @@ def stock_chart(
     invalid_stocks = list()
 
     # First check validity of tickers in list. Ticker is invalid if:
-    #  - Invalid ticker (KeyError)
+    #  - Invalid ticker (failed request)
     #  - Ticker is not in the market within the date range requested (return None)
-    for stock in stocks:
-        try:
-            # Attempt stock data call
-            stock_pd = get_ticker(
-                ticker=stock, start_date=start_date, end_date=end_date
-            )
-
-            # Date range is invalid (but stock exists)
-            if stock_pd is None:
-                invalid_stocks.append(stock)  # Add stock to invalid list
-                continue
-
-            # If valid, add data to stock info
-            stocks_info[stock] = stock_pd[[stock_price_col, stock_volume_col]]
+    # Price and volume only, without the additional metrics
+    stocks_data = get_tickers(
+        tickers=stocks,
+        start_date=start_date,
+        end_date=end_date,
+        new_metrics=False,
+        errors="ignore",
+    )
+    for stock, stock_pd in stocks_data.items():
+        # Invalid ticker or date range
+        if stock_pd is None:
+            invalid_stocks.append(stock)  # Add stock to invalid list
+            continue
 
-        # Invalid ticker
-        except RemoteDataError:
-            invalid_stocks.append(stock)
+        # If valid, add data to stock info
+        stocks_info[stock] = stock_pd[[stock_price_col, stock_volume_col]]
 
     # Case when all stocks are invalid
-    valid_tickers = list(stocks_info.keys())
-    valid_ticker_count = len(valid_tickers)
-    if valid_ticker_count == 0:
+    if len(stocks_info) == 0:
         raise Exception(
             "All stock(s) specified are either invalid or was not in the market for requested"
             "date range. Please re-specify with valid parameters."
@@ -181,6 +350,34 @@ def stock_chart(
             f"date range: {invalid_stocks}"
         )
 
+    return stocks_info
+
+
+def stock_chart_figure(stocks_info: Dict[str, pd.DataFrame]) -> go_Figure:
+    """
+    Builds the stock performance chart of stock_chart.
+
+    Parameters
+    ----------
+    stocks_info: Dict[str, pd.DataFrame]
+        Close price and volume per stock, from stock_chart_data.
+
+    Returns
+    -------
+    chart_grid: go_Figure
+        The plotly object with the stock price comparison. Use chart_grid.show() for output.
+
+    """
+    # Constant parameters
+    OPACITY = 0.8
+    BAR_SHRINKAGE = 2
+    YAXIS_RANGE_EXTENSION = 0.4
+
+    stock_price_col = "Close"
+    stock_volume_col = "Volume"
+    valid_tickers = list(stocks_info.keys())
+    valid_ticker_count = len(valid_tickers)
+
     # Setup specs
     specs = list()
     for i in range(valid_ticker_count):
@@ -281,6 +478,14 @@ def stock_chart(
 
 
 # Helper functions
+def _search_keys(codes: np.ndarray, dates: pd.Series) -> np.ndarray:
+    """
+    Sortable search keys of (ticker code, date) pairs.
+    """
+    days = np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+    return np.asarray(codes, dtype=np.int64) * (1 << 32) + days
+
+
 def _unique_ordered_list(_list: list):
     """
     Returns a unique list preserving the original order.
@@ -2,10 +2,25 @@ from pathlib import Path as _Path
 
 import pandas as _pandas
 
+from stock_market.data._archive import IPOArchive
+from stock_market.data._cache import BarCache
+from stock_market.data._calendar import (
+    is_market_day,
+    market_days,
+    next_market_day,
+    previous_market_day,
+)
 from stock_market.data._crypto import get_crypto
 from stock_market.data._ipo import IPO
-from stock_market.data._stocks import get_ticker, stock_health
-from stock_market.data.reddit.trends import get_reddit_top_posts
+from stock_market.data._metrics import compute_metrics
+from stock_market.data._stocks import get_ticker, get_tickers, stock_health
+from stock_market.data._store import HistoryStore
+from stock_market.data.reddit.sources import (
+    RedditDumpSource,
+    RedditLiveSource,
+    RedditSource,
+)
+from stock_market.data.reddit.trends import get_reddit_posts, get_reddit_top_posts
 
 # S&P data
 SP500 = _pandas.read_csv(_Path(__file__).parent / "_files/sp500.csv")
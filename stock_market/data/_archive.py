@@ -0,0 +1,376 @@
+import contextlib
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path as _Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from stock_market.data._ipo import IPO
+from stock_market.data.constants import CACHE_DIR_DEFAULT, CACHE_DIR_ENV
+
+# File locks across processes, where available (not on Windows)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# IPO tables archived on each record
+IPO_TABLES = ["recent_ipo", "upcoming_ipo", "future_ipo", "withdrawn_ipo"]
+
+# Event operations: row added, row removed, table columns and types
+OP_ADD = "+"
+OP_REMOVE = "-"
+OP_SCHEMA = "schema"
+
+
+class IPOArchive(object):
+    """
+    Append-only local archive (JSON lines) of the IPO calendar tables, keeping the history that
+    each scrape of the MarketWatch page loses.
+
+    Each table is stored as a log of row events (archive/recent_ipo.jsonl). Rows are identified by
+    a hash of their content: a record only appends the rows added or removed since the last record,
+    so unchanged tables write nothing. Tables are rebuilt at any point in time by replaying the
+    events.
+
+    Parameters
+    ----------
+    path: Optional[str], default None
+        Directory of the archive. If None, use the STOCK_MARKET_CACHE_DIR environment variable,
+        or ~/.stock_market if it is not set.
+
+    Notes
+    -----
+    Identical rows of a table are archived once. Records of a table are serialized across
+    processes by a lock on its log (where file locks are available), and each record is appended
+    in a single write.
+
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        if path is None:
+            path = _Path(os.getenv(CACHE_DIR_ENV, CACHE_DIR_DEFAULT)) / "archive"
+
+        self.path = _Path(path).expanduser()
+
+        # Current rows (by hash) and types of each table, with the log size they were read at
+        self._state = dict()
+        self._lock = threading.Lock()
+
+    def record(
+        self, ipo: Optional[IPO] = None, timestamp: Optional[str] = None
+    ) -> Dict[str, int]:
+        """
+        Archives the current IPO tables.
+
+        Parameters
+        ----------
+        ipo: Optional[IPO], default None
+            IPO data to archive. If None, the current MarketWatch page.
+
+        timestamp: Optional[str], default None
+            Time of the scrape. If None, the current time (UTC).
+
+        Returns
+        -------
+        changes: Dict[str, int]
+            Number of rows added or removed, by table.
+
+        """
+        if ipo is None:
+            ipo = IPO()
+
+        return {
+            name: self.record_table(name, getattr(ipo, name), timestamp=timestamp)
+            for name in IPO_TABLES
+        }
+
+    def record_table(
+        self, name: str, data: pd.DataFrame, timestamp: Optional[str] = None
+    ) -> int:
+        """
+        Archives a table, appending only the rows added or removed since its last record.
+
+        Parameters
+        ----------
+        name: str
+            Table name (e.g. recent_ipo).
+
+        data: pd.DataFrame
+            Current table.
+
+        timestamp: Optional[str], default None
+            Time of the scrape. If None, the current time (UTC). Records of a table are in time
+            order: a time before its last record raises a ValueError.
+
+        Returns
+        -------
+        num_changes: int
+            Number of rows added or removed.
+
+        """
+        time = _timestamp(timestamp).isoformat()
+        dtypes = {column: str(dtype) for column, dtype in data.dtypes.items()}
+        rows = {_row_hash(row): row for row in _records(data)}
+
+        path = self._table_path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._lock, _locked_log(path) as log:
+            current_rows, current_dtypes, last_time = self._read_state(name)
+            if last_time is not None and pd.Timestamp(time) < pd.Timestamp(last_time):
+                raise ValueError(
+                    f"Record time {time} is before the last record of {name} ({last_time})."
+                )
+
+            events = list()
+            if dtypes != current_dtypes:
+                events.append({"time": time, "op": OP_SCHEMA, "dtypes": dtypes})
+            events += [
+                {"time": time, "op": OP_REMOVE, "hash": row_hash}
+                for row_hash in current_rows
+                if row_hash not in rows
+            ]
+            events += [
+                {"time": time, "op": OP_ADD, "hash": row_hash, "row": row}
+                for row_hash, row in rows.items()
+                if row_hash not in current_rows
+            ]
+
+            if events:
+                # One write per record, appended after the previous records
+                lines = "".join(json.dumps(event) + "\n" for event in events)
+                _append(log, lines.encode("utf-8"))
+
+            # The log is locked and only ever appended to, so the state read is still current
+            if events:
+                last_time = time
+            self._state[name] = (os.fstat(log).st_size, rows, dtypes, last_time)
+
+        return sum(event["op"] != OP_SCHEMA for event in events)
+
+    def snapshot(
+        self, name: str, as_of: Optional[str] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Table as it was at a point in time.
+
+        Parameters
+        ----------
+        name: str
+            Table name (e.g. recent_ipo).
+
+        as_of: Optional[str], default None
+            Point in time (UTC). If None, the last record.
+
+        Returns
+        -------
+        data: Optional[pd.DataFrame]
+            Table rows, in the order they were first archived. None if the table was not archived
+            by then.
+
+        """
+        rows, dtypes, _ = self._replay(name, as_of=as_of)
+        if dtypes is None:
+            return None
+
+        return _frame(list(rows.values()), dtypes)
+
+    def history(self, name: str) -> Optional[pd.DataFrame]:
+        """
+        All rows ever archived of a table, with the time they were first and last on the page.
+
+        Parameters
+        ----------
+        name: str
+            Table name (e.g. recent_ipo).
+
+        Returns
+        -------
+        data: Optional[pd.DataFrame]
+            Table rows, with First_Seen and Removed (NaT if the row is still on the page) columns.
+            None if the table is not archived.
+
+        """
+        rows, dtypes = dict(), None
+        for event in self._events(name):
+            if event["op"] == OP_SCHEMA:
+                dtypes = {**(dtypes or dict()), **event["dtypes"]}
+            elif event["op"] == OP_ADD:
+                rows[event["hash"]] = dict(
+                    event["row"], First_Seen=event["time"], Removed=None
+                )
+            elif event["hash"] in rows:
+                rows[event["hash"]]["Removed"] = event["time"]
+
+        if dtypes is None:
+            return None
+
+        data = _frame(list(rows.values()), dtypes).reindex(
+            columns=list(dtypes) + ["First_Seen", "Removed"]
+        )
+        data["First_Seen"] = pd.to_datetime(data["First_Seen"])
+        data["Removed"] = pd.to_datetime(data["Removed"])
+
+        return data
+
+    def _read_state(self, name: str):
+        """
+        Current rows (by hash), types and last record time of a table, replayed from its log when
+        the log changed since it was last read.
+
+        """
+        size = _log_size(self._table_path(name))
+        if name in self._state and self._state[name][0] == size:
+            return self._state[name][1:]
+
+        rows, dtypes, last_time = self._replay(name)
+
+        return rows, dtypes or dict(), last_time
+
+    def _replay(self, name: str, as_of: Optional[str] = None):
+        """
+        Rows (by hash), types and last record time of a table at a point in time, replayed from
+        its log (in time order, see record_table). Types and time are None if the table was not
+        archived by then.
+
+        """
+        as_of = _timestamp(as_of) if as_of is not None else None
+
+        rows, dtypes, last_time = dict(), None, None
+        for event in self._events(name):
+            if as_of is not None and pd.Timestamp(event["time"]) > as_of:
+                break
+            last_time = event["time"]
+            if event["op"] == OP_SCHEMA:
+                dtypes = event["dtypes"]
+            elif event["op"] == OP_ADD:
+                rows[event["hash"]] = event["row"]
+            else:
+                rows.pop(event["hash"], None)
+
+        return rows, dtypes, last_time
+
+    def _events(self, name: str) -> List[dict]:
+        """
+        Events of a table log, in order. A partially written last line is skipped.
+
+        """
+        try:
+            with open(self._table_path(name), "r", encoding="utf-8") as file:
+                lines = file.readlines()
+        except FileNotFoundError:
+            return list()
+
+        events = list()
+        for line in lines:
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+
+        return events
+
+    def _table_path(self, name: str) -> _Path:
+        """
+        File path of a table log.
+
+        """
+        return self.path / f"{name}.jsonl"
+
+
+def _records(data: pd.DataFrame) -> List[dict]:
+    """
+    Rows of a table as JSON compatible records (dates as ISO strings, missing values as None).
+
+    """
+    return json.loads(
+        data.reset_index(drop=True).to_json(
+            orient="records", date_format="iso", date_unit="s"
+        )
+    )
+
+
+def _row_hash(row: dict) -> str:
+    """
+    Content hash of a record.
+
+    """
+    return hashlib.sha1(json.dumps(row, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _frame(rows: List[dict], dtypes: Dict[str, str]) -> pd.DataFrame:
+    """
+    Table from records, with the archived column types.
+
+    """
+    data = pd.DataFrame(rows, columns=list(dtypes) if len(rows) == 0 else None)
+    data = data.reindex(
+        columns=list(dtypes) + [column for column in data if column not in dtypes]
+    )
+    for column, dtype in dtypes.items():
+        try:
+            if dtype.startswith("datetime64"):
+                data[column] = pd.to_datetime(data[column])
+            else:
+                data[column] = data[column].astype(dtype)
+        except (TypeError, ValueError):
+            # e.g. missing values of an integer column
+            pass
+
+    return data
+
+
+def _timestamp(timestamp: Optional[str]) -> pd.Timestamp:
+    """
+    Naive UTC timestamp of a time. If None, the current time.
+
+    """
+    if timestamp is None:
+        return pd.Timestamp.utcnow().tz_localize(None)
+
+    timestamp = pd.Timestamp(timestamp)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert("UTC").tz_localize(None)
+
+    return timestamp
+
+
+@contextlib.contextmanager
+def _locked_log(path: _Path):
+    """
+    File descriptor of a table log opened for appending, locked exclusively (where file locks are
+    available) until closed.
+
+    """
+    log = os.open(str(path), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(log, fcntl.LOCK_EX)
+        yield log
+    finally:
+        # Closing the file releases the lock
+        os.close(log)
+
+
+def _append(log: int, data: bytes):
+    """
+    Appends data to a log file descriptor, in a single write unless the system writes it partially.
+
+    """
+    while data:
+        data = data[os.write(log, data) :]
+
+
+def _log_size(path: _Path) -> int:
+    """
+    Size of a table log, 0 if it does not exist.
+
+    """
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
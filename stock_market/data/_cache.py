@@ -0,0 +1,278 @@
+import os
+import pickle
+import re
+import threading
+import time
+from pathlib import Path as _Path
+from typing import Any, Callable, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+from stock_market.data.constants import CACHE_DIR_DEFAULT, CACHE_DIR_ENV
+
+ONE_DAY = pd.Timedelta(days=1)
+
+# Price compared between the cached and downloaded bars, to detect re-adjusted history
+ADJUSTED_PRICE = ["Adj Close", "Close"]
+
+
+class BarCache(object):
+    """
+    Local on-disk store of daily price bars, keyed by ticker and date.
+
+    Each ticker is stored as one pickled file, holding its bars and the date range already
+    requested from the data source. Requests within the covered range are read locally, and only
+    the missing date ranges at the edges are downloaded.
+
+    Parameters
+    ----------
+    cache_dir: Optional[str], default None
+        Directory of the bar files. If None, use the STOCK_MARKET_CACHE_DIR environment variable
+        (as set when the cache is accessed), or ~/.stock_market if it is not set.
+
+    Notes
+    -----
+    Bars dated today or later are never marked as covered, since the last market day may still be
+    in progress. They are re-downloaded (and replaced) on the next request that includes them.
+
+    Past prices are re-adjusted by the data source after splits and dividends. Edge downloads
+    overlap the nearest cached bar, and if its adjusted close changed, the whole covered range is
+    downloaded again instead of stitching new bars onto stale ones.
+
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self._cache_dir = cache_dir
+
+    @property
+    def cache_dir(self) -> _Path:
+        """
+        Directory of the bar files, read from the environment on each access if no directory was
+        specified.
+
+        """
+        cache_dir = self._cache_dir
+        if cache_dir is None:
+            cache_dir = os.getenv(CACHE_DIR_ENV, CACHE_DIR_DEFAULT)
+
+        return _Path(cache_dir).expanduser() / "bars"
+
+    def get(
+        self,
+        key: str,
+        start_date: pd.Timestamp,
+        end_date: pd.Timestamp,
+        fetch: Callable[[pd.Timestamp, pd.Timestamp], Optional[pd.DataFrame]],
+    ) -> Optional[pd.DataFrame]:
+        """
+        Get bars over a date period, downloading only the ranges missing from the cache.
+
+        Parameters
+        ----------
+        key: str
+            Cache key, usually the ticker symbol.
+
+        start_date: pd.Timestamp
+            Start date of the bars.
+
+        end_date: pd.Timestamp
+            End date of the bars.
+
+        fetch: Callable[[pd.Timestamp, pd.Timestamp], Optional[pd.DataFrame]]
+            Function downloading bars for a date range. Returns None if no bars exist in the range.
+
+        Returns
+        -------
+        bars: Optional[pd.DataFrame]
+            Bars within the date period. None if no bars exist in the date period.
+
+        """
+        start_date = start_date.normalize()
+        end_date = end_date.normalize()
+        last_complete_day = pd.to_datetime("today").normalize() - ONE_DAY
+
+        # Find missing date ranges at the edges of the cached range
+        entry = self.load(key)
+        if entry is None:
+            bars = None
+            covered = (start_date, end_date)
+            missing = [covered]
+        else:
+            bars = entry["bars"]
+            covered = (min(start_date, entry["start"]), max(end_date, entry["end"]))
+            missing = list()
+            if start_date < entry["start"]:
+                missing.append((start_date, entry["start"] - ONE_DAY))
+            if end_date > entry["end"]:
+                missing.append((entry["end"] + ONE_DAY, end_date))
+
+        if missing:
+            # Download missing ranges, newly downloaded bars take precedence
+            frames = list()
+            stale = False
+            for range_start, range_end in missing:
+                # Overlap the nearest cached bar of the covered range
+                anchor = None
+                if bars is not None:
+                    covered_bars = bars.loc[entry["start"] : entry["end"]]
+                    if len(covered_bars) == 0:
+                        pass
+                    elif range_end < entry["start"]:
+                        anchor = covered_bars.index[0]
+                        range_end = anchor
+                    else:
+                        anchor = covered_bars.index[-1]
+                        range_start = anchor
+
+                frame = fetch(range_start, range_end)
+                if frame is not None:
+                    frames.append(frame)
+                    stale = stale or _readjusted(bars, frame, anchor)
+
+            if stale:
+                # Cached bars are stale, download the whole covered range again
+                bars = fetch(*covered)
+                frames = [bars] if bars is not None else list()
+            elif bars is not None:
+                frames.append(bars)
+
+            if frames:
+                bars = pd.concat(frames)
+                bars = bars[~bars.index.duplicated(keep="first")].sort_index()
+
+            # Store covered range, up to the last complete market day
+            covered = (covered[0], min(covered[1], last_complete_day))
+            if covered[0] <= covered[1]:
+                self.save(key, {"bars": bars, "start": covered[0], "end": covered[1]})
+
+        if bars is None:
+            return None
+
+        bars = bars.loc[start_date:end_date]
+        if len(bars) == 0:
+            return None
+
+        return bars.copy()
+
+    def load(self, key: str) -> Optional[dict]:
+        """
+        Load the cache entry of a key. None if the key is not cached or the file is unreadable.
+
+        """
+        try:
+            with open(self._path(key), "rb") as file:
+                return pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def save(self, key: str, entry: dict):
+        """
+        Save the cache entry of a key, replacing the file atomically.
+
+        """
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temporary file first, so concurrent readers never see a partial file
+        temp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(temp_path, "wb") as file:
+            pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+    def clear(self, key: Optional[str] = None):
+        """
+        Remove the cache entry of a key. If None, remove all cache entries.
+
+        """
+        paths = [self._path(key)] if key else self.cache_dir.glob("*.pkl")
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _path(self, key: str) -> _Path:
+        """
+        File path of a key.
+
+        """
+        return self.cache_dir / (re.sub(r"[^A-Z0-9.\-^=]", "_", key.upper()) + ".pkl")
+
+
+def _readjusted(
+    bars: Optional[pd.DataFrame], frame: pd.DataFrame, anchor: Optional[pd.Timestamp]
+) -> bool:
+    """
+    Checks if the adjusted close of the overlapping bar differs between the cached and the
+    downloaded bars.
+
+    """
+    if anchor is None or anchor not in frame.index:
+        return False
+
+    column = next((column for column in ADJUSTED_PRICE if column in bars), None)
+    if column is None or column not in frame:
+        return False
+
+    return not np.isclose(bars[column].loc[anchor], frame[column].loc[anchor])
+
+
+class TTLCache(object):
+    """
+    In-memory cache of values that expire after a time to live, for sharing web scraped data
+    across instances. Expired values are loaded again on the next access.
+
+    Parameters
+    ----------
+    ttl: float
+        Time to live of the cached values, in seconds.
+
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._values = dict()
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """
+        Get the cached value of a key, loading it if missing or expired.
+
+        Parameters
+        ----------
+        key: Hashable
+            Cache key.
+
+        load: Callable[[], Any]
+            Function loading the value of the key.
+
+        Returns
+        -------
+        value: Any
+            Cached value.
+
+        """
+        # Concurrent accesses wait for a single load
+        with self._lock:
+            cached = self._values.get(key)
+            if cached is None or time.monotonic() - cached[0] > self.ttl:
+                cached = (time.monotonic(), load())
+                self._values[key] = cached
+
+        return cached[1]
+
+    def clear(self, key: Optional[Hashable] = None):
+        """
+        Remove the cached value of a key. If None, remove all cached values.
+
+        """
+        with self._lock:
+            if key is None:
+                self._values.clear()
+            else:
+                self._values.pop(key, None)
+
+
+# Shared cache used by data calls
+BAR_CACHE = BarCache()
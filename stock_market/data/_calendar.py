@@ -0,0 +1,163 @@
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.holiday import (
+    MO,
+    AbstractHolidayCalendar,
+    DateOffset,
+    GoodFriday,
+    Holiday,
+    USLaborDay,
+    USMemorialDay,
+    USPresidentsDay,
+    USThanksgivingDay,
+    nearest_workday,
+    sunday_to_monday,
+)
+
+# Range of the precomputed market days
+CALENDAR_START = "1990-01-01"
+CALENDAR_END = "2100-12-31"
+
+# Unscheduled full day market closures
+MARKET_CLOSURES = [
+    "1994-04-27",  # President Nixon funeral
+    "2001-09-11",  # September 11 attacks
+    "2001-09-12",
+    "2001-09-13",
+    "2001-09-14",
+    "2004-06-11",  # President Reagan funeral
+    "2007-01-02",  # President Ford funeral
+    "2012-10-29",  # Hurricane Sandy
+    "2012-10-30",
+    "2018-12-05",  # President Bush funeral
+    "2025-01-09",  # President Carter funeral
+]
+
+
+class MarketHolidayCalendar(AbstractHolidayCalendar):
+    """
+    Holidays of the US stock exchanges (NYSE, NASDAQ).
+    """
+
+    rules = [
+        # New Year's Day is not observed on the previous Friday
+        Holiday("New Year's Day", month=1, day=1, observance=sunday_to_monday),
+        Holiday(
+            "Martin Luther King Jr. Day",
+            month=1,
+            day=1,
+            offset=DateOffset(weekday=MO(3)),
+            start_date="1998-01-01",
+        ),
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday(
+            "Juneteenth",
+            month=6,
+            day=19,
+            observance=nearest_workday,
+            start_date="2022-01-01",
+        ),
+        Holiday("Independence Day", month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday("Christmas Day", month=12, day=25, observance=nearest_workday),
+    ]
+
+
+@lru_cache(maxsize=None)
+def market_days() -> np.ndarray:
+    """
+    Sorted array of all market days (weekdays, excluding holidays and market closures) between
+    CALENDAR_START and CALENDAR_END.
+
+    """
+    holidays = MarketHolidayCalendar().holidays(CALENDAR_START, CALENDAR_END)
+    holidays = holidays.union(pd.to_datetime(MARKET_CLOSURES))
+
+    days = pd.bdate_range(CALENDAR_START, CALENDAR_END).difference(holidays)
+
+    return days.values.astype("datetime64[D]")
+
+
+def is_market_day(date: str) -> bool:
+    """
+    Checks if the stock market is open on a date.
+
+    """
+    days = market_days()
+    day = np.datetime64(pd.to_datetime(date).date(), "D")
+    position = np.searchsorted(days, day)
+
+    return bool(position < len(days) and days[position] == day)
+
+
+def next_market_day(date: str, inclusive: bool = True) -> Optional[pd.Timestamp]:
+    """
+    Finds the nearest market day on or after a date.
+
+    Parameters
+    ----------
+    date: str
+        Date to search from.
+
+    inclusive: bool, default True
+        Option to return the date itself if it is a market day. If False, search strictly after.
+
+    Returns
+    -------
+    market_day: Optional[pd.Timestamp]
+        Nearest market day. None if the date is outside of CALENDAR_START and CALENDAR_END, or
+        the market day is beyond CALENDAR_END.
+
+    """
+    day = np.datetime64(pd.to_datetime(date).date(), "D")
+    if not _in_calendar(day):
+        return None
+
+    days = market_days()
+    position = np.searchsorted(days, day, side="left" if inclusive else "right")
+
+    return pd.Timestamp(days[position]) if position < len(days) else None
+
+
+def previous_market_day(date: str, inclusive: bool = True) -> Optional[pd.Timestamp]:
+    """
+    Finds the nearest market day on or before a date.
+
+    Parameters
+    ----------
+    date: str
+        Date to search from.
+
+    inclusive: bool, default True
+        Option to return the date itself if it is a market day. If False, search strictly before.
+
+    Returns
+    -------
+    market_day: Optional[pd.Timestamp]
+        Nearest market day. None if the date is outside of CALENDAR_START and CALENDAR_END, or
+        the market day is before CALENDAR_START.
+
+    """
+    day = np.datetime64(pd.to_datetime(date).date(), "D")
+    if not _in_calendar(day):
+        return None
+
+    days = market_days()
+    position = np.searchsorted(days, day, side="right" if inclusive else "left") - 1
+
+    return pd.Timestamp(days[position]) if position >= 0 else None
+
+
+def _in_calendar(day: np.datetime64) -> bool:
+    """
+    Checks if a day is within the range of the precomputed market days, the market calendar being
+    unknown outside of it.
+
+    """
+    return np.datetime64(CALENDAR_START) <= day <= np.datetime64(CALENDAR_END)
@@ -1,9 +1,9 @@
 from typing import Optional
 
 import pandas as pd
-from pandas_datareader import data
 from pandas_datareader._utils import RemoteDataError
 
+from stock_market.data._stocks import _read_bars
 from stock_market.data.constants import CRYPTO_CURRENCY
 
 
@@ -12,6 +12,7 @@ def get_crypto(
     start_date: str,
     end_date: str = None,
     currency_type: str = "USD",
+    cache: bool = True,
 ) -> Optional[pd.DataFrame]:
     """
     Extracts crypto prices over a date period from Yahoo Finance.
@@ -30,6 +31,9 @@ def get_crypto(
     currency_type: str, default "USD"
         Crypto currency type. Currently supported ["USD", "CAD"]
 
+    cache: bool, default True
+        Option to read crypto prices from the local bar cache, downloading only the missing dates.
+
     Returns
     -------
     crypto_data: Optional[pd.DataFrame]
@@ -51,7 +55,7 @@ def get_crypto(
 
     # Extract crypto data using DataReader
     try:
-        crypto_data = data.DataReader(ticker, "yahoo", start_date, end_date)
+        crypto_data = _read_bars(ticker, start_date, end_date, cache=cache)
     except RemoteDataError:
         return None
 
@@ -1,27 +1,76 @@
+from typing import List, Optional, Union
+
 import bs4
 import pandas as pd
 import requests
 
-from stock_market.data.constants import IPO_URL
+from stock_market.data._cache import TTLCache
+from stock_market.data.constants import IPO_TTL, IPO_URL
+
+# Fast parser backend if available (pip install stock_market[fast])
+try:
+    import lxml  # noqa: F401
+
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Container of the IPO tab tables, the only part of the page parsed
+IPO_TABLES_CONTAINER = bs4.SoupStrainer("div", class_="element__body j-tabPanes")
+
+# Index of the value deleted from each row, by table index (future ipo)
+IPO_INDEX_DELETION = {3: 1}
+
+# Web Scraped data, shared across instances
+_IPO_PAGE = TTLCache(ttl=IPO_TTL)
 
 
 class IPO(object):
     """
     Extracts IPO related data from MarketWatch.
-    """
 
-    # Web Scraped data
-    _data_ws = (
-        bs4.BeautifulSoup(requests.get(IPO_URL).content, "html.parser")
-        .find("div", class_="element__body j-tabPanes")
-        .find_all("table")
-    )
+    Parameters
+    ----------
+    ttl: Optional[float], default IPO_TTL
+        Seconds until the cleaned IPO data sets of this instance are rebuilt from the web scraped
+        page. If None, they are kept until invalidated (see refresh and invalidate).
+
+    """
 
     # 4 resulting ipo data sets
-    _recent_ipo = None
-    _upcoming_ipo = None
-    _future_ipo = None
-    _withdrawn_ipo = None
+    DATA_SETS = ["recent_ipo", "upcoming_ipo", "future_ipo", "withdrawn_ipo"]
+
+    def __init__(self, ttl: Optional[float] = IPO_TTL):
+        self.ttl = ttl
+        self._data_sets = TTLCache(ttl=float("inf") if ttl is None else ttl)
+
+    def invalidate(self, name: Optional[str] = None):
+        """
+        Removes a cached IPO data set of this instance (from DATA_SETS), rebuilt on next access.
+        If None, removes all of them.
+
+        """
+        if name is not None and name not in self.DATA_SETS:
+            raise Warning(f"Choose from the available data sets: {self.DATA_SETS}")
+
+        self._data_sets.clear(name)
+
+    def refresh(self):
+        """
+        Web scrapes the page again on next access, and removes the cached IPO data sets.
+
+        """
+        _IPO_PAGE.clear(IPO_URL)
+        self.invalidate()
+
+    @property
+    def _data_ws(self) -> List[pd.DataFrame]:
+        """
+        Web scraped IPO tables, as raw dataframes. Scraped on first access, and shared across
+        instances until IPO_TTL expires.
+
+        """
+        return _IPO_PAGE.get(IPO_URL, _scrape_ipo_tables)
 
     @property
     def recent_ipo(self) -> pd.DataFrame:
@@ -29,45 +78,7 @@ class IPO(object):
         Extract list of recently priced IPOs.
 
         """
-        # Check if this web scraping has already been run
-        if type(self._recent_ipo) is pd.DataFrame:
-            return self._recent_ipo
-        else:
-            # Index 0 is recent_ipo
-            ws_val = self._data_ws[0]
-
-            # Extract data
-            data = self.extract_data(ws_val)
-
-            # Data cleaning
-
-            # Separate Ticker symbol and price change as separate columns
-            data.insert(
-                1, "Ticker", data["Symbol"].str.extract("([^\s]+)", expand=True)[0]
-            )
-            data.insert(
-                5,
-                "Percent_Change",
-                data["Symbol"].str.extract("\s(.*)\%", expand=True)[0],
-            )
-            del data["Symbol"]
-
-            # Removal of some characters in Price and Shares variable for type conversion
-            data["Price"] = data["Price"].str.replace("$", "", regex=True)
-            data["Shares"] = data["Shares"].str.replace(",", "", regex=True)
-
-            # Data type conversion
-            data = data.astype(
-                {
-                    "Percent_Change": "float",
-                    "Shares": "int32",
-                    "Price": "float",
-                    "IPO_Date": "datetime64",
-                }
-            )
-
-            self._recent_ipo = data
-            return data
+        return self._data_sets.get("recent_ipo", self._recent_ipo)
 
     @property
     def upcoming_ipo(self) -> pd.DataFrame:
@@ -75,23 +86,7 @@ class IPO(object):
         Extract list of upcoming IPOs.
 
         """
-        # Check if this web scraping has already been run
-        if type(self._upcoming_ipo) is pd.DataFrame:
-            return self._upcoming_ipo
-        else:
-            # Indexes 1 and 2 are upcoming_ipo
-            ws_val_this_week = self._data_ws[1]
-            ws_val_next_week = self._data_ws[2]
-
-            # Extract data
-            data = self.extract_data(ws_val_this_week)
-            data_nw = self.extract_data(ws_val_next_week)
-            data["week"] = "This Week"
-            data_nw["week"] = "Next Week"
-            data = data.append(data_nw, ignore_index=True)
-
-            self._upcoming_ipo = data
-            return data
+        return self._data_sets.get("upcoming_ipo", self._upcoming_ipo)
 
     @property
     def future_ipo(self) -> pd.DataFrame:
@@ -99,18 +94,7 @@ class IPO(object):
         Extract list of future IPOs.
 
         """
-        # Check if this web scraping has already been run
-        if type(self._future_ipo) is pd.DataFrame:
-            return self._future_ipo
-        else:
-            # Index 3 is future_ipo
-            ws_val = self._data_ws[3]
-
-            # Extract data
-            data = self.extract_data(ws_val, index_deletion=1)
-
-            self._future_ipo = data
-            return data
+        return self._data_sets.get("future_ipo", self._future_ipo)
 
     @property
     def withdrawn_ipo(self) -> pd.DataFrame:
@@ -118,18 +102,71 @@ class IPO(object):
         Extract list of withdrawn IPOs.
 
         """
-        # Check if this web scraping has already been run
-        if type(self._withdrawn_ipo) is pd.DataFrame:
-            return self._withdrawn_ipo
-        else:
-            # Index 3 is withdrawn_ipo
-            ws_val = self._data_ws[4]
+        return self._data_sets.get("withdrawn_ipo", self._withdrawn_ipo)
+
+    def _recent_ipo(self) -> pd.DataFrame:
+        """
+        Cleans the web scraped recent IPO table.
+
+        """
+        # Index 0 is recent_ipo
+        data = self._data_ws[0].copy()
+
+        # Data cleaning
+
+        # Separate Ticker symbol and price change as separate columns
+        data.insert(1, "Ticker", data["Symbol"].str.extract("([^\s]+)", expand=True)[0])
+        data.insert(
+            5,
+            "Percent_Change",
+            data["Symbol"].str.extract("\s(.*)\%", expand=True)[0],
+        )
+        del data["Symbol"]
+
+        # Removal of some characters in Price and Shares variable for type conversion
+        data["Price"] = data["Price"].str.replace("$", "", regex=True)
+        data["Shares"] = data["Shares"].str.replace(",", "", regex=True)
+
+        # Data type conversion
+        data = data.astype(
+            {
+                "Percent_Change": "float",
+                "Shares": "int32",
+                "Price": "float",
+                "IPO_Date": "datetime64",
+            }
+        )
+
+        return data
+
+    def _upcoming_ipo(self) -> pd.DataFrame:
+        """
+        Combines the web scraped upcoming IPO tables.
+
+        """
+        # Indexes 1 and 2 are upcoming_ipo
+        data = self._data_ws[1].copy()
+        data_nw = self._data_ws[2].copy()
+        data["week"] = "This Week"
+        data_nw["week"] = "Next Week"
+
+        return pd.concat([data, data_nw], ignore_index=True)
+
+    def _future_ipo(self) -> pd.DataFrame:
+        """
+        Copies the web scraped future IPO table.
+
+        """
+        # Index 3 is future_ipo
+        return self._data_ws[3].copy()
 
-            # Extract data
-            data = self.extract_data(ws_val)
+    def _withdrawn_ipo(self) -> pd.DataFrame:
+        """
+        Copies the web scraped withdrawn IPO table.
 
-            self._withdrawn_ipo = data
-            return data
+        """
+        # Index 4 is withdrawn_ipo
+        return self._data_ws[4].copy()
 
     @staticmethod
     def extract_data(
@@ -157,32 +194,74 @@ class IPO(object):
         if len(web_table.find_all("th")) == 0:
             raise ValueError("There is no table header available for this data set.")
 
-        # Find all headers
+        # Find all rows, the first one being the headers
         all_info = web_table.find_all("tr")
 
-        # Extract header information
-        columns = all_info[0].text.strip().split("\n")
-        columns = [val.replace(" ", "_") for val in columns]
-        del all_info[0]
+        # Extract header information, one value per cell
+        columns = [val.replace(" ", "_") for val in IPO._cell_values(all_info[0])]
 
         # Append values to rows in data
         values = []
+        for row in all_info[1:]:
+            ipo_info = IPO._cell_values(row)
 
-        # Checking values
-        if index_deletion:
-            for i in range(len(all_info)):
-                ipo_info = all_info[i].text.strip().split("\n")
-
-                # For future ipo stocks
-                if len(ipo_info) > index_deletion:
-                    del ipo_info[index_deletion]
+            # For future ipo stocks
+            if index_deletion and len(ipo_info) > index_deletion:
+                del ipo_info[index_deletion]
 
-                values.append(ipo_info)
-        else:
-            for i in range(len(all_info)):
-                ipo_info = all_info[i].text.strip().split("\n")
-                values.append(ipo_info)
+            values.append(ipo_info)
 
         df = pd.DataFrame(values, columns=columns)
 
         return df
+
+    @staticmethod
+    def _cell_values(row: bs4.element.Tag) -> List[str]:
+        """
+        Text of each cell of a table row, nested tags joined by a space and layout whitespace
+        stripped.
+
+        """
+        return [
+            cell.get_text(" ", strip=True)
+            for cell in row.children
+            if cell.name in ("td", "th")
+        ]
+
+
+def parse_ipo_tables(
+    content: Union[bytes, str], parser: str = HTML_PARSER
+) -> List[pd.DataFrame]:
+    """
+    Extracts all IPO tables of the MarketWatch IPO calendar page in one pass. Only the IPO tab
+    container is parsed, the rest of the page is skipped.
+
+    Parameters
+    ----------
+    content: Union[bytes, str]
+        Page content of the MarketWatch IPO calendar.
+
+    parser: str, default HTML_PARSER
+        BeautifulSoup parser backend. lxml if installed, otherwise html.parser.
+
+    Returns
+    -------
+    tables: List[pd.DataFrame]
+        Raw IPO tables in page order: recent, upcoming (this week), upcoming (next week), future
+        and withdrawn.
+
+    """
+    soup = bs4.BeautifulSoup(content, parser, parse_only=IPO_TABLES_CONTAINER)
+
+    return [
+        IPO.extract_data(table, index_deletion=IPO_INDEX_DELETION.get(i))
+        for i, table in enumerate(soup.find_all("table"))
+    ]
+
+
+def _scrape_ipo_tables() -> List[pd.DataFrame]:
+    """
+    Web scrapes the IPO tables from MarketWatch.
+
+    """
+    return parse_ipo_tables(requests.get(IPO_URL).content)
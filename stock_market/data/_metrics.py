@@ -0,0 +1,90 @@
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+METRIC_COLUMNS = [
+    "Pct: Day Over Day",
+    "Pct: Within Day",
+    "Pct: Day Volatility",
+    "Value: Day Volatility",
+    "Value: Volume in Dollars",
+]
+
+
+def compute_metrics(
+    data: pd.DataFrame,
+    previous_close: Optional[Union[float, pd.Series]] = None,
+    inplace: bool = False,
+) -> pd.DataFrame:
+    """
+    Computes additional metrics from stock prices, for one ticker or multiple tickers at once.
+
+    Parameters
+    ----------
+    data: pd.DataFrame
+        Stock prices with Open, High, Low, Close and Volume columns (e.g. from get_ticker), or a
+        multiple ticker frame with (Attributes, Symbols) columns (e.g. from get_tickers).
+
+    previous_close: Optional[Union[float, pd.Series]], default None
+        Close price of the market day before the first row, for the first day over day change.
+        Indexed by ticker for multiple ticker frames. If None, the first day over day change is
+        treated as an ipo day (missing).
+
+    inplace: bool, default False
+        Option to add metrics to data directly instead of to a copy.
+
+    Returns
+    -------
+    data: pd.DataFrame
+        Stock prices with metrics in METRIC_COLUMNS added.
+
+    """
+    multiple_tickers = isinstance(data.columns, pd.MultiIndex)
+
+    # Price arrays, (days,) for one ticker or (days, tickers) for multiple tickers
+    close, open_price, high, low, volume = (
+        np.asarray(data[column], dtype=float)
+        for column in ["Close", "Open", "High", "Low", "Volume"]
+    )
+
+    # Close price of each previous market day
+    close_previous = np.empty_like(close)
+    close_previous[1:] = close[:-1]
+    if previous_close is None:
+        close_previous[:1] = np.nan
+    elif multiple_tickers:
+        close_previous[:1] = (
+            pd.Series(previous_close, dtype=float).reindex(data["Close"].columns).values
+        )
+    else:
+        close_previous[:1] = previous_close
+
+    day_range = high - low
+    day_median = (high + low) / 2
+
+    metrics = {
+        # 1) Day to day percent change
+        "Pct: Day Over Day": (close - close_previous) / close_previous * 100.0,
+        # 2) Within day percent change
+        "Pct: Within Day": (close - open_price) / open_price * 100.0,
+        # 3) Within day volatility (pct)
+        "Pct: Day Volatility": day_range / day_median * 100.0,
+        # 4) Within day volatility (value)
+        "Value: Day Volatility": day_range,
+        # 5) Approximate dollar amount traded
+        "Value: Volume in Dollars": day_median * volume,
+    }
+
+    if not inplace:
+        data = data.copy()
+
+    if multiple_tickers:
+        symbols = data["Close"].columns
+        for metric, values in metrics.items():
+            data[[(metric, symbol) for symbol in symbols]] = values
+    else:
+        for metric, values in metrics.items():
+            data[metric] = values
+
+    return data
@@ -1,10 +1,27 @@
-from typing import Optional
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
 
 import finviz
-import numpy as np
 import pandas as pd
 import requests.exceptions
 from pandas_datareader import data
+from pandas_datareader._utils import RemoteDataError
+
+from stock_market.data._cache import BAR_CACHE
+from stock_market.data._calendar import previous_market_day
+from stock_market.data._metrics import compute_metrics
+
+# Minimum lead-in before the start date, for the previous close.
+# Market is guaranteed open at least once on a 5 consecutive day period, on any exchange calendar
+LEAD_IN_DAYS = 5
+
+# Error handling options for multiple ticker requests
+AVAILABLE_ERRORS = ["raise", "warn", "ignore"]
+
+# Data errors of a ticker request (e.g. invalid ticker, no data in the date range). Any other error
+# (e.g. connection error, timeout) is raised
+DATA_ERRORS = (RemoteDataError, KeyError)
 
 
 # Reference:
@@ -14,6 +31,7 @@ def get_ticker(
     start_date: str,
     end_date: str = None,
     new_metrics: bool = True,
+    cache: bool = True,
 ) -> Optional[pd.DataFrame]:
     """
     Extracts stock prices over a date period from Yahoo Finance.
@@ -32,6 +50,9 @@ def get_ticker(
     new_metrics: bool, default True
         Option to get additional metrics.
 
+    cache: bool, default True
+        Option to read stock prices from the local bar cache, downloading only the missing dates.
+
     Returns
     -------
     stock_data: Optional[pd.DataFrame]
@@ -45,64 +66,218 @@ def get_ticker(
     else:
         end_date = pd.to_datetime("today")
 
-    # Extract stock data using DataReader
-    try:
-        stock_data = data.DataReader(ticker, "yahoo", start_date, end_date)
-    except KeyError:
+    # Extract stock data using DataReader. For new metrics, one request padded with lead-in days
+    # also provides the previous close before the start date
+    if new_metrics:
+        stock_data, previous_close = _read_padded_bars(
+            ticker, start_date, end_date, cache=cache
+        )
+    else:
+        stock_data = _read_bars(ticker, start_date, end_date, cache=cache)
+
+    if stock_data is None:
         return None
 
-    # Adding new metrics if requested
+    # Adding new metrics if requested. Without a previous close, the first row is ipo day
     if new_metrics:
+        compute_metrics(stock_data, previous_close=previous_close, inplace=True)
+
+    return stock_data
+
+
+def get_tickers(
+    tickers: List[str],
+    start_date: Union[str, Dict[str, str]],
+    end_date: Union[str, Dict[str, str]] = None,
+    new_metrics: bool = True,
+    cache: bool = True,
+    max_workers: int = 8,
+    as_frame: bool = False,
+    errors: str = "warn",
+) -> Union[Dict[str, Optional[pd.DataFrame]], pd.DataFrame]:
+    """
+    Extracts stock prices over a date period from Yahoo Finance for a list of tickers, requested
+    concurrently.
+
+    Parameters
+    ----------
+    tickers: List[str]
+        List of stock ticker symbols.
+
+    start_date: Union[str, Dict[str, str]]
+        Start date of stock information. (e.g. 2020-01-01, 2020/01/01, January 1 2020)
+        If a dict, start date per ticker.
+
+    end_date: Union[str, Dict[str, str]], default None
+        End date of stock information. If None, use current date. If a dict, end date per ticker.
+
+    new_metrics: bool, default True
+        Option to get additional metrics.
+
+    cache: bool, default True
+        Option to read stock prices from the local bar cache, downloading only the missing dates.
+
+    max_workers: int, default 8
+        Maximum number of concurrent requests.
+
+    as_frame: bool, default False
+        Option to return a single frame with (Attributes, Symbols) columns, as returned by
+        DataReader for multiple symbols.
+
+    errors: str, default "warn"
+        Handling of failed ticker requests (e.g. invalid tickers), one of AVAILABLE_ERRORS.
+        Failed tickers are None in the result, unless "raise" is specified. Only data errors
+        (DATA_ERRORS) are handled, connection errors are always raised.
+
+    Returns
+    -------
+    stocks_data: Union[Dict[str, Optional[pd.DataFrame]], pd.DataFrame]
+        Stock information per ticker, extracted from Yahoo Finance. Tickers with no stock
+        information in the date period are None (or skipped, if as_frame).
+
+    """
+    errors = errors.lower()
+    if errors not in AVAILABLE_ERRORS:
+        raise Warning(f"Choose from the available error options: {AVAILABLE_ERRORS}")
+
+    # Unique list of tickers, keeping the requested order
+    tickers = list(dict.fromkeys(tickers))
 
-        # 1) Day to day percent change
-        if len(stock_data) >= 2:
-            stock_close = np.array(stock_data["Close"], dtype=float)
-            stock_pct_change_d2d = list(np.diff(stock_close) / stock_close[:-1] * 100.0)
-        else:
-            stock_pct_change_d2d = []
-
-        # Check if the first row is ipo day
-        try:
-            # Market is guaranteed open at least once on a 5 consecutive day period
-            previous_close = data.DataReader(
-                ticker,
-                "yahoo",
-                start_date - pd.Timedelta(days=5),
-                start_date - pd.Timedelta(days=1),
-            )["Close"][-1]
-            start_close = stock_data["Close"][0]
-            previous_pct_change = [
-                (start_close - previous_close) / previous_close * 100.0
-            ]
-
-        except KeyError:
-            previous_pct_change = [None]
-
-        # Add metric
-        stock_pct_change_d2d = previous_pct_change + stock_pct_change_d2d
-        stock_data["Pct: Day Over Day"] = stock_pct_change_d2d
-
-        # 2) Within day percent change
-        stock_data["Pct: Within Day"] = (
-            (np.array(stock_data["Close"]) - np.array(stock_data["Open"]))
-            / np.array(stock_data["Open"])
-            * 100.0
+    stocks_data = dict()
+    failed_tickers = dict()
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tickers)))) as pool:
+        futures = {
+            ticker: pool.submit(
+                get_ticker,
+                ticker=ticker,
+                start_date=(
+                    start_date[ticker] if isinstance(start_date, dict) else start_date
+                ),
+                end_date=(
+                    end_date.get(ticker) if isinstance(end_date, dict) else end_date
+                ),
+                new_metrics=new_metrics,
+                cache=cache,
+            )
+            for ticker in tickers
+        }
+
+        for ticker, future in futures.items():
+            try:
+                stocks_data[ticker] = future.result()
+            except DATA_ERRORS as error:
+                if errors == "raise":
+                    raise
+                stocks_data[ticker] = None
+                failed_tickers[ticker] = repr(error)
+
+    if failed_tickers and errors == "warn":
+        warnings.warn(f"The following ticker request(s) failed: {failed_tickers}")
+
+    if as_frame:
+        stocks_data = _tickers_frame(stocks_data)
+
+    return stocks_data
+
+
+def _tickers_frame(stocks_data: Dict[str, Optional[pd.DataFrame]]) -> pd.DataFrame:
+    """
+    Combines stock information per ticker into a single frame with (Attributes, Symbols) columns.
+    Tickers without stock information are skipped.
+
+    """
+    valid_data = {
+        ticker: stock_data
+        for ticker, stock_data in stocks_data.items()
+        if stock_data is not None
+    }
+    if not valid_data:
+        return pd.DataFrame()
+
+    # Symbols as the second column level
+    attributes = list(next(iter(valid_data.values())).columns)
+    stocks_frame = (
+        pd.concat(valid_data, axis=1, names=["Symbols", "Attributes"])
+        .swaplevel(axis=1)
+        .reindex(
+            columns=pd.MultiIndex.from_product(
+                [attributes, list(valid_data)], names=["Attributes", "Symbols"]
+            )
         )
+    )
 
-        # 3) Within day volatility (pct)
-        day_range = np.array(stock_data["High"]) - np.array(stock_data["Low"])
-        day_median = (np.array(stock_data["High"]) + np.array(stock_data["Low"])) / 2
-        stock_data["Pct: Day Volatility"] = day_range / day_median * 100.0
+    return stocks_frame
 
-        # 4) Within day volatility (value)
-        stock_data["Value: Day Volatility"] = day_range
 
-        # 5) Approximate dollar amount traded
-        stock_data["Value: Volume in Dollars"] = day_median * np.array(
-            stock_data["Volume"]
+def _read_bars(
+    ticker: str,
+    start_date: pd.Timestamp,
+    end_date: pd.Timestamp,
+    cache: bool = True,
+) -> Optional[pd.DataFrame]:
+    """
+    Reads daily bars from Yahoo Finance, through the local bar cache if requested.
+    Returns None if there are no bars in the date period.
+
+    """
+    if cache:
+        return BAR_CACHE.get(
+            ticker,
+            start_date,
+            end_date,
+            fetch=lambda fetch_start, fetch_end: _read_bars(
+                ticker, fetch_start, fetch_end, cache=False
+            ),
         )
 
-    return stock_data
+    try:
+        bars = data.DataReader(ticker, "yahoo", start_date, end_date)
+    except KeyError:
+        return None
+
+    return bars if len(bars) > 0 else None
+
+
+def _read_padded_bars(
+    ticker: str,
+    start_date: pd.Timestamp,
+    end_date: pd.Timestamp,
+    cache: bool = True,
+) -> Tuple[Optional[pd.DataFrame], Optional[float]]:
+    """
+    Reads daily bars in a single request padded back before the start date, and slices the
+    lead-in bars off locally. The lead-in covers at least LEAD_IN_DAYS, since the previous US market
+    day is not the previous trading day of other exchanges (e.g. TSX holidays).
+
+    Returns
+    -------
+    stock_data: Optional[pd.DataFrame]
+        Bars within the date period. None if there are no bars in the date period.
+
+    previous_close: Optional[float]
+        Close price of the last market day before the start date. None if the first bar is the
+        ipo day (no market day before the start date).
+
+    """
+    start_date = start_date.normalize()
+    lead_in_date = start_date - pd.Timedelta(days=LEAD_IN_DAYS)
+    previous_day = previous_market_day(start_date, inclusive=False)
+    if previous_day is not None:
+        lead_in_date = min(lead_in_date, previous_day)
+
+    bars = _read_bars(ticker, lead_in_date, end_date, cache=cache)
+    if bars is None:
+        return None, None
+
+    # Split lead-in bars from the requested date period
+    start_index = bars.index.searchsorted(start_date)
+    if start_index == len(bars):
+        return None, None
+
+    previous_close = bars["Close"].iloc[start_index - 1] if start_index > 0 else None
+
+    return bars.iloc[start_index:].copy(), previous_close
 
 
 def stock_health(
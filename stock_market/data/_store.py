@@ -0,0 +1,271 @@
+import contextlib
+import os
+import re
+import threading
+from pathlib import Path as _Path
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+
+from stock_market.data._stocks import _tickers_frame
+from stock_market.data.constants import CACHE_DIR_DEFAULT, CACHE_DIR_ENV
+
+# File locks across processes, where available (not on Windows)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class HistoryStore(object):
+    """
+    Columnar on-disk store (Feather) for bulk export and reload of price histories and data tables.
+
+    Price histories are partitioned by ticker and year (history/ticker=AAPL/year=2020.feather), and
+    data tables (e.g. IPO tables) are stored by name (tables/recent_ipo.feather). Files are written
+    uncompressed, so reads are memory-mapped and only the requested columns are loaded.
+
+    Parameters
+    ----------
+    path: Optional[str], default None
+        Root directory of the store. If None, use the STOCK_MARKET_CACHE_DIR environment variable,
+        or ~/.stock_market if it is not set.
+
+    Notes
+    -----
+    Requires pyarrow (pip install stock_market[store]).
+
+    Files are replaced atomically, so memory-mapped readers never see a partial file. Merges of a
+    ticker's history are locked across threads and processes (where file locks are available).
+
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        if path is None:
+            path = _Path(os.getenv(CACHE_DIR_ENV, CACHE_DIR_DEFAULT)) / "store"
+
+        self.path = _Path(path).expanduser()
+        self._lock = threading.Lock()
+
+    def save_history(
+        self,
+        data: Union[pd.DataFrame, Dict[str, Optional[pd.DataFrame]]],
+        ticker: Optional[str] = None,
+    ):
+        """
+        Exports price histories, replacing the stored rows of the same dates.
+
+        Parameters
+        ----------
+        data: Union[pd.DataFrame, Dict[str, Optional[pd.DataFrame]]]
+            Price history of a ticker (e.g. from get_ticker or get_crypto), or price histories by
+            ticker (e.g. from get_tickers). None values are skipped.
+
+        ticker: Optional[str], default None
+            Ticker symbol, if data is the price history of a ticker.
+
+        """
+        if isinstance(data, pd.DataFrame):
+            if ticker is None:
+                raise ValueError("Specify the ticker of the price history.")
+            data = {ticker: data}
+
+        # Fail before writing anything if pyarrow is missing
+        _feather()
+        for ticker, ticker_data in data.items():
+            if ticker_data is None or len(ticker_data) == 0:
+                continue
+
+            for year, year_data in ticker_data.groupby(ticker_data.index.year):
+                path = self._history_path(ticker, year)
+                path.parent.mkdir(parents=True, exist_ok=True)
+
+                # Merge with stored rows of the year, new rows take precedence
+                with self._lock, _locked(path.parent):
+                    if path.exists():
+                        stored = self._read(path)
+                        year_data = pd.concat([year_data, stored])
+                        year_data = year_data[~year_data.index.duplicated(keep="first")]
+
+                    _write(
+                        year_data.sort_index().rename_axis("Date").reset_index(), path
+                    )
+
+    def load_history(
+        self,
+        tickers: Union[str, List[str]],
+        start_date: str = None,
+        end_date: str = None,
+        columns: Optional[List[str]] = None,
+        as_frame: bool = False,
+    ) -> Union[Dict[str, Optional[pd.DataFrame]], pd.DataFrame]:
+        """
+        Reloads stored price histories, reading only the partitions of the date period.
+
+        Parameters
+        ----------
+        tickers: Union[str, List[str]]
+            (List of) Ticker symbols.
+
+        start_date: str, default None
+            Start date of the price history. If None, from the first stored date.
+
+        end_date: str, default None
+            End date of the price history. If None, up to the last stored date.
+
+        columns: Optional[List[str]], default None
+            Columns to load. If None, load all columns.
+
+        as_frame: bool, default False
+            Option to return a single frame with (Attributes, Symbols) columns, as returned by
+            get_tickers.
+
+        Returns
+        -------
+        history: Union[Dict[str, Optional[pd.DataFrame]], pd.DataFrame]
+            Price history per ticker. Tickers with no stored rows in the date period are None
+            (or skipped, if as_frame).
+
+        """
+        if isinstance(tickers, str):
+            tickers = [tickers]
+
+        start_date = pd.to_datetime(start_date) if start_date else None
+        end_date = pd.to_datetime(end_date) if end_date else None
+
+        history = dict()
+        for ticker in tickers:
+            # Year partitions within the date period
+            paths = sorted(self._ticker_path(ticker).glob("year=*.feather"))
+            paths = [
+                path
+                for path in paths
+                if (start_date is None or int(path.stem[5:]) >= start_date.year)
+                and (end_date is None or int(path.stem[5:]) <= end_date.year)
+            ]
+
+            ticker_data = None
+            if paths:
+                ticker_data = pd.concat([self._read(path, columns) for path in paths])
+                ticker_data = ticker_data.loc[start_date:end_date]
+
+            history[ticker] = (
+                ticker_data if ticker_data is not None and len(ticker_data) else None
+            )
+
+        if as_frame:
+            history = _tickers_frame(history)
+
+        return history
+
+    def save_table(self, name: str, data: pd.DataFrame):
+        """
+        Exports a data table (e.g. IPO().recent_ipo), replacing the stored table of the same name.
+
+        """
+        path = self.path / "tables" / f"{name}.feather"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _write(data.reset_index(drop=True), path)
+
+    def load_table(
+        self, name: str, columns: Optional[List[str]] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Reloads a stored data table. None if the table is not stored.
+
+        """
+        path = self.path / "tables" / f"{name}.feather"
+        if not path.exists():
+            return None
+
+        return (
+            _feather()
+            .read_table(str(path), columns=columns, memory_map=True)
+            .to_pandas()
+        )
+
+    def _ticker_path(self, ticker: str) -> _Path:
+        """
+        Directory of a ticker's year partitions.
+
+        """
+        return (
+            self.path
+            / "history"
+            / ("ticker=" + re.sub(r"[^A-Z0-9.\-^=]", "_", ticker.upper()))
+        )
+
+    def _history_path(self, ticker: str, year: int) -> _Path:
+        """
+        File path of a ticker's year partition.
+
+        """
+        return self._ticker_path(ticker) / f"year={year}.feather"
+
+    @staticmethod
+    def _read(path: _Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Memory-mapped read of a history partition, indexed by date.
+
+        """
+        if columns is not None:
+            columns = ["Date"] + [column for column in columns if column != "Date"]
+
+        return (
+            _feather()
+            .read_table(str(path), columns=columns, memory_map=True)
+            .to_pandas()
+            .set_index("Date")
+        )
+
+
+def _write(data: pd.DataFrame, path: _Path):
+    """
+    Writes a frame to an uncompressed Feather file, replacing the file atomically.
+
+    """
+    # Write to a temporary file first, so concurrent readers never see a partial file
+    temp_path = path.with_name(
+        f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    try:
+        _feather().write_feather(data, str(temp_path), compression="uncompressed")
+        os.replace(temp_path, path)
+    finally:
+        if temp_path.exists():
+            os.remove(temp_path)
+
+
+@contextlib.contextmanager
+def _locked(directory: _Path):
+    """
+    Exclusive lock of a store directory, where file locks are available. Files are replaced on
+    write, so the lock is held on their directory.
+
+    """
+    if fcntl is None:
+        yield
+        return
+
+    lock = os.open(str(directory), os.O_RDONLY)
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+    finally:
+        # Closing the directory releases the lock
+        os.close(lock)
+
+
+def _feather():
+    """
+    Imports pyarrow's feather module, an optional dependency of the store.
+
+    """
+    try:
+        from pyarrow import feather
+    except ImportError:
+        raise ImportError(
+            "pyarrow is required for HistoryStore: pip install stock_market[store]"
+        )
+
+    return feather
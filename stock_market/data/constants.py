@@ -1,8 +1,13 @@
 # Data
 # ----
 
+# Cache
+CACHE_DIR_ENV = "STOCK_MARKET_CACHE_DIR"
+CACHE_DIR_DEFAULT = "~/.stock_market"
+
 # Ipo
 IPO_URL = "https://www.marketwatch.com/tools/ipo-calendar"
+IPO_TTL = 15 * 60  # Seconds until the web scraped page is refreshed
 
 # Crypto
 CRYPTO_CURRENCY = ["USD", "CAD"]
@@ -13,6 +18,7 @@ CRYPTO_CURRENCY = ["USD", "CAD"]
 
 # Index: SP500
 SP500_URL = "https://www.marketwatch.com/investing/index/spx"
+SP500_TTL = 5 * 60  # Seconds until the web scraped page is refreshed
 # WebScrape constants
 PERFORMANCE_PERIODIC: str = "performance"
 PERFORMANCE_TOP_STOCKS: str = "ByIndexGainers"
@@ -1,10 +1,14 @@
 import os
+import threading
 
 import praw
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Reddit clients and subreddit handles, per thread (praw clients are not thread safe)
+_LOCAL = threading.local()
+
 
 # Load credentials to env
 def load_reddit_credentials(
@@ -23,12 +27,45 @@ def load_reddit_credentials(
     print("Credentials loaded!")
 
 
-def reddit_connection():
+def reddit_connection() -> praw.Reddit:
+    """
+    Reddit client of the current thread. Created on first use, and reused (with its OAuth token)
+    until the credentials change.
 
-    return praw.Reddit(
-        user_agent=os.getenv("REDDIT_APP_NAME", "reddit app"),
-        client_id=os.getenv("REDDIT_CLIENT_ID", ""),
-        client_secret=os.getenv("REDDIT_CLIENT_SECRET", ""),
-        username=os.getenv("REDDIT_USERNAME", ""),
-        password=os.getenv("REDDIT_PASSWORD", ""),
+    """
+    credentials = (
+        os.getenv("REDDIT_APP_NAME", "reddit app"),
+        os.getenv("REDDIT_CLIENT_ID", ""),
+        os.getenv("REDDIT_CLIENT_SECRET", ""),
+        os.getenv("REDDIT_USERNAME", ""),
+        os.getenv("REDDIT_PASSWORD", ""),
     )
+
+    if getattr(_LOCAL, "credentials", None) != credentials:
+        _LOCAL.connection = praw.Reddit(
+            user_agent=credentials[0],
+            client_id=credentials[1],
+            client_secret=credentials[2],
+            username=credentials[3],
+            password=credentials[4],
+        )
+        _LOCAL.credentials = credentials
+        _LOCAL.subreddits = dict()
+
+    return _LOCAL.connection
+
+
+def subreddit_handle(subreddit: str) -> praw.models.Subreddit:
+    """
+    Subreddit of the current thread's Reddit client, searched by name on first use.
+
+    """
+    connection = reddit_connection()
+
+    name = subreddit.lower()
+    if name not in _LOCAL.subreddits:
+        _LOCAL.subreddits[name] = connection.subreddits.search_by_name(
+            subreddit, exact=True
+        )[0]
+
+    return _LOCAL.subreddits[name]
@@ -0,0 +1,195 @@
+import abc
+import heapq
+import io
+import json
+import time
+import warnings
+from pathlib import Path as _Path
+from typing import Dict, Iterator, List, Optional, Union
+
+import pandas as pd
+
+from stock_market.data.reddit.trends import TIME_FILTERS, get_reddit_top_posts
+
+# Length of each time period of the top posts, in seconds
+TIME_PERIOD_SECONDS = {
+    "hour": 60 * 60,
+    "day": 24 * 60 * 60,
+    "week": 7 * 24 * 60 * 60,
+    "month": 30 * 24 * 60 * 60,
+    "year": 365 * 24 * 60 * 60,
+}
+
+# Pushshift dumps are compressed with long distance matching windows
+ZSTD_MAX_WINDOW_SIZE = 2**31
+
+
+class RedditSource(abc.ABC):
+    """
+    Source of Reddit posts for the sentiment pipeline (e.g. RedditSentiment). Subclasses implement
+    top_posts.
+
+    """
+
+    @abc.abstractmethod
+    def top_posts(
+        self, subreddit: str, num_post: int = 10, time_period: str = "day"
+    ) -> Dict[str, Union[List[int], List[str]]]:
+        """
+        Extracts top posts from a subreddit channel, in the format of get_reddit_top_posts (titles
+        and num_comments).
+
+        """
+
+
+class RedditLiveSource(RedditSource):
+    """
+    Live Reddit posts through the Reddit API (credentials required, see load_reddit_credentials).
+
+    """
+
+    def top_posts(
+        self, subreddit: str, num_post: int = 10, time_period: str = "day"
+    ) -> Dict[str, Union[List[int], List[str]]]:
+        return get_reddit_top_posts(
+            subreddit=subreddit, num_post=num_post, time_period=time_period
+        )
+
+
+class RedditDumpSource(RedditSource):
+    """
+    Reddit submissions replayed from local Pushshift style dumps, one JSON object per line, plain
+    (.ndjson, .json) or zstandard compressed (.zst). Dumps are streamed, so memory use does not
+    depend on the dump size.
+
+    Parameters
+    ----------
+    paths: Union[str, List[str]]
+        (List of) Dump file paths.
+
+    as_of: Optional[str], default None
+        End of the top posts time periods, e.g. "2021-01-28". If None, the current time.
+
+    Notes
+    -----
+    Compressed dumps require zstandard (pip install stock_market[dumps]).
+
+    """
+
+    def __init__(self, paths: Union[str, List[str]], as_of: Optional[str] = None):
+        if isinstance(paths, (str, _Path)):
+            paths = [paths]
+
+        self.paths = [_Path(path).expanduser() for path in paths]
+        self.as_of = as_of
+
+    def iter_posts(self, subreddit: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Streams the posts of the dumps, in file order.
+
+        Parameters
+        ----------
+        subreddit: Optional[str], default None
+            Subreddit channel name to filter on. If None, all posts.
+
+        Returns
+        -------
+        posts: Iterator[Dict]
+            Posts as parsed from the dumps (e.g. id, title, selftext, score, num_comments,
+            created_utc), with created_utc as unix seconds.
+
+        """
+        subreddit = subreddit.lower() if subreddit else None
+
+        invalid_lines = 0
+        for path in self.paths:
+            with _open_dump(path) as lines:
+                for line in lines:
+                    try:
+                        post = json.loads(line)
+                    except ValueError:
+                        invalid_lines += line.strip() != ""
+                        continue
+
+                    if (
+                        subreddit
+                        and str(post.get("subreddit", "")).lower() != subreddit
+                    ):
+                        continue
+
+                    post["created_utc"] = float(post.get("created_utc") or 0)
+                    yield post
+
+        if invalid_lines:
+            warnings.warn(f"{invalid_lines} invalid line(s) skipped in the dumps.")
+
+    def top_posts(
+        self, subreddit: str, num_post: int = 10, time_period: str = "day"
+    ) -> Dict[str, Union[List[int], List[str]]]:
+        """
+        Extracts top posts (by score) of a subreddit channel from the dumps, over a time period
+        ending at as_of. Only the top posts are kept in memory while streaming.
+
+        Parameters
+        ----------
+        subreddit: str
+            Subreddit channel name.
+
+        num_post: int, default 10
+            Number of top posts to extract.
+
+        time_period: str, default "day"
+            Time period of the top posts, ending at as_of.
+
+        Returns
+        -------
+        top_posts: Dict[str, Union[List[int], List[str]]]
+            Top post high level information: title and number of comments.
+
+        """
+        time_period = time_period.lower()
+        if time_period not in TIME_FILTERS:
+            raise Warning(
+                f"Time period must be one of the following options: {TIME_FILTERS}"
+            )
+
+        end = pd.Timestamp(self.as_of).timestamp() if self.as_of else time.time()
+        start = end - TIME_PERIOD_SECONDS.get(time_period, float("inf"))
+
+        posts = (
+            post
+            for post in self.iter_posts(subreddit)
+            if start < post["created_utc"] <= end and "title" in post
+        )
+        top_agg = heapq.nlargest(
+            num_post, posts, key=lambda post: int(post.get("score") or 0)
+        )
+
+        top_posts = {
+            "titles": [post["title"] for post in top_agg],
+            "num_comments": [int(post.get("num_comments") or 0) for post in top_agg],
+        }
+
+        return top_posts
+
+
+def _open_dump(path: _Path) -> io.TextIOBase:
+    """
+    Opens a dump as a stream of text lines, decompressing zstandard dumps on the fly.
+
+    """
+    if path.suffix != ".zst":
+        return open(path, "r", encoding="utf-8", errors="replace")
+
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "zstandard is required for compressed dumps: pip install stock_market[dumps]"
+        )
+
+    reader = zstandard.ZstdDecompressor(
+        max_window_size=ZSTD_MAX_WINDOW_SIZE
+    ).stream_reader(open(path, "rb"), read_across_frames=True, closefd=True)
+
+    return io.TextIOWrapper(reader, encoding="utf-8", errors="replace")
@@ -1,10 +1,28 @@
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Union
 
-from prawcore import NotFound
+import pandas as pd
+from prawcore import Forbidden, NotFound, Redirect
 
-from stock_market.data.reddit._connection import reddit_connection
+from stock_market.data.reddit._connection import subreddit_handle
 
 TIME_FILTERS = ["all", "day", "hour", "month", "week", "year"]
+AVAILABLE_ERRORS = ["raise", "warn", "ignore"]
+
+# Post attributes of the bulk fetch
+POST_FIELDS = ["id", "title", "selftext", "score", "num_comments", "created_utc"]
+POST_DTYPES = {"score": "int64", "num_comments": "int64", "created_utc": "float64"}
+
+# Number of fetch threads shared by all calls, kept alive so that their Reddit clients are reused
+FETCH_POOL_WORKERS = 8
+
+# Errors of subreddits that do not exist (or are private/banned)
+MISSING_SUBREDDIT_ERRORS = (NotFound, Redirect, Forbidden, IndexError)
+
+_FETCH_POOL = None
+_FETCH_POOL_LOCK = threading.Lock()
 
 
 def get_reddit_top_posts(
@@ -44,10 +62,8 @@ def get_reddit_top_posts(
     # Check if subreddit exists
     try:
         # Top posts in subreddit
-        top_agg = (
-            reddit_connection()
-            .subreddits.search_by_name(subreddit, exact=True)[0]
-            .top(limit=num_post, time_filter=time_period)
+        top_agg = subreddit_handle(subreddit).top(
+            limit=num_post, time_filter=time_period
         )
     except NotFound:
         raise Warning("Specified subreddit does not exist.")
@@ -62,3 +78,127 @@ def get_reddit_top_posts(
     }
 
     return top_posts
+
+
+def get_reddit_posts(
+    subreddits: Union[str, List[str]],
+    num_post: int = 100,
+    time_period: str = "day",
+    max_workers: int = 8,
+    errors: str = "warn",
+) -> pd.DataFrame:
+    """
+    Extracts top posts from many subreddit channels concurrently, as a columnar dataframe.
+
+    Parameters
+    ----------
+    subreddits: Union[str, List[str]]
+        (List of) Subreddit channel names.
+
+    num_post: int, default 100
+        Number of top posts to extract per subreddit. Pages of 100 posts are requested until
+        reached.
+
+    time_period: str, default "day"
+        Time period of the top posts.
+
+    max_workers: int, default 8
+        Maximum number of subreddits fetched concurrently (at most FETCH_POOL_WORKERS).
+
+    errors: str, default "warn"
+        Handling of missing subreddits, one of AVAILABLE_ERRORS. Missing subreddits have no
+        posts in the result, unless "raise" is specified. Other request errors (e.g. network,
+        authentication or rate limit errors) are always raised.
+
+    Returns
+    -------
+    posts: pd.DataFrame
+        Top posts with subreddit and POST_FIELDS columns (id, title, selftext, score,
+        num_comments, created_utc), in order of subreddits and ranks.
+
+    Notes
+    -----
+    Fetch threads are shared by all calls, each keeping its own Reddit client and subreddit
+    handles across calls.
+
+    """
+    time_period = time_period.lower()
+    if time_period not in TIME_FILTERS:
+        raise Warning(
+            f"Time period must be one of the following options: {TIME_FILTERS}"
+        )
+
+    errors = errors.lower()
+    if errors not in AVAILABLE_ERRORS:
+        raise Warning(f"Choose from the available error options: {AVAILABLE_ERRORS}")
+
+    if max_workers < 1:
+        raise ValueError("max_workers should be positive.")
+
+    if isinstance(subreddits, str):
+        subreddits = [subreddits]
+
+    # Unique list of subreddits, keeping the requested order
+    subreddits = list(dict.fromkeys(subreddits))
+
+    # Subreddits are submitted as fetches of the call complete, max_workers at a time
+    pool = _fetch_pool()
+    slots = threading.BoundedSemaphore(max_workers)
+    futures = dict()
+    for subreddit in subreddits:
+        slots.acquire()
+        futures[subreddit] = pool.submit(_fetch_posts, subreddit, num_post, time_period)
+        futures[subreddit].add_done_callback(lambda future: slots.release())
+
+    posts = {field: list() for field in ["subreddit"] + POST_FIELDS}
+    failed_subreddits = dict()
+    for subreddit, future in futures.items():
+        try:
+            subreddit_posts = future.result()
+        except MISSING_SUBREDDIT_ERRORS as error:
+            if errors == "raise":
+                raise
+            failed_subreddits[subreddit] = repr(error)
+            continue
+
+        posts["subreddit"] += [subreddit] * len(subreddit_posts["id"])
+        for field in POST_FIELDS:
+            posts[field] += subreddit_posts[field]
+
+    if failed_subreddits and errors == "warn":
+        warnings.warn(f"The following subreddit request(s) failed: {failed_subreddits}")
+
+    return pd.DataFrame(posts).astype(POST_DTYPES)
+
+
+def _fetch_posts(
+    subreddit: str, num_post: int, time_period: str
+) -> Dict[str, List[Union[int, float, str]]]:
+    """
+    Top posts of a subreddit, by post attribute (POST_FIELDS).
+
+    """
+    posts = {field: list() for field in POST_FIELDS}
+    for post in subreddit_handle(subreddit).top(
+        limit=num_post, time_filter=time_period
+    ):
+        for field in POST_FIELDS:
+            posts[field].append(getattr(post, field))
+
+    return posts
+
+
+def _fetch_pool() -> ThreadPoolExecutor:
+    """
+    Pool of FETCH_POOL_WORKERS fetch threads shared by all calls, created on first use.
+
+    """
+    global _FETCH_POOL
+
+    with _FETCH_POOL_LOCK:
+        if _FETCH_POOL is None:
+            _FETCH_POOL = ThreadPoolExecutor(
+                max_workers=FETCH_POOL_WORKERS, thread_name_prefix="reddit"
+            )
+
+        return _FETCH_POOL
@@ -1,31 +1,68 @@
+import re
 import string
-from typing import List, Tuple, Union
+from functools import lru_cache
+from typing import FrozenSet, List, Optional, Tuple, Union
 
+import pandas as pd
 from spellchecker import SpellChecker
 
 TICKER_LEN_MAX = 5
 AVAILABLE_SOURCE = ["reddit"]
+AVAILABLE_MODE = ["rules", "known"]
 PUNCTUATIONS = string.punctuation.replace("$", "") + "“"
 
+# Common reddit terms
+REDDIT_COMMON = ["DD", "COVID", "WSB", "OTC", "ETF", "TLDR", "PT"]
+
+# Word patterns: whitespace separated words, with punctuations at the end of each word removed
+_PUNCTUATIONS = re.escape(PUNCTUATIONS)
+# R1 candidates: words with $
+CASHTAG_PATTERN = re.compile(
+    rf"(?<!\S)[{_PUNCTUATIONS}]*"
+    rf"((?:[^\s{_PUNCTUATIONS}]\S*)?\$(?:\S*[^\s{_PUNCTUATIONS}])?)"
+    rf"[{_PUNCTUATIONS}]*(?!\S)"
+)
+# R2 candidates: words up to TICKER_LEN_MAX long, without lower case (ascii) letters or digits
+TICKER_PATTERN = re.compile(
+    rf"(?<!\S)[{_PUNCTUATIONS}]*"
+    rf"([^\s{_PUNCTUATIONS}a-z0-9$](?:[^\sa-z0-9$]{{0,{TICKER_LEN_MAX - 2}}}[^\s{_PUNCTUATIONS}a-z0-9$])?)"
+    rf"[{_PUNCTUATIONS}]*(?!\S)"
+)
+
 
 def detect_ticker(
-    text: Union[str, List[str], Tuple[str]], source: str = "reddit"
-) -> List[Union[None, List[str]]]:
+    text: Union[str, List[str], Tuple[str], pd.Series],
+    source: str = "reddit",
+    mode: str = "rules",
+    universe: Optional[Union[List[str], pd.DataFrame]] = None,
+) -> Union[List[Union[None, List[str]]], pd.Series]:
     """
     Detects discussed ticker in a (list of) body of text.
 
     Parameters
     ----------
-    text: Union[str, List[str], Tuple[str]]
-        (List of) Body of text to detect presence of tickers.
+    text: Union[str, List[str], Tuple[str], pd.Series]
+        (List of) Body of text to detect presence of tickers. A pandas series is detected text by
+        text like a list (not vectorized), keeping its index. Missing values have no detection.
 
     source: str, default "reddit"
         Source the body of text comes from. Logic of ticker detection may vary depending on source.
 
+    mode: str, default "rules"
+        Detection mode, from AVAILABLE_MODE:
+        - "rules": source filters below, for any ticker
+        - "known": known tickers and company names (SP500 and universe) matched over the whole
+          text in linear time, suited to long bodies and comments (see TickerMatcher)
+
+    universe: Optional[Union[List[str], pd.DataFrame]], default None
+        Tickers known on top of the SP500 tickers ("known" mode), as a list of tickers or a
+        dataframe with Ticker and Name columns.
+
     Returns
     -------
-    ticker_detection: List[Union[None, List[str]]]
-        List of list of detected tickers for each body of text.
+    ticker_detection: Union[List[Union[None, List[str]]], pd.Series]
+        List of list of detected tickers for each body of text. A pandas series with the same
+        index if text is a pandas series.
 
     Notes - Logic and statistical aim behind NLP filtering
     ------------------------------------------------------
@@ -48,92 +85,101 @@ def detect_ticker(
     if source not in AVAILABLE_SOURCE:
         raise Warning(f"Choose from the current available sources: {AVAILABLE_SOURCE}")
 
+    # Verify mode is available
+    mode = mode.lower()
+    if mode not in AVAILABLE_MODE:
+        raise Warning(f"Choose from the current available modes: {AVAILABLE_MODE}")
+
+    if mode == "known":
+        from stock_market.model._matching import ticker_matcher
+
+        if isinstance(universe, pd.DataFrame):
+            universe = universe.reindex(columns=["Ticker", "Name"])
+            universe = tuple(universe.itertuples(index=False, name=None))
+        elif universe is not None:
+            universe = tuple((ticker, None) for ticker in universe)
+        detect = ticker_matcher(universe).match
+    else:
+        detect = _detect_reddit
+
+    # Series of texts, detected one by one (same as a list) with the same index
+    if isinstance(text, pd.Series):
+        return pd.Series(
+            [
+                detect(phrase) if isinstance(phrase, str) else None
+                for phrase in text.values
+            ],
+            index=text.index,
+            name=text.name,
+            dtype=object,
+        )
+
     # If one text specified as str
     if not isinstance(text, (list, tuple)):
         text = [text]
 
-    # Spell checking module
-    spell_check = SpellChecker()
-
-    # List of ticker detection
-    ticker_detection = list()
-
-    # For reddit source
-    if source == "reddit":
-        # Common reddit terms
-        reddit_common = [
-            "DD",
-            "COVID",
-            "WSB",
-            "OTC",
-            "ETF",
-            "TLDR",
-            "PT",
+    # TODO: Controllable level of rule strictness
+
+    # List of ticker detection, for each phrases in text (list)
+    return [detect(phrase) for phrase in text]
+
+
+def _detect_reddit(phrase: str) -> Optional[List[str]]:
+    """
+    Detects tickers in a reddit phrase, with the R1 and R2 rules of detect_ticker.
+
+    """
+    # Rules:
+    # R-1) Ticker starts with $. If found in the phrase, only words with $ are considered, assuming
+    #      that the user is consistent with their ticker mentions with $ beginning.
+    # Applying: $ check, digit check (phrase can refer to a $ amount)
+    if "$" in phrase:
+        # Remove invalid length and digits inclusive tickers
+        r1 = [
+            ticker.upper()
+            for ticker in (word.strip("$") for word in CASHTAG_PATTERN.findall(phrase))
+            if (len(ticker) <= TICKER_LEN_MAX) and (not _check_digit(ticker))
         ]
 
-        # TODO: Controllable level of rule strictness
-
-        # Go through each phrases in text (list)
-        for phrase in text:
-
-            # Breakdown texts
-            phrase_dec = phrase.split()
-
-            # Remove punctuations at the end of each words
-            phrase_dec = [word.strip(PUNCTUATIONS) for word in phrase_dec]
-            # Clean Nones
-            phrase_dec = list(filter(None, phrase_dec))
-
-            # Rules:
-            # R-1) Ticker starts with $. If at least one word is detected, move on to next phrase assuming that
-            #      the user is consistent with their ticker mentions with $ beginning.
-            # Applying: $ check, digit check (phrase can refer to a $ amount)
-            r1 = None
-
-            if "$" in phrase:
-                phrase_dec = list(filter(lambda word: "$" in word, phrase_dec))
-                r1 = list(map(lambda word: word.strip("$"), phrase_dec))
-
-            if r1:
-                # Remove invalid length and digits inclusive tickers
-                r1 = [
-                    ticker.upper()
-                    for ticker in r1
-                    if (len(ticker) <= TICKER_LEN_MAX) and (not _check_digit(ticker))
-                ]
-
-                if r1:
-                    # Add data and continue with loop
-                    ticker_detection.append(r1)
-                    continue
-
-            # R-2) Look for cap locks
-            # Applying: Reddit common check, spell checker
-            r2 = [
-                word
-                for word in phrase_dec
-                if word.isupper()
-                and (len(word) <= TICKER_LEN_MAX)
-                and (word not in reddit_common)
-            ]
-
-            if r2:
-                # Check for dictionary words and if digit exists
-                r2 = [
-                    ticker.upper()
-                    for ticker in spell_check.unknown(r2)
-                    if (len(ticker) <= TICKER_LEN_MAX) and (not _check_digit(ticker))
-                ]
-
-                if r2:
-                    # Add data and continue with loop
-                    ticker_detection.append(r2)
-                    continue
-
-            # Append empty detection
-            ticker_detection.append(None)
-
-    return ticker_detection
+        # Words with $ failing R1 (length, digits) fail R2 as well
+        return r1 or None
+
+    # R-2) Look for cap locks
+    # Applying: Reddit common check, digit check, spell checker
+    r2 = [
+        word
+        for word in dict.fromkeys(TICKER_PATTERN.findall(phrase))
+        if word.isupper()
+        and (word not in REDDIT_COMMON)
+        and (not _check_digit(word))
+        and _check_unknown(word)
+    ]
+
+    return r2 or None
+
+
+@lru_cache(maxsize=None)
+def _vocabulary() -> FrozenSet[str]:
+    """
+    Dictionary words (lower case) of the spell checker, loaded once per process.
+
+    """
+    return frozenset(SpellChecker().word_frequency.dictionary)
+
+
+def _check_unknown(v: str) -> bool:
+    """
+    Checks if string value is unknown to the spell checker (neither a dictionary word nor a number).
+
+    """
+    if v.lower() in _vocabulary():
+        return False
+
+    try:
+        float(v)
+        return False
+    except ValueError:
+        return True
 
 
 def _check_digit(v: str) -> bool:
@@ -141,4 +187,4 @@ def _check_digit(v: str) -> bool:
     Checks if string value contains a digit.
 
     """
-    return any(letter.isdigit() for letter in v)
+    return (not v.isalpha()) and any(letter.isdigit() for letter in v)
@@ -0,0 +1,153 @@
+import os
+import pickle
+import threading
+from functools import lru_cache
+from pathlib import Path as _Path
+from typing import Dict, List, Tuple, Union
+
+from stock_market.data.constants import CACHE_DIR_DEFAULT, CACHE_DIR_ENV
+
+# Lexicon data
+VADER_LEXICON = _Path(__file__).parent.parent / "data/_files/vader_lexicon.txt"
+FINANCE_LEXICON = _Path(__file__).parent.parent / "data/_files/finance_lexicon.txt"
+
+
+def read_lexicon(lexicon_files: List[Union[str, _Path]]) -> Dict[str, float]:
+    """
+    Parses lexicon text files into a dictionary of word scores.
+
+    Parameters
+    ----------
+    lexicon_files: List[Union[str, _Path]]
+        Lexicon text files, one tab separated word and score per line. Scores of later files take
+        precedence.
+
+    Returns
+    -------
+    lexicon: Dict[str, float]
+        Score by word.
+
+    """
+    lexicon = dict()
+    for lexicon_file in lexicon_files:
+        for line in _Path(lexicon_file).read_text(encoding="utf-8").strip().split("\n"):
+            word, measure = line.strip().split("\t")[0:2]
+            lexicon[word] = float(measure)
+
+    return lexicon
+
+
+def compile_lexicon(
+    lexicon_files: List[Union[str, _Path]], output: Union[str, _Path]
+) -> Dict[str, float]:
+    """
+    Compiles lexicon text files into a pickled dictionary, which loads without any parsing.
+
+    Parameters
+    ----------
+    lexicon_files: List[Union[str, _Path]]
+        Lexicon text files, one tab separated word and score per line. Scores of later files take
+        precedence.
+
+    output: Union[str, _Path]
+        Path of the compiled lexicon.
+
+    Returns
+    -------
+    lexicon: Dict[str, float]
+        Score by word.
+
+    """
+    lexicon = read_lexicon(lexicon_files)
+
+    output = _Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    # Atomic write, concurrent workers never read a partial file
+    temp_path = output.with_name(
+        f".{output.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    with open(temp_path, "wb") as file:
+        pickle.dump(
+            {"sources": _signature(lexicon_files), "lexicon": lexicon},
+            file,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+    os.replace(temp_path, output)
+
+    return lexicon
+
+
+@lru_cache(maxsize=None)
+def load_lexicon(finance_terms: bool = False) -> Dict[str, float]:
+    """
+    Loads the compiled Vader lexicon, once per process. The lexicon is compiled into the cache
+    directory on first use, and again whenever its text files change.
+
+    Parameters
+    ----------
+    finance_terms: bool, default False
+        Option to add the finance terms (e.g. bullish, bagholder) to the Vader lexicon.
+
+    Returns
+    -------
+    lexicon: Dict[str, float]
+        Score by word.
+
+    """
+    lexicon_files = [VADER_LEXICON] + ([FINANCE_LEXICON] if finance_terms else [])
+    path = _lexicon_path(finance_terms)
+
+    try:
+        with open(path, "rb") as file:
+            compiled = pickle.load(file)
+        if compiled["sources"] == _signature(lexicon_files):
+            return compiled["lexicon"]
+    except (OSError, EOFError, KeyError, pickle.UnpicklingError):
+        pass
+
+    # Missing or outdated compiled lexicon
+    try:
+        return compile_lexicon(lexicon_files, path)
+    except OSError:
+        # Read-only cache directory
+        return read_lexicon(lexicon_files)
+
+
+def _lexicon_path(finance_terms: bool) -> _Path:
+    """
+    File path of a compiled lexicon in the cache directory.
+
+    """
+    name = "vader_finance.pickle" if finance_terms else "vader.pickle"
+
+    return (
+        _Path(os.getenv(CACHE_DIR_ENV, CACHE_DIR_DEFAULT)).expanduser()
+        / "lexicon"
+        / name
+    )
+
+
+def _signature(lexicon_files: List[Union[str, _Path]]) -> List[Tuple[str, int, int]]:
+    """
+    Name, size and modification time of the lexicon text files, to detect changes.
+
+    """
+    signature = list()
+    for lexicon_file in lexicon_files:
+        stat = _Path(lexicon_file).stat()
+        signature.append((_Path(lexicon_file).name, stat.st_size, stat.st_mtime_ns))
+
+    return signature
+
+
+if __name__ == "__main__":
+    # Build step: python -m stock_market.model._lexicon
+    for finance_terms in [False, True]:
+        load_lexicon.cache_clear()
+        try:
+            _lexicon_path(finance_terms).unlink()
+        except FileNotFoundError:
+            pass
+        load_lexicon(finance_terms)
+        print(f"Compiled {_lexicon_path(finance_terms)}")
@@ -0,0 +1,204 @@
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from stock_market.data import SP500
+from stock_market.model._classification import _check_unknown
+
+# Company name suffixes, removed for the name aliases (e.g. Exxon Mobil Corp. -> Exxon Mobil)
+COMPANY_SUFFIXES = [
+    "co",
+    "company",
+    "corp",
+    "corporation",
+    "group",
+    "holdings",
+    "inc",
+    "incorporated",
+    "ltd",
+    "plc",
+]
+COMPANY_ALIAS_LEN_MIN = 3
+
+
+class AhoCorasick(object):
+    """
+    Aho–Corasick automaton, matching all patterns in a text in a single pass (linear in the text
+    length and the number of matches, regardless of the number of patterns).
+
+    Parameters
+    ----------
+    patterns: Dict[str, Hashable]
+        Value of each pattern, returned with its matches.
+
+    """
+
+    def __init__(self, patterns: Dict[str, Hashable]):
+        # Trie of the patterns: transitions, and outputs (pattern length, value) of each state
+        self._goto = [dict()]
+        self._output = [list()]
+        for pattern, value in patterns.items():
+            state = 0
+            for char in pattern:
+                if char not in self._goto[state]:
+                    self._goto.append(dict())
+                    self._output.append(list())
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state].append((len(pattern), value))
+
+        # Failure links (longest proper suffix in the trie), built breadth first
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def iter(self, text: str) -> Iterator[Tuple[int, int, Hashable]]:
+        """
+        Finds all pattern matches in a text, including overlapping matches.
+
+        Parameters
+        ----------
+        text: str
+            Text to search.
+
+        Returns
+        -------
+        matches: Iterator[Tuple[int, int, Hashable]]
+            Start position, end position and value of each match, by end position.
+
+        """
+        goto, fail, output = self._goto, self._fail, self._output
+
+        state = 0
+        for end, char in enumerate(text, start=1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for length, value in output[state]:
+                yield end - length, end, value
+
+
+class TickerMatcher(object):
+    """
+    Matches known tickers and company names in texts of any length, with an Aho–Corasick automaton.
+
+    Patterns of each ticker:
+    - $ mentions, e.g. $AAPL or $aapl
+    - Ticker, if it is not a dictionary word (e.g. ALL, IT and single letters require $)
+    - Company name alias without suffixes, if it is not a dictionary word (e.g. Exxon Mobil)
+
+    Matches must be whole words: not preceded or followed by a letter or digit.
+
+    Parameters
+    ----------
+    universe: Optional[Union[List[str], pd.DataFrame]], default None
+        Tickers to match on top of the SP500 tickers, as a list of tickers or a dataframe with
+        Ticker and Name columns (same layout as SP500).
+
+    """
+
+    def __init__(self, universe: Optional[Union[List[str], pd.DataFrame]] = None):
+        tickers = SP500[["Ticker", "Name"]]
+        if universe is not None:
+            if not isinstance(universe, pd.DataFrame):
+                universe = pd.DataFrame({"Ticker": list(universe)})
+            tickers = pd.concat([tickers, universe.reindex(columns=["Ticker", "Name"])])
+
+        patterns = dict()
+        for ticker, name in tickers.itertuples(index=False):
+            ticker = ticker.upper()
+            patterns["$" + ticker] = ticker
+            patterns["$" + ticker.lower()] = ticker
+
+            if len(ticker) > 1 and _check_unknown(ticker):
+                patterns[ticker] = ticker
+
+            # Share classes of a company keep the first listed ticker (e.g. Alphabet)
+            alias = _company_alias(name) if isinstance(name, str) else None
+            if alias:
+                patterns.setdefault(alias, ticker)
+
+        self._automaton = AhoCorasick(patterns)
+
+    def match(self, text: str) -> Optional[List[str]]:
+        """
+        Detects known tickers in a text.
+
+        Parameters
+        ----------
+        text: str
+            Body of text to detect presence of tickers.
+
+        Returns
+        -------
+        tickers: Optional[List[str]]
+            Detected tickers, in order of first mention. None if no ticker is detected.
+
+        """
+        tickers = dict()
+        for start, end, ticker in self._automaton.iter(text):
+            # Whole word matches only
+            if (start > 0 and text[start - 1].isalnum()) or (
+                end < len(text) and text[end].isalnum()
+            ):
+                continue
+            tickers[ticker] = None
+
+        return list(tickers) or None
+
+
+@lru_cache(maxsize=8)
+def ticker_matcher(
+    universe: Optional[Tuple[Tuple[str, Optional[str]], ...]] = None,
+) -> TickerMatcher:
+    """
+    Process-wide ticker matcher of a universe, built on first use.
+
+    Parameters
+    ----------
+    universe: Optional[Tuple[Tuple[str, Optional[str]], ...]], default None
+        (Ticker, Name) of the tickers to match on top of the SP500 tickers.
+
+    """
+    if universe is not None:
+        universe = pd.DataFrame(list(universe), columns=["Ticker", "Name"])
+
+    return TickerMatcher(universe=universe)
+
+
+def _company_alias(name: str) -> Optional[str]:
+    """
+    Company name without parentheses, share classes, suffixes and trailing punctuations. None if the
+    alias is too short or a single dictionary word.
+
+    """
+    words = re.sub(r"\([^)]*\)|\bClass [A-Z]\b", " ", name).split()
+    if words and words[0] == "The":
+        words = words[1:]
+
+    while words and (
+        words[-1].strip(".,").lower() in COMPANY_SUFFIXES
+        or words[-1].strip(".,&") == ""
+    ):
+        words = words[:-1]
+
+    alias = " ".join(words).strip(" .,&")
+    if len(alias) < COMPANY_ALIAS_LEN_MIN or (
+        " " not in alias and not _check_unknown(alias)
+    ):
+        return None
+
+    return alias
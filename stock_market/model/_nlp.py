@@ -1,12 +1,43 @@
-from pathlib import Path as _Path
-from typing import Dict, List, Union
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from typing import Dict, List, Optional, Union
 
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
+from nltk.sentiment.vader import SentimentIntensityAnalyzer, VaderConstants
+
+from stock_market.model._lexicon import load_lexicon
+
+
+class VaderAnalyzer(SentimentIntensityAnalyzer):
+    """
+    Vader Lexicon sentiment analyzer, set up from a lexicon dictionary instead of parsing the
+    lexicon text file.
+
+    Parameters
+    ----------
+    lexicon: Optional[Dict[str, float]], default None
+        Score by word. If None, use the compiled Vader lexicon (see load_lexicon).
+
+    """
+
+    def __init__(self, lexicon: Optional[Dict[str, float]] = None):
+        self.lexicon = load_lexicon() if lexicon is None else lexicon
+        self.constants = VaderConstants()
+
+
+@lru_cache(maxsize=None)
+def vader_analyzer(finance_terms: bool = False) -> VaderAnalyzer:
+    """
+    Process-wide Vader analyzer, built on first use.
+
+    """
+    return VaderAnalyzer(lexicon=load_lexicon(finance_terms))
 
 
 # nltk Vader Lexicon - Sentiment Analysis
 def nltk_sentiment(
-    text: Union[str, List[str]]
+    text: Union[str, List[str]],
+    finance_terms: bool = False,
 ) -> Union[Dict[str, float], List[Dict[str, float]]]:
     """
     Sentiment analysis using Vader Lexicon (tuned for social media sentiments).
@@ -16,26 +47,86 @@ def nltk_sentiment(
     text: Union[str, List[str]]
         Sentence(s) to perform sentiment analysis on.
 
+    finance_terms: bool, default False
+        Option to score finance terms (e.g. bullish, bagholder) on top of the Vader lexicon.
+
     Returns
     -------
     result: Union[Dict[str, float], List[Dict[str, float]]]
         Sentiment scores.
 
     """
-    # Refer to lexicon data
-    vader_sentiment = SentimentIntensityAnalyzer(
-        lexicon_file=str(
-            _Path(__file__).parent.parent / "data/_files/vader_lexicon.txt"
-        ),
-    )
-
     # Check input text
     if type(text) is list:
-        result = list()
-        for phrase in text:
-            result.append(vader_sentiment.polarity_scores(phrase))
+        result = _score_phrases(text, finance_terms=finance_terms)
 
     else:
-        result = vader_sentiment.polarity_scores(str(text))
+        result = vader_analyzer(finance_terms).polarity_scores(str(text))
+
+    return result
+
+
+def nltk_sentiment_batch(
+    text: List[str],
+    n_jobs: int = 1,
+    chunk_size: int = 1000,
+    finance_terms: bool = False,
+) -> List[Dict[str, float]]:
+    """
+    Sentiment analysis using Vader Lexicon for a large number of sentences, scored in chunks over
+    a process pool.
+
+    Parameters
+    ----------
+    text: List[str]
+        Sentences to perform sentiment analysis on.
+
+    n_jobs: int, default 1
+        Number of worker processes. If -1, use all cpus. If 1, or if all sentences fit in one
+        chunk, score in the current process.
+
+    chunk_size: int, default 1000
+        Number of sentences sent to a worker process at a time.
+
+    finance_terms: bool, default False
+        Option to score finance terms (e.g. bullish, bagholder) on top of the Vader lexicon.
+
+    Returns
+    -------
+    result: List[Dict[str, float]]
+        Sentiment scores, in the order of the sentences.
+
+    """
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+
+    if n_jobs < 1 or chunk_size < 1:
+        raise ValueError("n_jobs and chunk_size should be positive (or n_jobs=-1).")
+
+    if n_jobs == 1 or len(text) <= chunk_size:
+        return _score_phrases(text, finance_terms=finance_terms)
+
+    # Build the analyzer before the pool starts, so forked workers share it
+    vader_analyzer(finance_terms)
+
+    chunks = [text[i : i + chunk_size] for i in range(0, len(text), chunk_size)]
+    with ProcessPoolExecutor(max_workers=min(n_jobs, len(chunks))) as executor:
+        result = list()
+        for chunk_result in executor.map(
+            partial(_score_phrases, finance_terms=finance_terms), chunks
+        ):
+            result.extend(chunk_result)
 
     return result
+
+
+def _score_phrases(
+    text: List[str], finance_terms: bool = False
+) -> List[Dict[str, float]]:
+    """
+    Sentiment scores of sentences with the process-wide analyzer.
+
+    """
+    polarity_scores = vader_analyzer(finance_terms).polarity_scores
+
+    return [polarity_scores(str(phrase)) for phrase in text]
@@ -0,0 +1,15 @@
+import pytest
+
+from stock_market.data.constants import CACHE_DIR_ENV
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """
+    Local caches (bars, compiled lexicons, stores) written to a temporary directory, not to the
+    user's home.
+
+    """
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / "cache"))
+
+    return tmp_path / "cache"
@@ -1,7 +1,28 @@
+import time
+from pathlib import Path as _Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
 import pytest
+import requests.exceptions
 from plotly.graph_objs._figure import Figure as go_Figure
 
-from stock_market.analysis.stocks import _unique_ordered_list, stock_chart, stock_profit
+from stock_market.analysis import index, ipo, reddit, stocks
+from stock_market.analysis.index import IndexView
+from stock_market.analysis.ipo import IPOCohort, RecentIPO, plotly_matrix_heatmap
+from stock_market.analysis.reddit import RedditSentiment, RedditSentimentStream
+from stock_market.analysis.stocks import (
+    _unique_ordered_list,
+    portfolio_profit,
+    stock_chart,
+    stock_chart_data,
+    stock_chart_figure,
+    stock_profit,
+)
+from stock_market.data import RedditSource, _stocks
+from stock_market.data._ipo import _IPO_PAGE, parse_ipo_tables
+from stock_market.data.constants import IPO_URL
 
 
 class TestStocksAnalysis:
@@ -59,7 +80,116 @@ class TestStocksAnalysis:
         )
 
     @staticmethod
-    def test_stock_chart():
+    def test_portfolio_profit():
+        positions = pd.DataFrame(
+            {
+                "ticker": ["aapl", "AAPL", "AAPL"],
+                "quantity": [1, 100, 100],
+                "purchase_date": ["2021-01-14", "2021-01-02", "2100-01-01"],
+                "sell_date": ["2021-01-14", "2021-01-09", "2100-01-08"],
+            }
+        )
+
+        # Invalid market time raises exception
+        with pytest.raises(Exception):
+            portfolio_profit(positions.assign(purchase_time="Invalid time"))
+
+        profits = portfolio_profit(positions)
+
+        # Check Value calculation results, equal to stock_profit
+        assert profits["net_profit"][0] == stock_profit(
+            ticker="aapl",
+            quantity=1,
+            purchase_date="2021-01-14",
+            sell_date="2021-01-14",
+        )
+
+        # Non market dates are shifted to market days
+        assert profits["purchase_market_date"][1] == pd.to_datetime("2021-01-04")
+        assert profits["sell_market_date"][1] == pd.to_datetime("2021-01-08")
+
+        # Invalid date range
+        assert pd.isna(profits["net_profit"][2])
+
+    @staticmethod
+    def test_portfolio_profit_missing_dates(monkeypatch):
+        requests = list()
+
+        def get_tickers(tickers, start_date, end_date, **kwargs):
+            requests.append(start_date)
+            return {ticker: IPO_PRICE_HISTORY["AAA"] for ticker in tickers}
+
+        monkeypatch.setattr(stocks, "get_tickers", get_tickers)
+
+        positions = pd.DataFrame(
+            {
+                "ticker": ["AAA", "AAA", "BBB"],
+                "quantity": [1, 1, 1],
+                "purchase_date": [None, "2021-01-05", None],
+                "sell_date": ["2021-01-08", "2021-01-08", "2021-01-08"],
+            }
+        )
+        profits = portfolio_profit(positions)
+
+        # Positions without a purchase date are not priced from the first bar
+        assert pd.isna(profits["purchase_price"][0])
+        assert pd.isna(profits["net_profit"][0])
+        assert pd.isna(profits["net_profit"][2])
+        assert profits["net_profit"][1] == 12.0 - 11.0
+        assert requests == [{"AAA": pd.Timestamp("2021-01-05")}]
+
+    @staticmethod
+    def test_stock_profit_before_calendar(monkeypatch):
+        requests = list()
+
+        def get_ticker(ticker, start_date, end_date, **kwargs):
+            requests.append((start_date, end_date))
+            dates = pd.bdate_range(start_date, end_date)
+            return pd.DataFrame(
+                {
+                    "High": 2.0,
+                    "Low": 1.0,
+                    "Open": range(len(dates)),
+                    "Close": range(len(dates)),
+                    "Volume": 100.0,
+                    "Adj Close": range(len(dates)),
+                },
+                index=dates,
+                dtype=float,
+            )
+
+        monkeypatch.setattr(stocks, "get_ticker", get_ticker)
+
+        # Purchase before the market calendar is bought on the requested date, not in 1990
+        assert (
+            stock_profit("IBM", 1, purchase_date="1985-06-03", sell_date="1995-12-29")
+            == len(pd.bdate_range("1985-06-03", "1995-12-29")) - 1
+        )
+        assert requests[-1] == (
+            pd.Timestamp("1985-06-03"),
+            pd.Timestamp("1995-12-29"),
+        )
+
+        # Date range entirely before the market calendar
+        assert (
+            stock_profit("IBM", 1, purchase_date="1985-06-03", sell_date="1985-12-31")
+            == len(pd.bdate_range("1985-06-03", "1985-12-31")) - 1
+        )
+        assert requests[-1][0] == pd.Timestamp("1985-06-03")
+
+    @staticmethod
+    def test_stock_chart(monkeypatch):
+        # Connection errors are raised, not reported as invalid stocks
+        def connection_error(*args, **kwargs):
+            raise requests.exceptions.ConnectionError("Connection refused")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(_stocks.data, "DataReader", connection_error)
+            with pytest.raises(requests.exceptions.ConnectionError):
+                stock_chart(
+                    stocks=["tsla"], start_date="2020-01-01", end_date="2020-01-08"
+                )
+
         # Exception: No stocks are valid
         with pytest.raises(Exception):
             stock_chart(
@@ -86,9 +216,491 @@ class TestStocksAnalysis:
         )
         assert type(valid_chart_obj) == go_Figure
 
+        # Data without the chart, charted separately
+        chart_data = stock_chart_data(
+            stocks=["nio", "NIO"], start_date="2020-05-01", end_date="2020-08-25"
+        )
+        assert list(chart_data) == ["nio"]
+        assert list(chart_data["nio"].columns) == ["Close", "Volume"]
+        assert type(stock_chart_figure(chart_data)) == go_Figure
+
     @staticmethod
     def test_helper_functions():
         # Test _unique_ordered_list
         duplicate_list = ["tsla", "nio", "tsla", "xpev", "nkla"]
 
         assert _unique_ordered_list(duplicate_list) == ["tsla", "nio", "xpev", "nkla"]
+
+
+IPO_CALENDAR_HTML = _Path(__file__).parent / "_files" / "ipo_calendar.html"
+
+IPO_PRICE_HISTORY = {
+    "AAA": pd.DataFrame(
+        {
+            "Open": [10.0, 11.0, 12.0, 13.0, 12.0],
+            "High": [11.0, 14.0, 13.0, 14.0, 12.5],
+            "Low": [9.0, 10.0, 11.0, 12.0, 11.0],
+            "Close": [11.0, 12.0, 13.0, 12.0, 12.0],
+            "Volume": [100.0] * 5,
+        },
+        index=pd.bdate_range("2021-01-04", periods=5),
+    ),
+    "BBB": pd.DataFrame(
+        {
+            "Open": [20.0, 19.0],
+            "High": [21.0, 19.5],
+            "Low": [18.0, 17.0],
+            "Close": [19.0, 18.0],
+            "Volume": [200.0] * 2,
+        },
+        index=pd.bdate_range("2021-01-07", periods=2),
+    ),
+}
+
+
+class TestIPOAnalysis:
+    @staticmethod
+    def test_overall_summary(monkeypatch):
+        monkeypatch.setattr(go_Figure, "show", lambda self, *args, **kwargs: None)
+
+        recent_ipo = RecentIPO()
+        recent_ipo._price_history = IPO_PRICE_HISTORY
+        stats = recent_ipo.overall_summary
+
+        # Most recent IPO first
+        assert list(stats["Ticker"]) == ["BBB", "AAA"]
+        assert list(stats["Days_On_Exchange"]) == [2, 5]
+        assert list(stats["Pct_Overall_Change"]) == [-10.0, 20.0]
+        assert list(stats["OSD"]) == [0, 1]
+        assert list(stats["OSD_Max_Pct_Gain"]) == [5.0, 40.0]
+        assert list(stats["OSD_Valid"]) == [False, True]
+        assert recent_ipo._overall_summary["overall_change"] == {
+            "overall_pct": 5.0,
+            "overall_osd": 1.0,
+        }
+
+        # Heatmap rows by performance, padded after the last market day
+        heatmap = recent_ipo._overall_summary["plots"]["individual_osd_map"]
+        assert list(heatmap.data[0].y) == ["AAA", "BBB"]
+        assert list(heatmap.data[0].z[0]) == [10.0, 20.0, 30.0, 20.0, 20.0]
+        assert heatmap.data[0].z[1][1] == -10.0
+        assert pd.isna(heatmap.data[0].z[1][2])
+
+    @staticmethod
+    def test_recent_ipo_headless(monkeypatch, capsys):
+        def show(self, *args, **kwargs):
+            raise AssertionError("Figures are not shown in headless mode")
+
+        monkeypatch.setattr(go_Figure, "show", show)
+
+        recent_ipo = RecentIPO(render=False)
+        recent_ipo._price_history = IPO_PRICE_HISTORY
+
+        # Summaries computed without figures or output
+        stats = recent_ipo.overall_summary
+        assert list(stats["Ticker"]) == ["BBB", "AAA"]
+        assert "plots" not in recent_ipo._overall_summary
+        assert list(recent_ipo._overall_summary["osd_matrix"].index) == ["AAA", "BBB"]
+        assert len(recent_ipo.individual_summary("aaa")) == 5
+        assert capsys.readouterr().out == ""
+
+        # Figures built on request
+        plots = recent_ipo.overall_figures()
+        assert type(plots["individual_pct_change"]) == go_Figure
+        assert (
+            plots["individual_osd_map"]
+            is recent_ipo.overall_figures()["individual_osd_map"]
+        )
+        assert type(recent_ipo.individual_figure("AAA")) == go_Figure
+
+        # Rendered summary and figures from a single summary computation
+        summaries = list()
+        summarize = recent_ipo._summarize
+        monkeypatch.setattr(
+            recent_ipo, "_summarize", lambda: summaries.append(None) or summarize()
+        )
+        monkeypatch.setattr(go_Figure, "show", lambda self, *args, **kwargs: None)
+        recent_ipo.render = True
+        assert recent_ipo.overall_summary is stats
+        assert len(summaries) == 1
+
+        # Invalid case - ticker not in the recent IPO
+        with pytest.raises(Warning):
+            recent_ipo.individual_figure("CCC")
+        with pytest.raises(Warning):
+            recent_ipo.individual_summary("CCC")
+
+    @staticmethod
+    def test_recent_ipo_cache(monkeypatch):
+        monkeypatch.setattr(go_Figure, "show", lambda self, *args, **kwargs: None)
+        requests = list()
+
+        def get_tickers(tickers, start_date, **kwargs):
+            requests.append(start_date)
+            return dict(IPO_PRICE_HISTORY)
+
+        monkeypatch.setattr(ipo, "get_tickers", get_tickers)
+        _IPO_PAGE.clear()
+        _IPO_PAGE.get(IPO_URL, lambda: parse_ipo_tables(IPO_CALENDAR_HTML.read_bytes()))
+
+        # Summaries reused by the instance, not shared with other instances
+        recent_ipo = RecentIPO(lookback_days=60, ttl=60)
+        stats = recent_ipo.overall_summary
+        assert recent_ipo.overall_summary is stats
+        assert RecentIPO().overall_summary is not stats
+        assert len(requests) == 2
+        assert (pd.to_datetime("today") - requests[0]).days == 60
+
+        # Invalidated or expired data is loaded again
+        recent_ipo.invalidate()
+        assert recent_ipo.overall_summary is not stats
+        assert len(requests) == 3
+
+        stats = recent_ipo.overall_summary
+        recent_ipo._loaded_at -= 120
+        assert recent_ipo.overall_summary is not stats
+        assert len(requests) == 4
+
+        _IPO_PAGE.clear()
+
+    @staticmethod
+    def test_ipo_cohort(monkeypatch):
+        requests = list()
+
+        def get_tickers(tickers, start_date, end_date, **kwargs):
+            requests.append((start_date, end_date))
+            return {
+                ticker: IPO_PRICE_HISTORY.get(ticker)
+                for ticker in tickers
+                if ticker in IPO_PRICE_HISTORY
+            }
+
+        monkeypatch.setattr(ipo, "get_tickers", get_tickers)
+
+        ipos = pd.DataFrame(
+            {
+                "Ticker": ["aaa", "BBB", "AAA", "CCC"],
+                "IPO_Date": ["2021-01-04", "2021-01-06", "2021-01-05", "2022-01-03"],
+            }
+        )
+        cohort = IPOCohort(ipos, horizon=4)
+
+        # Price history requested over the horizon of each IPO (market days)
+        assert cohort.price_history.keys() == {"AAA", "BBB"}
+        start_date, end_date = requests[0]
+        assert start_date["AAA"] == pd.Timestamp("2021-01-04")
+        assert end_date["AAA"] == pd.Timestamp("2021-01-07")
+
+        # Market days counted from the IPO date: BBB has no price history on IPO day, so no
+        # IPO day open to measure changes from
+        stats = cohort.stats.set_index("Ticker")
+        assert stats.loc["AAA", "Days_On_Exchange"] == 4
+        assert stats.loc["BBB", "Days_On_Exchange"] == 3
+        assert stats.loc["BBB", "OSD"] == 1
+        assert pd.isna(stats.loc["BBB", "Pct_Overall_Change"])
+        assert pd.isna(stats.loc["BBB", "OSD_Max_Pct_Gain"])
+
+        returns = cohort.returns(horizons=[0, 3])
+        assert list(returns.loc["AAA"]) == [10.0, 20.0]
+        assert pd.isna(returns.loc["BBB", 0])
+
+        summary = cohort.summary()
+        assert list(summary["Num_IPO"]) == [2]
+        assert summary["Mean_OSD_Max_Pct_Gain"].iloc[0] == 40.0
+
+        # IPO dates before the market calendar are skipped, not counted from its first day
+        requests.clear()
+        with pytest.warns(UserWarning):
+            cohort = IPOCohort(
+                pd.concat(
+                    [
+                        ipos,
+                        pd.DataFrame({"Ticker": ["DDD"], "IPO_Date": ["1985-06-03"]}),
+                    ],
+                    ignore_index=True,
+                ),
+                horizon=4,
+            )
+        assert "DDD" not in set(cohort.ipos["Ticker"])
+        assert cohort.price_history.keys() == {"AAA", "BBB"}
+        assert "DDD" not in requests[0][0]
+
+        # Invalid case - invalid horizon
+        with pytest.raises(ValueError):
+            IPOCohort(ipos, horizon=0)
+
+    @staticmethod
+    def test_market_day_index():
+        assert ipo._market_day_after(pd.Timestamp("2021-01-02"), 0) == pd.Timestamp(
+            "2021-01-04"
+        )
+        assert ipo._market_day_after(pd.Timestamp("2021-01-04"), 3) == pd.Timestamp(
+            "2021-01-07"
+        )
+
+        # Invalid case - dates outside of the market calendar
+        with pytest.raises(ValueError):
+            ipo._market_day_after(pd.Timestamp("1985-06-03"), 29)
+        with pytest.raises(ValueError):
+            ipo._market_day_index(
+                np.array(["2021-01-04", "2101-01-03"], dtype="datetime64[D]")
+            )
+        with pytest.raises(ValueError):
+            ipo._market_day_after(pd.Timestamp("2100-12-29"), 10)
+
+    @staticmethod
+    def test_stack_price_history():
+        # TSX listing, trading on Martin Luther King Jr. Day (2021-01-18)
+        price_history = {
+            "CCC.TO": pd.DataFrame(
+                {"Open": 1.0, "High": 1.0, "Low": 1.0, "Close": 1.0},
+                index=pd.to_datetime(["2021-01-15", "2021-01-18", "2021-01-19"]),
+            ),
+            "AAA": IPO_PRICE_HISTORY["AAA"],
+        }
+        bars = ipo._stack_price_history(
+            price_history,
+            ipo_dates={
+                "CCC.TO": pd.Timestamp("2021-01-15"),
+                "AAA": pd.Timestamp("2021-01-04"),
+            },
+        )
+
+        # Days off the US market calendar are counted, not collapsed onto the next market day
+        assert list(bars.loc[bars["Ticker"] == "CCC.TO", "Day"]) == [0, 1, 2]
+        assert list(bars.loc[bars["Ticker"] == "AAA", "Day"]) == [0, 1, 2, 3, 4]
+
+    @staticmethod
+    def test_plotly_matrix_heatmap():
+        nan = float("nan")
+        fig = plotly_matrix_heatmap(
+            data=[[-30.0, 10.0, None], [5.0, nan, 40.0]],
+            x_categorical=[0, 1, 2],
+            y_categorical=["AAA", "BBB"],
+        )
+        assert type(fig) == go_Figure
+        assert fig.data[0].colorscale[0][0] == 0
+
+        # Invalid case - no values
+        with pytest.raises(ValueError):
+            plotly_matrix_heatmap(
+                data=[[None, nan]], x_categorical=[0, 1], y_categorical=["AAA"]
+            )
+
+
+SP500_HTML = b"""
+<div class="element element--table performance">
+<table>
+<tr><td>5 Day</td><td>1.2%</td></tr>
+<tr><td>1 Month</td><td>-0.4%</td></tr>
+</table>
+</div>
+<div class="element element--table ByIndexGainers">
+<table>
+<tr>
+<th>Symbol</th>
+<th>Price</th>
+</tr>
+<tr>
+<td>AAPL</td>
+<td>150.00</td>
+</tr>
+</table>
+</div>
+<div class="element element--table ByIndexDecliners">
+<table>
+<tr>
+<th>Symbol</th>
+<th>Price</th>
+</tr>
+<tr>
+<td>TSLA</td>
+<td>700.00</td>
+</tr>
+</table>
+</div>
+"""
+
+
+class TestIndexAnalysis:
+    @staticmethod
+    def test_index_view(monkeypatch):
+        fetched = list()
+
+        class Response:
+            content = SP500_HTML
+
+        def get(url):
+            fetched.append(url)
+            return Response()
+
+        monkeypatch.setattr(index.requests, "get", get)
+        index._INDEX_PAGE.clear()
+
+        index_view = IndexView("sp500")
+        assert index_view.summary_performance["periodic_performance"].to_dict() == {
+            "5 Day": "1.2%",
+            "1 Month": "-0.4%",
+        }
+        top_stocks, bottom_stocks = IndexView("SP500").summary_stocks_today
+        assert list(top_stocks["Symbol"]) == ["AAPL"]
+        assert list(bottom_stocks["Symbol"]) == ["TSLA"]
+
+        # Page is fetched and parsed once, shared across metrics and instances
+        assert len(fetched) == 1
+
+        index._INDEX_PAGE.clear()
+
+
+REDDIT_TITLES = [
+    "GME to the moon, great day",
+    "Terrible earnings for $AMC",
+    "What is everyone buying?",
+    "TSLA and GME are flat",
+    "Loving my $GME $TSLA gains",
+] * 4
+
+
+class TestRedditAnalysis:
+    @staticmethod
+    def test_reddit_sentiment(monkeypatch):
+        monkeypatch.setattr(
+            reddit,
+            "get_reddit_top_posts",
+            lambda **kwargs: {
+                "titles": REDDIT_TITLES,
+                "num_comments": list(range(len(REDDIT_TITLES))),
+            },
+        )
+
+        reddit_sentiment = RedditSentiment("wallstreetbets", num_post=20)
+        sentiment = reddit_sentiment.sentiment
+        assert sentiment is reddit_sentiment.sentiment
+        assert dict(zip(sentiment["ticker"], sentiment["mentions"])) == {
+            "GME": 12,
+            "AMC": 4,
+            "TSLA": 8,
+        }
+        assert reddit_sentiment.ticker_classification[:3] == [["GME"], ["AMC"], None]
+
+        # Long format mentions, one row per post and ticker
+        ticker_mentions = reddit_sentiment.ticker_mentions
+        assert list(ticker_mentions.columns) == [
+            "post",
+            "ticker",
+            "compound",
+            "num_comments",
+        ]
+        assert len(ticker_mentions) == sentiment["mentions"].sum()
+
+        # Comment weighted sentiment of a ticker mentioned in one kind of post
+        amc = sentiment.set_index("ticker").loc["AMC"]
+        assert amc["weighted_sentiment"] == pytest.approx(amc["sentiment"])
+
+        # Chunks over worker processes, merged to the same results
+        reddit_sentiment_pool = RedditSentiment(
+            "wallstreetbets", num_post=20, n_jobs=2, chunk_size=3
+        )
+        pd.testing.assert_frame_equal(reddit_sentiment_pool.sentiment, sentiment)
+        assert (
+            reddit_sentiment_pool.ticker_classification
+            == reddit_sentiment.ticker_classification
+        )
+
+    @staticmethod
+    def test_reddit_sentiment_source():
+        class ListSource(RedditSource):
+            def top_posts(self, subreddit, num_post=10, time_period="day"):
+                return {
+                    "titles": REDDIT_TITLES[:num_post],
+                    "num_comments": list(range(num_post)),
+                }
+
+        sentiment = RedditSentiment("wallstreetbets", num_post=5, source=ListSource())
+        assert dict(
+            zip(sentiment.sentiment["ticker"], sentiment.sentiment["mentions"])
+        ) == {
+            "GME": 3,
+            "AMC": 1,
+            "TSLA": 2,
+        }
+
+        # Backtest replay of past posts, in chunks
+        stream = RedditSentimentStream("wallstreetbets", windows=("24h",))
+        posts = (
+            {"title": post, "created_utc": i * 1800.0, "num_comments": i}
+            for i, post in enumerate(REDDIT_TITLES[:5])
+        )
+        assert stream.replay(posts, chunk_size=2) == 5
+        pd.testing.assert_frame_equal(
+            stream.sentiment("24h", now=4 * 1800.0), sentiment.sentiment
+        )
+
+    @staticmethod
+    def test_reddit_sentiment_stream():
+        stream = RedditSentimentStream("wallstreetbets", windows=("1h", "24h"))
+
+        # Posts added incrementally, 30 minutes apart
+        for i, post in enumerate(REDDIT_TITLES[:5]):
+            stream.add(posts=[post], created_utc=[i * 1800.0])
+
+        now = 4 * 1800.0
+        sentiment_day = stream.sentiment("24h", now=now)
+        assert dict(zip(sentiment_day["ticker"], sentiment_day["mentions"])) == {
+            "GME": 3,
+            "AMC": 1,
+            "TSLA": 2,
+        }
+
+        # Posts older than the window are removed from the aggregates
+        sentiment_hour = stream.sentiment("1h", now=now)
+        assert dict(zip(sentiment_hour["ticker"], sentiment_hour["mentions"])) == {
+            "GME": 2,
+            "TSLA": 2,
+        }
+        assert list(sentiment_hour.columns) == [
+            "ticker",
+            "mentions",
+            "sentiment",
+            "weighted_sentiment",
+        ]
+        assert stream.sentiment("1h", now=now + 2 * 3600).empty
+
+        # Posts older than the window from the newest post are removed on add
+        stream.add(posts=[REDDIT_TITLES[1]], created_utc=[now + 3600])
+        assert len(stream.windows["1h"]._posts) == 1
+
+        # Invalid case - window not in the stream
+        with pytest.raises(Warning):
+            stream.sentiment("5m")
+
+    @staticmethod
+    def test_reddit_sentiment_stream_update(monkeypatch):
+        created = time.time()
+
+        def stream_items(posts):
+            for post in posts:
+                yield SimpleNamespace(body=post, created_utc=created)
+            while True:
+                yield None
+
+        class Subreddit(object):
+            stream = SimpleNamespace(
+                submissions=lambda **kwargs: stream_items(REDDIT_TITLES[:3]),
+                comments=lambda **kwargs: stream_items(REDDIT_TITLES[3:5]),
+            )
+
+        monkeypatch.setattr(reddit, "subreddit_handle", lambda subreddit: Subreddit())
+        stream = RedditSentimentStream("wallstreetbets", windows=("1h",))
+
+        # Limit applies over submissions and comments
+        assert stream.update(max_items=4) == 4
+        assert stream.update(max_items=4) == 1
+        assert stream.update() == 0
+
+        sentiment = stream.sentiment("1h")
+        assert dict(zip(sentiment["ticker"], sentiment["mentions"])) == {
+            "GME": 3,
+            "AMC": 1,
+            "TSLA": 2,
+        }
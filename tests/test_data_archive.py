@@ -0,0 +1,85 @@
+import threading
+from pathlib import Path as _Path
+
+import pandas as pd
+import pytest
+
+from stock_market.data import IPOArchive, _archive
+from stock_market.data._ipo import IPO, _IPO_PAGE, parse_ipo_tables
+from stock_market.data.constants import IPO_URL
+
+IPO_CALENDAR_HTML = _Path(__file__).parent / "_files" / "ipo_calendar.html"
+
+
+def test_ipo_archive(tmp_path):
+    _IPO_PAGE.clear()
+    _IPO_PAGE.get(IPO_URL, lambda: parse_ipo_tables(IPO_CALENDAR_HTML.read_bytes()))
+
+    archive = IPOArchive(path=str(tmp_path))
+    ipo = IPO()
+    recent_ipo = ipo.recent_ipo
+
+    # First record archives all rows, unchanged tables write nothing
+    changes = archive.record(ipo, timestamp="2021-01-04 12:00")
+    assert changes["recent_ipo"] == len(recent_ipo)
+    log_size = (tmp_path / "recent_ipo.jsonl").stat().st_size
+    assert set(archive.record(ipo, timestamp="2021-01-05 12:00").values()) == {0}
+    assert (tmp_path / "recent_ipo.jsonl").stat().st_size == log_size
+
+    # Only the diff is written: one row removed, one row changed
+    updated = recent_ipo.iloc[1:].copy()
+    updated.loc[updated.index[0], "Price"] += 1.0
+    assert (
+        IPOArchive(path=str(tmp_path)).record_table(
+            "recent_ipo", updated, timestamp="2021-01-06 12:00"
+        )
+        == 3
+    )
+
+    # Point in time queries, with the archived types
+    assert archive.snapshot("recent_ipo", as_of="2021-01-05").equals(recent_ipo)
+    assert len(archive.snapshot("recent_ipo")) == len(updated)
+    assert archive.snapshot("recent_ipo", as_of="2021-01-01") is None
+    assert archive.snapshot("withdrawn_ipo").equals(ipo.withdrawn_ipo)
+
+    history = archive.history("recent_ipo")
+    assert len(history) == len(recent_ipo) + 1
+    assert history["Removed"].notna().sum() == 2
+    assert history["First_Seen"].max() == pd.Timestamp("2021-01-06 12:00")
+
+    _IPO_PAGE.clear()
+
+
+def test_ipo_archive_out_of_order(tmp_path):
+    archive = IPOArchive(path=str(tmp_path))
+    table = pd.DataFrame({"Ticker": ["AAA", "BBB"], "Shares": [100, 200]})
+    archive.record_table("recent_ipo", table, timestamp="2021-01-05")
+
+    # Invalid case - record timestamped before the last record
+    with pytest.raises(ValueError):
+        IPOArchive(path=str(tmp_path)).record_table(
+            "recent_ipo", table.iloc[1:], timestamp="2021-01-04"
+        )
+    assert archive.snapshot("recent_ipo").equals(table)
+
+
+def test_ipo_archive_locked(tmp_path):
+    pytest.importorskip("fcntl")
+    archive = IPOArchive(path=str(tmp_path))
+    table = pd.DataFrame({"Ticker": ["AAA", "BBB"], "Shares": [100, 200]})
+    path = tmp_path / "recent_ipo.jsonl"
+
+    # Records wait for the log lock held by another writer (e.g. another process)
+    with _archive._locked_log(path):
+        thread = threading.Thread(
+            target=archive.record_table,
+            args=("recent_ipo", table),
+            kwargs={"timestamp": "2021-01-04"},
+        )
+        thread.start()
+        thread.join(timeout=0.2)
+        assert thread.is_alive()
+        assert path.stat().st_size == 0
+
+    thread.join()
+    assert archive.snapshot("recent_ipo").equals(table)
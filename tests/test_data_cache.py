@@ -0,0 +1,124 @@
+import time
+
+import pandas as pd
+
+from stock_market.data import BarCache
+from stock_market.data._cache import BAR_CACHE, TTLCache
+from stock_market.data.constants import CACHE_DIR_ENV
+
+
+def _mock_bars(start_date, end_date):
+    dates = pd.bdate_range(start_date, end_date, name="Date")
+    if len(dates) == 0:
+        return None
+    return pd.DataFrame({"Close": dates.dayofyear}, index=dates, dtype=float)
+
+
+def test_bar_cache(tmp_path):
+    bar_cache = BarCache(cache_dir=str(tmp_path))
+    fetched = list()
+
+    def fetch(start_date, end_date):
+        fetched.append((start_date, end_date))
+        return _mock_bars(start_date, end_date)
+
+    # First call downloads the full date range
+    bars = bar_cache.get(
+        "aapl", pd.to_datetime("2020-01-06"), pd.to_datetime("2020-01-17"), fetch
+    )
+    assert len(bars) == 10
+    assert len(fetched) == 1
+
+    # Overlapping window only downloads the missing edges
+    bars = bar_cache.get(
+        "AAPL", pd.to_datetime("2020-01-01"), pd.to_datetime("2020-01-24"), fetch
+    )
+    assert len(bars) == 18
+    assert fetched[1:] == [
+        (pd.to_datetime("2020-01-01"), pd.to_datetime("2020-01-06")),
+        (pd.to_datetime("2020-01-17"), pd.to_datetime("2020-01-24")),
+    ]
+
+    # Covered window is read locally
+    bars = bar_cache.get(
+        "AAPL", pd.to_datetime("2020-01-10"), pd.to_datetime("2020-01-15"), fetch
+    )
+    assert len(bars) == 4
+    assert len(fetched) == 3
+
+    # Covered window without bars returns None
+    assert (
+        bar_cache.get(
+            "AAPL", pd.to_datetime("2020-01-11"), pd.to_datetime("2020-01-12"), fetch
+        )
+        is None
+    )
+    assert len(fetched) == 3
+
+    # Cleared cache downloads again
+    bar_cache.clear("AAPL")
+    bar_cache.get(
+        "AAPL", pd.to_datetime("2020-01-10"), pd.to_datetime("2020-01-15"), fetch
+    )
+    assert len(fetched) == 4
+
+
+def test_bar_cache_readjusted(tmp_path):
+    bar_cache = BarCache(cache_dir=str(tmp_path))
+    fetched = list()
+    adjustment = [1.0]
+
+    def fetch(start_date, end_date):
+        fetched.append((start_date, end_date))
+        bars = _mock_bars(start_date, end_date)
+        bars["Adj Close"] = (bars.index.day * adjustment[0]).astype(float)
+        return bars
+
+    bar_cache.get(
+        "AAPL", pd.to_datetime("2020-01-06"), pd.to_datetime("2020-01-17"), fetch
+    )
+
+    # Unchanged history: only the edge is downloaded
+    bar_cache.get(
+        "AAPL", pd.to_datetime("2020-01-06"), pd.to_datetime("2020-01-24"), fetch
+    )
+    assert len(fetched) == 2
+
+    # Re-adjusted history (e.g. after a split): the covered range is downloaded again
+    adjustment[0] = 0.5
+    bars = bar_cache.get(
+        "AAPL", pd.to_datetime("2020-01-06"), pd.to_datetime("2020-01-31"), fetch
+    )
+    assert fetched[-1] == (pd.to_datetime("2020-01-06"), pd.to_datetime("2020-01-31"))
+    assert bars["Adj Close"].tolist() == (bars.index.day * 0.5).tolist()
+
+
+def test_bar_cache_dir(tmp_path, monkeypatch):
+    # Shared cache follows the environment, as set when accessed
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / "other"))
+    assert BAR_CACHE.cache_dir == tmp_path / "other" / "bars"
+    BAR_CACHE.save("AAPL", {"bars": None})
+    assert (tmp_path / "other" / "bars" / "AAPL.pkl").exists()
+
+    # Specified directories do not
+    assert BarCache(cache_dir=str(tmp_path)).cache_dir == tmp_path / "bars"
+
+
+def test_ttl_cache():
+    ttl_cache = TTLCache(ttl=0.1)
+    loaded = list()
+
+    def load():
+        loaded.append(None)
+        return len(loaded)
+
+    # Loaded once and shared until expired
+    assert ttl_cache.get("page", load) == 1
+    assert ttl_cache.get("page", load) == 1
+
+    time.sleep(0.15)
+    assert ttl_cache.get("page", load) == 2
+
+    # Cleared values are loaded again
+    ttl_cache.clear("page")
+    assert ttl_cache.get("page", load) == 3
@@ -0,0 +1,45 @@
+import pandas as pd
+
+from stock_market.data import (
+    is_market_day,
+    market_days,
+    next_market_day,
+    previous_market_day,
+)
+
+
+def test_market_days():
+    # Sorted array of market days
+    days = market_days()
+    assert (days[1:] > days[:-1]).all()
+
+    # Weekday, weekend, holiday and unscheduled closure
+    assert is_market_day("2021-01-04")
+    assert not is_market_day("2021-01-02")
+    assert not is_market_day("2021-01-18")
+    assert not is_market_day("2012-10-29")
+
+    # Observed holidays: Independence Day on a Saturday, New Year's Day on a Saturday
+    assert not is_market_day("2020-07-03")
+    assert is_market_day("2021-12-31")
+
+
+def test_next_previous_market_day():
+    # Shift to next nearest market day
+    assert next_market_day("2021-01-02") == pd.to_datetime("2021-01-04")
+    assert next_market_day("2021-01-04") == pd.to_datetime("2021-01-04")
+    assert next_market_day("2021-01-04", inclusive=False) == pd.to_datetime(
+        "2021-01-05"
+    )
+
+    # Shift to previous nearest market day
+    assert previous_market_day("2021-01-09") == pd.to_datetime("2021-01-08")
+    assert previous_market_day("2021-01-19", inclusive=False) == pd.to_datetime(
+        "2021-01-15"
+    )
+
+    # Out of calendar range, not clamped to the first or last market day
+    assert next_market_day("2200-01-01") is None
+    assert next_market_day("1985-03-01") is None
+    assert previous_market_day("1980-01-01") is None
+    assert previous_market_day("2200-01-01") is None
@@ -0,0 +1,118 @@
+from pathlib import Path as _Path
+
+import pandas as pd
+import pytest
+
+from stock_market.data import _ipo
+from stock_market.data._ipo import IPO, _IPO_PAGE, parse_ipo_tables
+from stock_market.data.constants import IPO_URL
+
+IPO_CALENDAR_HTML = _Path(__file__).parent / "_files" / "ipo_calendar.html"
+IPO_CALENDAR_PAGE_HTML = _Path(__file__).parent / "_files" / "ipo_calendar_page.html"
+
+
+def test_parse_ipo_tables():
+    content = IPO_CALENDAR_HTML.read_bytes()
+    tables = parse_ipo_tables(content, parser="html.parser")
+
+    # Recent, upcoming (this week, next week), future and withdrawn
+    assert [len(table) for table in tables] == [30, 8, 6, 40, 20]
+    assert list(tables[0].columns) == [
+        "Company_Name",
+        "Symbol",
+        "Exchange",
+        "Price",
+        "Shares",
+        "IPO_Date",
+    ]
+
+    # Extra value of future ipo rows is deleted
+    assert list(tables[3].columns) == [
+        "Company_Name",
+        "Symbol",
+        "Exchange",
+        "Price_Range",
+        "Shares",
+    ]
+    assert tables[3]["Symbol"].str.fullmatch("[A-Z]+").all()
+
+    # Same tables with the fast parser backend
+    pytest.importorskip("lxml")
+    for table, table_lxml in zip(tables, parse_ipo_tables(content, parser="lxml")):
+        pd.testing.assert_frame_equal(table, table_lxml)
+
+
+def test_parse_ipo_tables_page_markup():
+    # Full page markup: indented cells, nested links and quotes, entities, other tables
+    content = IPO_CALENDAR_PAGE_HTML.read_bytes()
+    tables = parse_ipo_tables(content, parser="html.parser")
+
+    assert [len(table) for table in tables] == [12, 4, 3, 8, 5]
+    assert tables[0].loc[0, "Company_Name"] == "NerdWallet & Co."
+    assert tables[0].loc[0, "Symbol"] == "KEMU -49.86%"
+    assert list(tables[3].columns) == [
+        "Company_Name",
+        "Symbol",
+        "Exchange",
+        "Price_Range",
+        "Shares",
+    ]
+    assert tables[3]["Symbol"].str.fullmatch("[A-Z]+").all()
+
+    # Same tables with the fast parser backend
+    pytest.importorskip("lxml")
+    for table, table_lxml in zip(tables, parse_ipo_tables(content, parser="lxml")):
+        pd.testing.assert_frame_equal(table, table_lxml)
+
+
+def test_ipo():
+    _IPO_PAGE.clear()
+    _IPO_PAGE.get(IPO_URL, lambda: parse_ipo_tables(IPO_CALENDAR_HTML.read_bytes()))
+
+    ipo = IPO()
+    assert ipo.recent_ipo["Percent_Change"].dtype == float
+    assert list(ipo.upcoming_ipo["week"].unique()) == ["This Week", "Next Week"]
+    assert len(ipo.future_ipo) == 40
+
+    # Shared raw tables are not modified by the data cleaning
+    assert "Symbol" in ipo._data_ws[0].columns
+
+    _IPO_PAGE.clear()
+
+
+def test_ipo_instance_cache(monkeypatch):
+    scrapes = list()
+
+    def scrape_ipo_tables():
+        scrapes.append(None)
+        return parse_ipo_tables(IPO_CALENDAR_HTML.read_bytes())
+
+    monkeypatch.setattr(_ipo, "_scrape_ipo_tables", scrape_ipo_tables)
+    _IPO_PAGE.clear()
+
+    # Data sets cached per instance, page shared across instances
+    ipo, other_ipo = IPO(), IPO()
+    assert ipo.recent_ipo is ipo.recent_ipo
+    assert other_ipo.recent_ipo is not ipo.recent_ipo
+    assert len(scrapes) == 1
+
+    # Invalidated data sets are rebuilt from the shared page
+    recent_ipo = ipo.recent_ipo
+    ipo.invalidate("recent_ipo")
+    assert ipo.recent_ipo is not recent_ipo
+    assert len(scrapes) == 1
+
+    # Refresh scrapes the page again
+    ipo.refresh()
+    ipo.recent_ipo
+    assert len(scrapes) == 2
+
+    # Expired data sets are rebuilt
+    ipo = IPO(ttl=0)
+    assert ipo.future_ipo is not ipo.future_ipo
+
+    # Invalid case - unknown data set
+    with pytest.raises(Warning):
+        ipo.invalidate("invalid_ipo")
+
+    _IPO_PAGE.clear()
@@ -0,0 +1,188 @@
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from stock_market.data import RedditDumpSource, RedditSource, get_reddit_posts
+from stock_market.data.reddit import _connection, trends
+from stock_market.data.reddit._connection import reddit_connection, subreddit_handle
+
+
+class MockReddit(object):
+    clients = list()
+    searches = list()
+
+    def __init__(self, **credentials):
+        self.clients.append(threading.get_ident())
+        self.subreddits = self
+
+    def search_by_name(self, subreddit, exact=True):
+        self.searches.append(subreddit)
+        if subreddit == "missing":
+            return list()
+        if subreddit == "unavailable":
+            raise ConnectionError("Reddit is unavailable.")
+        return [
+            SimpleNamespace(top=lambda limit, time_filter: _posts(subreddit, limit))
+        ]
+
+
+def _posts(subreddit, limit):
+    return [
+        SimpleNamespace(
+            id=f"{subreddit}{i}",
+            title=f"Post {i}",
+            selftext="",
+            score=10 * i,
+            num_comments=i,
+            created_utc=1600000000.0 + i,
+        )
+        for i in range(limit)
+    ]
+
+
+def test_reddit_connection(monkeypatch):
+    monkeypatch.setattr(_connection.praw, "Reddit", MockReddit)
+    monkeypatch.setattr(_connection, "_LOCAL", threading.local())
+    MockReddit.clients.clear()
+    MockReddit.searches.clear()
+
+    # Client and subreddit handles are reused within a thread
+    assert reddit_connection() is reddit_connection()
+    assert subreddit_handle("stocks") is subreddit_handle("Stocks")
+    assert MockReddit.searches == ["stocks"]
+
+    # New credentials create a new client
+    monkeypatch.setenv("REDDIT_CLIENT_ID", "new_client_id")
+    reddit_connection()
+    assert len(MockReddit.clients) == 2
+
+
+def test_get_reddit_posts(monkeypatch):
+    monkeypatch.setattr(_connection.praw, "Reddit", MockReddit)
+    monkeypatch.setattr(trends, "_FETCH_POOL", None)
+    monkeypatch.setattr(trends, "FETCH_POOL_WORKERS", 1)
+    MockReddit.clients.clear()
+
+    posts = get_reddit_posts(
+        ["stocks", "investing", "stocks"], num_post=3, max_workers=2
+    )
+    assert list(posts.columns) == [
+        "subreddit",
+        "id",
+        "title",
+        "selftext",
+        "score",
+        "num_comments",
+        "created_utc",
+    ]
+    assert list(posts["subreddit"]) == ["stocks"] * 3 + ["investing"] * 3
+    assert posts["score"].dtype == "int64"
+
+    # Fetch threads are shared, and keep their clients across calls
+    pool = trends._fetch_pool()
+    get_reddit_posts(["stocks", "investing"], num_post=3, max_workers=4)
+    assert trends._fetch_pool() is pool
+    assert len(MockReddit.clients) == 1
+
+    # Missing subreddits are skipped with a warning, or raised
+    with pytest.warns(UserWarning):
+        posts = get_reddit_posts(["stocks", "missing"], num_post=2)
+    assert set(posts["subreddit"]) == {"stocks"}
+    with pytest.raises(IndexError):
+        get_reddit_posts(["missing"], errors="raise")
+
+    # Other request errors are always raised
+    with pytest.raises(ConnectionError):
+        get_reddit_posts(["stocks", "unavailable"], errors="ignore")
+
+    # Invalid case - invalid time period
+    with pytest.raises(Warning):
+        get_reddit_posts("stocks", time_period="invalid_period")
+
+    # Invalid case - invalid number of workers
+    with pytest.raises(ValueError):
+        get_reddit_posts("stocks", max_workers=0)
+
+
+def test_get_reddit_posts_max_workers(monkeypatch):
+    monkeypatch.setattr(trends, "_FETCH_POOL", None)
+    monkeypatch.setattr(trends, "FETCH_POOL_WORKERS", 4)
+
+    running = list()
+    max_running = list()
+    lock = threading.Lock()
+
+    def fetch_posts(subreddit, num_post, time_period):
+        with lock:
+            running.append(subreddit)
+            max_running.append(len(running))
+        time.sleep(0.01)
+        with lock:
+            running.remove(subreddit)
+        return {field: list() for field in trends.POST_FIELDS}
+
+    monkeypatch.setattr(trends, "_fetch_posts", fetch_posts)
+
+    # Fetches of a call are capped by max_workers, within the shared pool
+    get_reddit_posts([f"subreddit{i}" for i in range(8)], max_workers=2)
+    assert len(max_running) == 8
+    assert max(max_running) <= 2
+
+
+DUMP_POSTS = [
+    {"subreddit": "stocks", "title": f"Post {i}", "score": score, "num_comments": i}
+    for i, score in enumerate([5, 50, 20, 40, 10])
+]
+
+
+def _write_dump(path, posts, compress=False):
+    lines = [
+        json.dumps(dict(post, created_utc=i * 3600)) for i, post in enumerate(posts)
+    ]
+    content = ("\n".join(lines[:2] + ["{not json"] + lines[2:]) + "\n").encode()
+    if compress:
+        zstandard = pytest.importorskip("zstandard")
+        content = zstandard.ZstdCompressor().compress(content)
+    path.write_bytes(content)
+    return path
+
+
+def test_reddit_dump_source(tmp_path):
+    dump = _write_dump(tmp_path / "stocks.ndjson", DUMP_POSTS)
+    other = _write_dump(
+        tmp_path / "investing.ndjson", [dict(DUMP_POSTS[1], subreddit="investing")]
+    )
+
+    # Top posts by score, within the time period ending at as_of (unix 4 * 3600)
+    source = RedditDumpSource([dump, other], as_of="1970-01-01 04:00")
+    with pytest.warns(UserWarning, match="invalid line"):
+        top_posts = source.top_posts("Stocks", num_post=3, time_period="all")
+    assert top_posts == {
+        "titles": ["Post 1", "Post 3", "Post 2"],
+        "num_comments": [1, 3, 2],
+    }
+
+    source = RedditDumpSource(dump, as_of="1970-01-01 02:00")
+    with pytest.warns(UserWarning):
+        top_posts = source.top_posts("stocks", num_post=3, time_period="hour")
+    assert top_posts["titles"] == ["Post 2"]
+
+    # Invalid case - invalid time period
+    with pytest.raises(Warning):
+        source.top_posts("stocks", time_period="invalid_period")
+
+    # Invalid case - sources implement top_posts
+    with pytest.raises(TypeError):
+        RedditSource()
+
+
+def test_reddit_dump_source_zst(tmp_path):
+    dump = _write_dump(tmp_path / "stocks.zst", DUMP_POSTS, compress=True)
+
+    with pytest.warns(UserWarning):
+        posts = list(RedditDumpSource(dump).iter_posts("stocks"))
+    assert [post["title"] for post in posts] == [post["title"] for post in DUMP_POSTS]
+    assert posts[-1]["created_utc"] == 4 * 3600.0
@@ -1,7 +1,14 @@
 import pandas as pd
 import pytest
+import requests.exceptions
 
-from stock_market.data import get_ticker, get_crypto
+from stock_market.data import (
+    _stocks,
+    compute_metrics,
+    get_crypto,
+    get_ticker,
+    get_tickers,
+)
 
 
 def test_get_ticker():
@@ -34,6 +41,56 @@ def test_get_ticker():
     )
 
 
+def test_get_tickers(monkeypatch):
+    # Invalid error option
+    with pytest.raises(Warning):
+        get_tickers(["AAPL"], start_date="2020-01-01", errors="invalid")
+
+    # Failed ticker request is captured per ticker
+    with pytest.warns(UserWarning):
+        stocks_data = get_tickers(
+            ["AAPL", "INVALIDTICKER"], start_date="2020-01-01", end_date="2020-01-08"
+        )
+    assert type(stocks_data["AAPL"]) is pd.DataFrame
+    assert stocks_data["INVALIDTICKER"] is None
+
+    # Connection errors are raised, not treated as invalid tickers
+    def connection_error(*args, **kwargs):
+        raise requests.exceptions.ConnectionError("Connection refused")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(_stocks.data, "DataReader", connection_error)
+        with pytest.raises(requests.exceptions.ConnectionError):
+            get_tickers(["AAPL", "MSFT"], start_date="2020-01-01", errors="ignore")
+
+    # Frame output, with a column level per ticker
+    stocks_frame = get_tickers(
+        ["AAPL", "MSFT"], start_date="2020-01-01", end_date="2020-01-08", as_frame=True
+    )
+    assert list(stocks_frame["Close"].columns) == ["AAPL", "MSFT"]
+
+
+def test_read_padded_bars_exchange_holiday(monkeypatch):
+    # TSX bars, closed on Canada Day (2021-07-01) while the US market was open
+    dates = pd.bdate_range("2021-06-21", "2021-07-09").drop(pd.Timestamp("2021-07-01"))
+    bars = pd.DataFrame({"Close": range(len(dates))}, index=dates, dtype=float)
+    requests_made = list()
+
+    def read_tsx(ticker, source, start_date, end_date):
+        requests_made.append((start_date, end_date))
+        return bars.loc[start_date:end_date]
+
+    monkeypatch.setattr(_stocks.data, "DataReader", read_tsx)
+    stock_data, previous_close = _stocks._read_padded_bars(
+        "SHOP.TO", pd.Timestamp("2021-07-02"), pd.Timestamp("2021-07-09"), cache=False
+    )
+
+    # Lead-in reaches the previous TSX trading day, not only the previous US market day
+    assert requests_made[0][0] <= pd.Timestamp("2021-06-30")
+    assert previous_close == bars.loc["2021-06-30", "Close"]
+    assert stock_data.index[0] == pd.Timestamp("2021-07-02")
+
+
 def test_get_crypto():
     # Invalid crypto currency - returns None
     assert (
@@ -58,3 +115,36 @@ def test_get_crypto():
     )
     assert type(crypto_data) is pd.DataFrame
     assert crypto_data.shape[0] == 9
+
+
+def test_compute_metrics():
+    prices = pd.DataFrame(
+        {
+            "High": [12.0, 22.0],
+            "Low": [8.0, 18.0],
+            "Open": [10.0, 20.0],
+            "Close": [11.0, 22.0],
+            "Volume": [100, 200],
+        },
+        index=pd.to_datetime(["2020-01-02", "2020-01-03"]),
+    )
+
+    # Single ticker, with previous close
+    metrics = compute_metrics(prices, previous_close=10.0)
+    assert list(metrics["Pct: Day Over Day"]) == [10.0, 100.0]
+    assert list(metrics["Pct: Within Day"]) == [10.0, 10.0]
+    assert list(metrics["Pct: Day Volatility"]) == [40.0, 20.0]
+    assert list(metrics["Value: Day Volatility"]) == [4.0, 4.0]
+    assert list(metrics["Value: Volume in Dollars"]) == [1000.0, 4000.0]
+    assert "Pct: Day Over Day" not in prices
+
+    # Multiple tickers, with ipo day (no previous close) for the second ticker
+    prices_frame = pd.concat(
+        {"AAPL": prices, "ABNB": prices}, axis=1, names=["Symbols", "Attributes"]
+    ).swaplevel(axis=1)
+    metrics_frame = compute_metrics(
+        prices_frame, previous_close=pd.Series({"AAPL": 10.0})
+    )
+    assert list(metrics_frame[("Pct: Day Over Day", "AAPL")]) == [10.0, 100.0]
+    assert pd.isna(metrics_frame[("Pct: Day Over Day", "ABNB")].iloc[0])
+    assert list(metrics_frame[("Value: Volume in Dollars", "ABNB")]) == [1000.0, 4000.0]
@@ -0,0 +1,114 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from stock_market.data import HistoryStore
+
+pytest.importorskip("pyarrow")
+
+
+def _mock_history(start_date, end_date):
+    dates = pd.bdate_range(start_date, end_date, name="Date")
+    return pd.DataFrame(
+        {"Close": range(len(dates)), "Volume": range(len(dates))},
+        index=dates,
+        dtype=float,
+    )
+
+
+def test_history_store(tmp_path):
+    store = HistoryStore(path=str(tmp_path))
+
+    # Ticker must be specified for a single price history
+    with pytest.raises(ValueError):
+        store.save_history(_mock_history("2020-12-28", "2021-01-08"))
+
+    # Partitioned by ticker and year
+    store.save_history(
+        {"AAPL": _mock_history("2020-12-28", "2021-01-08"), "INVALID": None}
+    )
+    assert sorted(
+        path.name for path in (tmp_path / "history/ticker=AAPL").iterdir()
+    ) == [
+        "year=2020.feather",
+        "year=2021.feather",
+    ]
+
+    # Reload within a date period, with column projection
+    history = store.load_history(
+        ["AAPL", "MSFT"],
+        start_date="2020-12-30",
+        end_date="2021-01-05",
+        columns=["Close"],
+    )
+    assert list(history["AAPL"].columns) == ["Close"]
+    assert len(history["AAPL"]) == 5
+    assert history["MSFT"] is None
+
+    # New rows replace stored rows of the same dates
+    store.save_history(_mock_history("2021-01-04", "2021-01-15") + 100.0, ticker="aapl")
+    history = store.load_history("AAPL", start_date="2021-01-04", as_frame=True)
+    assert len(history) == 10
+    assert history[("Close", "AAPL")].iloc[0] == 100.0
+
+
+def test_history_store_writes(tmp_path, monkeypatch):
+    store = HistoryStore(path=str(tmp_path))
+
+    # Tickers are sanitized into a single directory of the store
+    store.save_history(_mock_history("2021-01-04", "2021-01-08"), ticker="../brk/b")
+    assert [path.name for path in (tmp_path / "history").iterdir()] == [
+        "ticker=.._BRK_B"
+    ]
+    assert len(store.load_history("../brk/b")["../brk/b"]) == 5
+
+    # Concurrent merges into the same partition keep all rows
+    threads = [
+        threading.Thread(
+            target=store.save_history,
+            args=(_mock_history(f"2021-{month:02d}-01", f"2021-{month:02d}-28"),),
+            kwargs={"ticker": "AAPL"},
+        )
+        for month in range(1, 13)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    history = store.load_history("AAPL")["AAPL"]
+    assert len(history) == sum(
+        len(pd.bdate_range(f"2021-{month:02d}-01", f"2021-{month:02d}-28"))
+        for month in range(1, 13)
+    )
+
+    # Failed writes keep the stored file, without temporary files
+    pyarrow_feather = pytest.importorskip("pyarrow.feather")
+
+    def write_feather(data, path, **kwargs):
+        with open(path, "wb") as file:
+            file.write(b"partial")
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(pyarrow_feather, "write_feather", write_feather)
+    with pytest.raises(OSError):
+        store.save_history(_mock_history("2021-12-29", "2021-12-31"), ticker="AAPL")
+    assert len(store.load_history("AAPL")["AAPL"]) == len(history)
+    assert not list(tmp_path.glob("history/*/*.tmp"))
+
+
+def test_history_store_table(tmp_path):
+    store = HistoryStore(path=str(tmp_path))
+    table = pd.DataFrame(
+        {
+            "Ticker": ["ABNB", "DASH"],
+            "IPO_Date": pd.to_datetime(["2020-12-10", "2020-12-09"]),
+        }
+    )
+
+    store.save_table("recent_ipo", table)
+    assert store.load_table("recent_ipo").equals(table)
+    assert list(store.load_table("recent_ipo", columns=["Ticker"]).columns) == [
+        "Ticker"
+    ]
+    assert store.load_table("withdrawn_ipo") is None
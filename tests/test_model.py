@@ -1,7 +1,18 @@
+import pickle
+
+import pandas as pd
 import pytest
 
 from stock_market.model._classification import _check_digit, detect_ticker
-from stock_market.model._nlp import nltk_sentiment
+from stock_market.model._lexicon import (
+    FINANCE_LEXICON,
+    VADER_LEXICON,
+    compile_lexicon,
+    load_lexicon,
+    read_lexicon,
+)
+from stock_market.model._matching import AhoCorasick, TickerMatcher
+from stock_market.model._nlp import nltk_sentiment, nltk_sentiment_batch
 
 
 class TestNlpModel:
@@ -15,6 +26,50 @@ class TestNlpModel:
         # Single sentence input
         assert type(nltk_sentiment(text=input_text[0])) is dict
 
+    @staticmethod
+    def test_nltk_sentiment_batch():
+        input_text = ["Great earnings", "Terrible loss", "Flat day"] * 3
+
+        # Chunks scored over worker processes, in order
+        result = nltk_sentiment_batch(text=input_text, n_jobs=2, chunk_size=2)
+        assert result == nltk_sentiment(text=input_text)
+        assert result[0]["compound"] > 0 > result[1]["compound"]
+
+        # Invalid number of jobs
+        with pytest.raises(ValueError):
+            nltk_sentiment_batch(text=input_text, n_jobs=0)
+
+    @staticmethod
+    def test_compile_lexicon(tmp_path):
+        lexicon_files = [VADER_LEXICON, FINANCE_LEXICON]
+        lexicon = compile_lexicon(lexicon_files, output=tmp_path / "lexicon.pickle")
+
+        # Compiled lexicon matches the lexicon text files
+        with open(tmp_path / "lexicon.pickle", "rb") as file:
+            assert (
+                pickle.load(file)["lexicon"] == read_lexicon(lexicon_files) == lexicon
+            )
+
+        # Finance terms are only scored on request
+        assert nltk_sentiment("Very bullish")["compound"] == 0
+        assert nltk_sentiment("Very bullish", finance_terms=True)["compound"] > 0
+
+    @staticmethod
+    def test_load_lexicon(cache_dir):
+        load_lexicon.cache_clear()
+
+        # Compiled into the cache directory on first use, then loaded from it
+        lexicon = load_lexicon(finance_terms=True)
+        path = cache_dir / "lexicon" / "vader_finance.pickle"
+        assert path.exists()
+        assert lexicon == read_lexicon([VADER_LEXICON, FINANCE_LEXICON])
+
+        compiled_at = path.stat().st_mtime_ns
+        load_lexicon.cache_clear()
+        assert load_lexicon(finance_terms=True) == lexicon
+        assert path.stat().st_mtime_ns == compiled_at
+        load_lexicon.cache_clear()
+
 
 class TestClassificationModel:
     @staticmethod
@@ -33,10 +88,59 @@ class TestClassificationModel:
         single_detect = detect_ticker(text=input_text[0], source="reddit")
         assert single_detect == [["AAPL"]]
 
+        # Valid case - dictionary words and numbers are not tickers
+        assert detect_ticker(text="GME TO THE MOON NAN", source="reddit") == [["GME"]]
+
         # Valid case - no detection
         input_no_ticker = ["No ticker her", "$3.2 is not a ticker"]
         assert detect_ticker(text=input_no_ticker, source="reddit") == [None, None]
 
+        # Valid case - pandas series input, missing texts have no detection
+        series_detect = detect_ticker(
+            text=pd.Series(input_text + [None], index=[3, 5, 7]), source="reddit"
+        )
+        assert list(series_detect.index) == [3, 5, 7]
+        assert series_detect.tolist() == [["AAPL"], ["MSFT"], None]
+
+    @staticmethod
+    def test_detect_ticker_known():
+        text = (
+            "Long thread: $aapl and TSLA are up, Exxon Mobil is down. It is ALL about "
+            "$ALL today, while XTSLA and General Electrical are not tickers."
+        )
+        assert detect_ticker(text=text, source="reddit", mode="known") == [
+            ["AAPL", "TSLA", "XOM", "ALL"]
+        ]
+
+        # User supplied universe
+        universe = pd.DataFrame({"Ticker": ["GME"], "Name": ["GameStop Corp."]})
+        assert detect_ticker(
+            text=["GameStop squeeze", "GME"], mode="known", universe=universe
+        ) == [["GME"], ["GME"]]
+        assert detect_ticker(text="GME", mode="known", universe=["gme"]) == [["GME"]]
+
+        # Invalid case - invalid mode
+        with pytest.raises(Warning):
+            detect_ticker(text="", mode="invalid_mode")
+
+    @staticmethod
+    def test_aho_corasick():
+        patterns = {"he": 1, "she": 2, "his": 3, "hers": 4}
+        matches = list(AhoCorasick(patterns).iter("ushers"))
+        assert matches == [(1, 4, 2), (2, 4, 1), (2, 6, 4)]
+
+        # Same matches as a search of each pattern
+        text = "she sells his shells, and hers are here"
+        naive = [
+            (start, start + len(pattern), value)
+            for pattern, value in patterns.items()
+            for start in range(len(text))
+            if text.startswith(pattern, start)
+        ]
+        assert sorted(AhoCorasick(patterns).iter(text)) == sorted(naive)
+
+        assert TickerMatcher().match("nothing to see here") is None
+
     @staticmethod
     def test_helper_check_digit():
         # Check for digit